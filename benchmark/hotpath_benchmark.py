@@ -0,0 +1,182 @@
+"""
+SDK 热点路径的基准测试：请求体渲染（_render）、参数校验（_check_param）、签名、JSON 编解码，
+以及 Private.send、Group.send、Private.send_template、Push.push 的端到端耗时（1、100、1000 个接收者，1KB、128KB 内容）。
+请求经由直接返回 {"code":200} 的桩 transport 发出，不依赖网络，端到端耗时只包含 SDK 自身的开销。
+结果可保存为基线 JSON，之后与基线对比，耗时增加超过阈值的用例标记为 REGRESSION，并以退出码 1 结束。
+用法（在仓库根目录）：
+    PYTHONPATH=. python benchmark/hotpath_benchmark.py --save benchmark/baseline.json
+    PYTHONPATH=. python benchmark/hotpath_benchmark.py --compare benchmark/baseline.json [--threshold 0.1] [--filter send]
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+from rongcloud import __version__, codec
+from rongcloud.message import Private
+from rongcloud.module import BODY_JSON, CONTENT_TYPE_FORM, Module, Request
+from rongcloud.rongcloud import RongCloud
+from rongcloud.transport import Transport
+
+RECIPIENTS = (1, 100, 1000)
+CONTENT_SIZES = (('1KB', 1024), ('128KB', 128 * 1024))
+
+
+class _StubTransport(Transport):
+    def request(self, host_url, url, body=None, headers=None, timings=None, timeout=None):
+        return 200, b'{"code":200}'
+
+
+class _Capture(Private):
+    """
+    记录 send、send_template 实际使用的模板与参数，不发出请求，用于单独测量 _render。
+    """
+
+    def _form_request(self, url, params=None, format_str=None):
+        self.captured = params, format_str
+        return Request(url)
+
+    def _json_request(self, url, params, format_str=None):
+        self.captured = params, format_str
+        return Request(url, kind=BODY_JSON)
+
+    def _send(self, request):
+        return {'code': 200}
+
+
+def _text(size):
+    return ('0123456789abcdef' * (size // 16 + 1))[:size]
+
+
+def _user_ids(count):
+    return ['user{}'.format(i) for i in range(count)]
+
+
+def cases():
+    """
+    :return:                    [(用例名, 无参函数), ...]
+    """
+    rc = RongCloud('key', 'secret', 'http://127.0.0.1:9', transport=_StubTransport())
+    private = rc.get_message().get_private()
+    group = rc.get_message().get_group()
+    push = rc.get_push()
+    result = []
+
+    capture = _Capture(rc)
+    for label, size in CONTENT_SIZES:
+        content = {'content': _text(size), 'extra': 'helloExtra'}
+        for count in RECIPIENTS:
+            to_user_ids = _user_ids(count)
+            capture.send('AAA', to_user_ids, 'RC:TxtMsg', content, push_content='push')
+            result.append(('render/Private.send/recipients={}/{}'.format(count, label),
+                           lambda captured=capture.captured: Module._render(*captured)))
+            capture.send_template('AAA', to_user_ids, 'RC:TxtMsg', [{'{name}': user_id} for user_id in to_user_ids],
+                                  content, ['hello {name}'] * count)
+            result.append(('render/Private.send_template/recipients={}/{}'.format(count, label),
+                           lambda captured=capture.captured: Module._render(*captured)))
+
+    user_ids = _user_ids(1000)
+    result.append(('check_param/str', lambda: Module._check_param('user1', str, '1~64')))
+    result.append(('check_param/list', lambda: Module._check_param(user_ids, list, '1~1000')))
+    result.append(('check_param/recipients=1000', lambda: [Module._check_param(i, str, '1~64') for i in user_ids]))
+
+    result.append(('signature', lambda: rc.signer.sign(CONTENT_TYPE_FORM)))
+    reused = RongCloud('key', 'secret', reuse_signature=True, transport=_StubTransport())
+    result.append(('signature/reuse', lambda: reused.signer.sign(CONTENT_TYPE_FORM)))
+
+    for label, size in CONTENT_SIZES:
+        content = {'content': _text(size), 'extra': 'helloExtra'}
+        encoded = codec.dumps(content)
+        result.append(('json/dumps/{}'.format(label), lambda content=content: codec.dumps(content)))
+        result.append(('json/loads/{}'.format(label), lambda encoded=encoded: codec.loads(encoded)))
+
+    for label, size in CONTENT_SIZES:
+        content = {'content': _text(size), 'extra': 'helloExtra'}
+        for count in RECIPIENTS:
+            to_user_ids = _user_ids(count)
+            values = [{'{name}': user_id} for user_id in to_user_ids]
+            push_content = ['hello {name}'] * count
+            result.append(('Private.send/recipients={}/{}'.format(count, label),
+                           lambda to_user_ids=to_user_ids, content=content:
+                           private.send('AAA', to_user_ids, 'RC:TxtMsg', content, push_content='push')))
+            result.append(('Private.send_template/recipients={}/{}'.format(count, label),
+                           lambda to_user_ids=to_user_ids, values=values, content=content, push_content=push_content:
+                           private.send_template('AAA', to_user_ids, 'RC:TxtMsg', values, content, push_content)))
+            result.append(('Push.push/recipients={}/{}'.format(count, label),
+                           lambda to_user_ids=to_user_ids, alert=content['content']:
+                           push.push(['ios', 'android'], None, None, to_user_ids, None, False, alert,
+                                     None, None, None, None, None, None, None, None, None)))
+        result.append(('Group.send/{}'.format(label),
+                       lambda content=content: group.send('AAA', 'group1', 'RC:TxtMsg', content, push_content='push')))
+    return result
+
+
+def measure(func, repeat):
+    """
+    :return:                    每次调用的耗时微秒数，取 repeat 轮中的最小值。
+    """
+    rep = func()
+    if isinstance(rep, dict) and rep.get('code', 200) != 200:
+        raise RuntimeError('unexpected result: {}'.format(rep))
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def meta():
+    return {'sdk': __version__, 'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'machine': platform.machine(), 'codec': codec.BACKEND}
+
+
+def compare(results, baseline, threshold):
+    """
+    :return:                    耗时较基线增加超过 threshold（比例）的用例名列表。
+    """
+    for key, value in meta().items():
+        if baseline['meta'].get(key) != value:
+            print('warning: baseline {} is {}, current is {}'.format(key, baseline['meta'].get(key), value))
+    regressions = []
+    for name, us in results.items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print('{:<52} {:10.1f} us/op   (new)'.format(name, us))
+            continue
+        ratio = us / base
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '   REGRESSION'
+            regressions.append(name)
+        print('{:<52} {:10.1f} us/op   base {:10.1f}   x{:.2f}{}'.format(name, us, base, ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SDK hot path benchmarks')
+    parser.add_argument('--repeat', type=int, default=5, help='rounds per case, the fastest round is kept')
+    parser.add_argument('--filter', default=None, help='only run cases whose name contains this text')
+    parser.add_argument('--save', metavar='FILE', help='save results as a baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare results with a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.1, help='slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, func in cases():
+        if args.filter is None or args.filter in name:
+            results[name] = measure(func, args.repeat)
+            if args.compare is None:
+                print('{:<52} {:10.1f} us/op'.format(name, results[name]))
+
+    regressions = []
+    if args.compare is not None:
+        with open(args.compare, encoding='utf-8') as fp:
+            regressions = compare(results, json.load(fp), args.threshold)
+        print('{} regression(s) over {:.0%}'.format(len(regressions), args.threshold))
+    if args.save is not None:
+        with open(args.save, 'w', encoding='utf-8') as fp:
+            json.dump({'meta': meta(), 'results': results}, fp, indent=2, sort_keys=True)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
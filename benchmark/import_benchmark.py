@@ -0,0 +1,43 @@
+"""
+统计 SDK 冷启动耗时：在全新的解释器进程中导入 rongcloud.rongcloud，再创建 RongCloud 并发送一条单聊消息，
+记录两个阶段的耗时以及各阶段加载的模块。发送目标为本机未监听端口，不依赖网络。
+用法（在仓库根目录）：PYTHONPATH=. python benchmark/import_benchmark.py [次数]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+_CHILD = '''
+import json, sys, time
+t0 = time.perf_counter()
+import rongcloud.rongcloud
+t1 = time.perf_counter()
+after_import = set(sys.modules)
+rc = rongcloud.rongcloud.RongCloud('key', 'secret', 'http://127.0.0.1:9')
+rc.get_message().get_private().send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})
+t2 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'send': t2 - t1,
+                  'import_modules': sorted(m for m in after_import if m.split('.')[0] in ('rongcloud', 'jinja2')),
+                  'send_modules': sorted(m for m in set(sys.modules) - after_import
+                                         if m.split('.')[0] in ('rongcloud', 'jinja2'))}))
+'''
+
+
+def run_once():
+    out = subprocess.check_output([sys.executable, '-c', _CHILD])
+    return json.loads(out.decode('utf8'))
+
+
+def main(number):
+    runs = [run_once() for _ in range(number)]
+    print('import rongcloud.rongcloud   median {:7.2f} ms'.format(statistics.median(r['import'] for r in runs) * 1e3))
+    print('RongCloud() + first send     median {:7.2f} ms'.format(statistics.median(r['send'] for r in runs) * 1e3))
+    print('modules after import:        {}'.format(', '.join(runs[0]['import_modules'])))
+    send_modules = runs[0]['send_modules']
+    print('modules loaded by send:      {}'.format(', '.join(m for m in send_modules if not m.startswith('jinja2.'))))
+    print('jinja2 modules loaded:       {}'.format(len([m for m in send_modules if m.startswith('jinja2')])))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
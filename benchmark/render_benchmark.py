@@ -0,0 +1,43 @@
+"""
+对比请求体渲染的旧路径（每次调用都构造 jinja2.Template）与新路径（编译结果缓存）。
+用法（在仓库根目录）：PYTHONPATH=. python benchmark/render_benchmark.py [次数]
+"""
+import sys
+import timeit
+
+from jinja2 import Template
+
+from rongcloud import module
+from rongcloud.message import Private
+from rongcloud.rongcloud import RongCloud
+
+
+class _NullPrivate(Private):
+    def _send(self, request):
+        return request.body
+
+
+def main(number):
+    private = _NullPrivate(RongCloud('key', 'secret'))
+    to_user_ids = ['user{}'.format(i) for i in range(100)]
+    content = {'content': 'hello', 'extra': 'helloExtra'}
+
+    def send():
+        private.send('AAA', to_user_ids, 'RC:TxtMsg', content, push_content='push')
+
+    def send_template():
+        private.send_template('AAA', to_user_ids[:2], 'RC:TxtMsg',
+                              [{'{c}': '1'}, {'{c}': '2'}], content, ['push{c}', 'push{c}'])
+
+    compile_cached = module._compile
+    for name, func in (('Private.send(100)', send), ('Private.send_template(2)', send_template)):
+        module._compile = Template
+        old = timeit.timeit(func, number=number)
+        module._compile = compile_cached
+        new = timeit.timeit(func, number=number)
+        print('{:<28} old {:8.1f} us/op   new {:8.1f} us/op   x{:.1f}'.format(
+            name, old / number * 1e6, new / number * 1e6, old / new))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1 @@
+__version__ = '3.1.9'
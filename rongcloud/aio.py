@@ -0,0 +1,311 @@
+import asyncio
+import functools
+import http.client
+import inspect
+import socket
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from rongcloud.pool import ConnectError, _mark
+from rongcloud.rongcloud import RongCloud
+from rongcloud.transport import DEFAULT_TIMEOUT, Transport
+
+
+class AsyncConnectionPool:
+    """
+    单个 host 的 asyncio HTTP/1.1 keep-alive 连接池。
+    """
+
+    def __init__(self, host_url, max_connections=100, idle_timeout=60):
+        """
+        :param host_url:            host 地址，如：http://api-cn.ronghub.com。
+        :param max_connections:     该 host 最大连接数，超出时请求会等待空闲连接。
+        :param idle_timeout:        空闲连接保留秒数，超时后被回收。
+        """
+        parts = urlsplit(host_url)
+        self.host_url = host_url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.prefix = parts.path.rstrip('/')
+        self.host_header = parts.netloc
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._idle = deque()
+        self._loop = None
+        self._sem = None
+        self._in_use = 0
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+        self._requests = 0
+
+    def _bind_loop(self):
+        # 连接与信号量都绑定在事件循环上，切换事件循环后重建
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._sem = asyncio.Semaphore(self.max_connections)
+            self._idle.clear()
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][2] >= self.idle_timeout:
+            _, writer, _ = self._idle.popleft()
+            writer.close()
+            self._evicted += 1
+
+    async def _get_conn(self, timings, connect_timeout):
+        self._evict_idle()
+        while self._idle:
+            reader, writer, _ = self._idle.pop()
+            if reader.at_eof() or writer.is_closing():
+                # 服务端已关闭该空闲连接
+                writer.close()
+                self._evicted += 1
+                continue
+            self._reused += 1
+            return reader, writer, True
+        ssl = True if self.scheme == 'https' else None
+        mark = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=ssl),
+                                                    connect_timeout)
+        except asyncio.TimeoutError:
+            raise ConnectError(socket.timeout('timed out'))
+        except OSError as e:
+            raise ConnectError(e)
+        _mark(timings, 'connect', mark)
+        self._created += 1
+        return reader, writer, False
+
+    def _put_conn(self, reader, writer, reusable):
+        if reusable:
+            self._idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    def _encode_request(self, url, body, headers):
+        lines = ['POST {} HTTP/1.1'.format(self.prefix + url),
+                 'Host: {}'.format(self.host_header),
+                 'Content-Length: {}'.format(len(body))]
+        for key, value in headers.items():
+            lines.append('{}: {}'.format(key, value))
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+    @staticmethod
+    async def _read_exactly(reader, size):
+        try:
+            return await reader.readexactly(size)
+        except asyncio.IncompleteReadError as e:
+            raise http.client.IncompleteRead(e.partial, e.expected)
+
+    @classmethod
+    async def _read_response(cls, reader, timings, mark):
+        """
+        读取响应，响应不完整或格式错误时抛出与 http.client 一致的 IncompleteRead、BadStatusLine，
+        使同步与 asyncio 两种传输对同一响应返回相同的错误。
+        """
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Remote end closed connection without response')
+        mark = _mark(timings, 'first_byte', mark)
+        try:
+            version, status = status_line.split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise http.client.BadStatusLine(status_line.decode('latin-1'))
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        will_close = connection == 'close' or (version == b'HTTP/1.0' and connection != 'keep-alive')
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                try:
+                    size = int((await reader.readline()).split(b';')[0], 16)
+                except ValueError:
+                    raise http.client.IncompleteRead(b''.join(chunks))
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await cls._read_exactly(reader, size))
+                await reader.readline()
+            data = b''.join(chunks)
+        elif headers.get('content-length', '').isdigit():
+            data = await cls._read_exactly(reader, int(headers['content-length']))
+        else:
+            data = await reader.read()
+            will_close = True
+        _mark(timings, 'read', mark)
+        return status, data, will_close
+
+    async def _exchange(self, reader, writer, reused, url, body, headers, timings):
+        """
+        :return:                    (status, body, will_close)；复用的连接在发送请求时已断开则返回 None，请求未送达，可换连接重发。
+        """
+        mark = time.perf_counter()
+        try:
+            writer.write(self._encode_request(url, body, headers))
+            await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            if not reused:
+                raise
+            return None
+        mark = _mark(timings, 'send', mark)
+        return await self._read_response(reader, timings, mark)
+
+    async def _request_once(self, url, body, headers, timings, timeout):
+        connect_timeout, read_timeout = timeout
+        reader, writer, reused = await self._get_conn(timings, connect_timeout)
+        reusable = False
+        try:
+            rep = await asyncio.wait_for(self._exchange(reader, writer, reused, url, body, headers, timings),
+                                         read_timeout)
+            if rep is None:
+                return None
+            status, data, will_close = rep
+            reusable = not will_close
+            return status, data
+        except asyncio.TimeoutError:
+            raise socket.timeout('timed out')
+        finally:
+            self._put_conn(reader, writer, reusable)
+
+    async def request(self, url, body=b'', headers=None, timings=None, timeout=DEFAULT_TIMEOUT):
+        """
+        发送 POST 请求并读取完整响应，连接超时抛出 ConnectError，读取超时抛出 socket.timeout。
+        :param timings:             同 ConnectionPool.request。
+        :param timeout:             (连接超时, 读取超时) 秒数，连接超时同时限制连接数已满时等待空闲连接的时长；
+                                    读取超时为发出请求至读完响应的总时长。
+        :return:                    (status, body)
+        """
+        self._bind_loop()
+        self._requests += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout[0])
+        except asyncio.TimeoutError:
+            raise ConnectError(socket.timeout('timed out waiting for a free connection'))
+        self._in_use += 1
+        try:
+            while True:
+                rep = await self._request_once(url, body, headers or {}, timings, timeout)
+                if rep is not None:
+                    return rep
+        finally:
+            self._in_use -= 1
+            self._sem.release()
+
+    def stats(self):
+        self._evict_idle()
+        return {'created': self._created,
+                'reused': self._reused,
+                'evicted': self._evicted,
+                'requests': self._requests,
+                'idle': len(self._idle),
+                'in_use': self._in_use}
+
+    def close(self):
+        while self._idle:
+            _, writer, _ = self._idle.popleft()
+            writer.close()
+
+
+class AsyncPoolManager(Transport):
+    """
+    按 host 管理 asyncio 连接池，同一个 AsyncRongCloud 实例下的所有模块共享，为 AsyncRongCloud 默认的 Transport 实现。
+    """
+
+    def __init__(self, host_list, max_connections=100, idle_timeout=60):
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._pools = {}
+        for host_url in host_list:
+            self.get_pool(host_url)
+
+    def get_pool(self, host_url):
+        pool = self._pools.get(host_url)
+        if pool is None:
+            pool = AsyncConnectionPool(host_url, self.max_connections, self.idle_timeout)
+            self._pools[host_url] = pool
+        return pool
+
+    def request(self, host_url, url, body=b'', headers=None, timings=None, timeout=DEFAULT_TIMEOUT):
+        return self.get_pool(host_url).request(url, body, headers, timings, timeout)
+
+    def stats(self):
+        return {host_url: pool.stats() for host_url, pool in self._pools.items()}
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.close()
+
+
+class AsyncModule:
+    """
+    包装同步模块，接口方法均为协程，参数校验与同步模块一致；get_* 方法返回包装后的子模块。
+    """
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        # 获取子模块的 get_* 方法均无参数，get_bulk 等带参数的方法为接口方法；
+        # 子模块由 AsyncRongCloud 创建并缓存，已是 AsyncModule
+        if name.startswith('get_') and not inspect.signature(attr).parameters:
+            @functools.wraps(attr)
+            def getter():
+                module = attr()
+                return module if isinstance(module, AsyncModule) else AsyncModule(module)
+            wrapper = getter
+        else:
+            @functools.wraps(attr)
+            async def method(*args, **kwargs):
+                rep = attr(*args, **kwargs)
+                if inspect.isawaitable(rep):
+                    rep = await rep
+                return rep
+            wrapper = method
+        self.__dict__[name] = wrapper
+        return wrapper
+
+
+class AsyncRongCloud(RongCloud):
+    """
+    asyncio 版本的 RongCloud，各 get_* 方法返回的模块接口均为协程，如：
+    rep = await rc.get_message().get_private().send(...)
+    """
+    is_async = True
+
+    def __init__(self, app_key, app_secret, host_url='http://api-cn.ronghub.com;http://api2-cn.ronghub.com',
+                 max_connections=100, idle_timeout=60, **kwargs):
+        """
+        参数同 RongCloud，max_connections 默认为 100；transport 默认为 AsyncPoolManager，自定义实现的 request 需返回协程。
+        """
+        super().__init__(app_key, app_secret, host_url, max_connections, idle_timeout, **kwargs)
+
+    def _new_transport(self, max_connections, idle_timeout):
+        return AsyncPoolManager(self.host_url.host_list, max_connections, idle_timeout)
+
+    def batch(self, max_workers=8):
+        """
+        :return:                    AsyncBatch 对象，可用作异步上下文管理器，详见 bulk.AsyncBatch。
+        """
+        from rongcloud.bulk import AsyncBatch
+        return AsyncBatch(max_workers)
+
+    def _new_module(self, cls):
+        return AsyncModule(cls(self))
+
+    def close(self):
+        self.transport.close()
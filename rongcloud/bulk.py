@@ -0,0 +1,221 @@
+import asyncio
+import inspect
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def chunked(iterable, size):
+    """
+    将任意可迭代对象按 size 切分为列表，惰性读取。
+    """
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def async_chunked(aiterable, size):
+    """
+    chunked 的异步版本，支持异步可迭代对象，如数据库游标。
+    """
+    chunk = []
+    async for item in aiterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Report:
+    def __init__(self):
+        self.chunks = []
+        self.failed = []
+        self.total = 0
+
+    def add(self, index, chunk, rep):
+        # 成功分片只保留数量，不持有分片数据，内存占用与接收用户总数无关
+        item = {'index': index, 'count': len(chunk), 'result': rep}
+        self.total += len(chunk)
+        self.chunks.append(item)
+        if rep.get('code') != 200:
+            item['items'] = chunk
+            self.failed.append(item)
+
+    def result(self):
+        self.chunks.sort(key=lambda item: item['index'])
+        self.failed.sort(key=lambda item: item['index'])
+        code = self.failed[0]['result'].get('code', -1) if self.failed else 200
+        return {'code': code, 'total': self.total, 'chunks': self.chunks, 'failed': self.failed}
+
+
+def _call(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        return {'code': -1, 'reason': str(e)}
+
+
+def fan_out(func, chunks, max_workers=4):
+    """
+    以最多 max_workers 个线程并发执行 func(chunk)，合并各分片结果。
+    :param func:                处理单个分片的函数，返回接口结果，code 为 200 表示成功。
+    :param chunks:              分片可迭代对象，按需读取，同时在途的分片不超过 max_workers * 2 个。
+    :param max_workers:         并发数。
+    :return:                    合并结果，如：{"code":200, "total":2000, "chunks":[...], "failed":[...]}，
+                                chunks 中每项为 {"index":0, "count":1000, "result":{...}}，
+                                failed 中每项另含 items 分片数据，可重新发送。
+    """
+    report = _Report()
+    pending = {}
+
+    def collect(done):
+        for future in done:
+            index, chunk = pending.pop(future)
+            report.add(index, chunk, future.result())
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        for index, chunk in enumerate(chunks):
+            if len(pending) >= max_workers * 2:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            pending[executor.submit(_call, func, chunk)] = (index, chunk)
+        collect(wait(pending).done)
+    return report.result()
+
+
+async def async_fan_out(func, chunks, max_workers=4):
+    """
+    fan_out 的 asyncio 版本，func(chunk) 可返回结果或协程，chunks 可为异步可迭代对象。
+    """
+    report = _Report()
+    sem = asyncio.Semaphore(max_workers)
+    tasks = set()
+
+    async def run(index, chunk):
+        try:
+            rep = func(chunk)
+            if inspect.isawaitable(rep):
+                rep = await rep
+        except Exception as e:
+            rep = {'code': -1, 'reason': str(e)}
+        finally:
+            sem.release()
+        report.add(index, chunk, rep)
+
+    async def submit(index, chunk):
+        await sem.acquire()
+        task = asyncio.ensure_future(run(index, chunk))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if hasattr(chunks, '__aiter__'):
+        index = 0
+        async for chunk in chunks:
+            await submit(index, chunk)
+            index += 1
+    else:
+        for index, chunk in enumerate(chunks):
+            await submit(index, chunk)
+    if tasks:
+        await asyncio.gather(*tasks)
+    return report.result()
+
+
+class Batch:
+    """
+    并发执行任意接口调用，通过 RongCloud.batch() 获取，如：
+    with rc.batch(max_workers=8) as batch:
+        for group_id in group_ids:
+            batch.submit(group.create, 'AAA', group_id, group_id)
+    reps = batch.results()
+    调用提交后立即在线程池中执行，仍受 RongCloud 的限流与重试策略约束；调用抛出的异常转为 {"code":-1, "reason":"..."}。
+    """
+
+    def __init__(self, max_workers=8):
+        """
+        :param max_workers:         并发数。
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._futures = []
+
+    def submit(self, func, *args, **kwargs):
+        """
+        提交一次调用，如：batch.submit(rc.get_group().create, 'AAA', 'group1', 'name')。
+        :return:                    concurrent.futures.Future，结果为接口返回值。
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers)
+        future = self._executor.submit(_call, func, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def results(self):
+        """
+        等待所有调用完成。
+        :return:                    按提交顺序排列的接口返回值列表。
+        """
+        return [future.result() for future in self._futures]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncBatch:
+    """
+    Batch 的 asyncio 版本，通过 AsyncRongCloud.batch() 获取，如：
+    async with rc.batch(max_workers=8) as batch:
+        for group_id in group_ids:
+            batch.submit(group.create, 'AAA', group_id, group_id)
+    reps = await batch.results()
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self._sem = None
+        self._tasks = []
+
+    async def _run(self, func, args, kwargs):
+        async with self._sem:
+            try:
+                rep = func(*args, **kwargs)
+                if inspect.isawaitable(rep):
+                    rep = await rep
+                return rep
+            except Exception as e:
+                return {'code': -1, 'reason': str(e)}
+
+    def submit(self, func, *args, **kwargs):
+        """
+        提交一次调用，func 可返回结果或协程，需在事件循环中调用。
+        :return:                    asyncio.Task，结果为接口返回值。
+        """
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_workers)
+        task = asyncio.ensure_future(self._run(func, args, kwargs))
+        self._tasks.append(task)
+        return task
+
+    async def results(self):
+        """
+        :return:                    按提交顺序排列的接口返回值列表。
+        """
+        return list(await asyncio.gather(*self._tasks))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._tasks:
+            await asyncio.wait(self._tasks)
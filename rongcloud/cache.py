@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Entry:
+    __slots__ = ('value', 'created', 'expires', 'hits')
+
+    def __init__(self, value, created, expires):
+        self.value = value
+        self.created = created
+        self.expires = expires
+        self.hits = 0
+
+
+class ReadCache:
+    """
+    读接口的本地缓存，按 TTL 过期，超过 maxsize 条时淘汰最久未使用的条目，线程安全。
+    通过 RongCloud(cache=ReadCache(...)) 启用，缓存 User.query、Group.query、Group.User.query 与 Tag.get（按用户）的成功结果；
+    User.update、Group.create/join/quit/dismiss/sync 与 Tag.set 完成后清除对应条目。
+    缓存的返回值被多个调用方共享，请勿修改。
+    """
+
+    def __init__(self, maxsize=10000, ttl=60):
+        """
+        :param maxsize:             最大缓存条目数。
+        :param ttl:                 条目有效秒数。
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evicted = 0
+        self._expired = 0
+        self._invalidated = 0
+
+    def get(self, key):
+        """
+        :return:                    缓存的值，未命中或已过期时返回 None。
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                del self._entries[key]
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self._hits += 1
+            return entry.value
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = _Entry(value, now, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evicted += 1
+
+    def invalidate(self, keys):
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._invalidated += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        :return:                    如：{'size': 10, 'maxsize': 10000, 'hits': 90, 'misses': 10, 'evicted': 0,
+                                    'expired': 0, 'invalidated': 0}
+        """
+        with self._lock:
+            return {'size': len(self._entries),
+                    'maxsize': self.maxsize,
+                    'hits': self._hits,
+                    'misses': self._misses,
+                    'evicted': self._evicted,
+                    'expired': self._expired,
+                    'invalidated': self._invalidated}
+
+    def entry_stats(self):
+        """
+        :return:                    各条目统计，按最近使用排序，如：{('/user/info.json', 'AAA'): {'hits': 3, 'age': 1.5, 'ttl': 58.5}}
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {key: {'hits': entry.hits, 'age': now - entry.created, 'ttl': max(0.0, entry.expires - now)}
+                    for key, entry in reversed(self._entries.items())}
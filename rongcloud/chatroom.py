@@ -1,4 +1,5 @@
 import json
+import threading
 
 from rongcloud.module import Module, ParamException
 
@@ -29,7 +30,7 @@ class Chatroom(Module):
             for room_id, room_name in room_info_list:
                 self._check_param(room_id, str, '1~64')
                 self._check_param(room_name, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -47,7 +48,7 @@ class Chatroom(Module):
             self._check_param(room_ids, list)
             for room_id in room_ids:
                 self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -73,21 +74,21 @@ class Chatroom(Module):
             self._check_param(room_ids, list)
             for room_id in room_ids:
                 self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
     def get_user(self):
-        return User(self._rc)
+        return self._rc._module(User)
 
     def get_message(self):
-        return Message(self._rc)
+        return self._rc._module(Message)
 
     def get_whitelist(self):
-        return WhiteList(self._rc)
+        return self._rc._module(WhiteList)
 
     def get_keepalive(self):
-        return KeepAlive(self._rc)
+        return self._rc._module(KeepAlive)
 
 
 class User(Module):
@@ -118,7 +119,7 @@ class User(Module):
             self._check_param(room_id, str, '1~64')
             self._check_param(count, int, '1~500')
             self._check_param(order, int, '1~2')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -147,7 +148,7 @@ class User(Module):
                 self._check_param(user_ids, list, '1~1')
                 for user_id in user_ids:
                     self._check_param(user_id, str, '1~64')
-                return self._http_post(url, self._render(param_dict, format_str))
+                return self._send(self._form_request(url, param_dict, format_str))
             except ParamException as e:
                 return json.loads(str(e))
         else:
@@ -159,21 +160,143 @@ class User(Module):
                 self._check_param(user_ids, list, '1~1000')
                 for user_id in user_ids:
                     self._check_param(user_id, str, '1~64')
-                return self._http_post(url, self._render(param_dict, format_str))
+                return self._send(self._form_request(url, param_dict, format_str))
             except ParamException as e:
                 return json.loads(str(e))
 
     def get_gag(self):
-        return UserGag(self._rc)
+        return self._rc._module(UserGag)
 
     def get_ban(self):
-        return UserBan(self._rc)
+        return self._rc._module(UserBan)
 
     def get_block(self):
-        return UserBlock(self._rc)
+        return self._rc._module(UserBlock)
 
     def get_whitelist(self):
-        return UserWhileList(self._rc)
+        return self._rc._module(UserWhileList)
+
+
+class _ExistBatch:
+    def __init__(self, full, done):
+        self.user_ids = []
+        self.full = full
+        self.done = done
+        self.rep = None
+        self.answers = {}
+
+    def resolve(self, rep):
+        self.rep = rep
+        if rep.get('code') != 200:
+            return
+        if 'result' in rep:
+            for item in rep['result']:
+                self.answers[item.get('userid', item.get('userId'))] = item.get('isInChrm')
+        else:
+            self.answers[self.user_ids[0]] = rep.get('isInChrm')
+
+    def answer(self, user_id):
+        if self.rep.get('code') != 200:
+            return self.rep
+        return {'code': 200, 'isInChrm': self.answers.get(user_id)}
+
+
+class UserExistBatcher:
+    """
+    合并单个用户的 User.isexist 查询，线程安全。同一聊天室的查询缓冲 max_delay 秒或攒够 max_size 个用户后，
+    以一次批量查询发出，再把各用户的结果分发给等待的调用方，如：
+    batcher = UserExistBatcher(rc)
+    rep = batcher.isexist('room1', 'user1')    # {"code":200, "isInChrm":1}
+    AsyncRongCloud 下 isexist 为协程，需在同一事件循环中使用。
+    """
+
+    def __init__(self, rc, max_size=1000, max_delay=0.005):
+        """
+        :param rc:                  RongCloud 或 AsyncRongCloud 实例。
+        :param max_size:            每次批量查询的最大用户数，上限为 1000。
+        :param max_delay:           首个查询最多等待的秒数。
+        """
+        self.max_size = min(max_size, 1000)
+        self.max_delay = max_delay
+        self._user = rc.get_chatroom().get_user()
+        self._is_async = rc.is_async
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._calls = 0
+        self._requests = 0
+
+    def _enqueue(self, room_id, user_id, new_event):
+        with self._lock:
+            self._calls += 1
+            batch = self._pending.get(room_id)
+            leader = batch is None
+            if leader:
+                batch = self._pending[room_id] = _ExistBatch(new_event(), new_event())
+                self._requests += 1
+            batch.user_ids.append(user_id)
+            if len(batch.user_ids) >= self.max_size:
+                del self._pending[room_id]
+                batch.full.set()
+        return batch, leader
+
+    def _take(self, room_id, batch):
+        with self._lock:
+            if self._pending.get(room_id) is batch:
+                del self._pending[room_id]
+        return list(dict.fromkeys(batch.user_ids))
+
+    def isexist(self, room_id, user_id):
+        """
+        查询单个用户是否在聊天室。
+        :param room_id:             聊天室 Id。（必传）
+        :param user_id:             用户 Id。（必传）
+        :return:                    请求返回结果，code 返回码，200 为正常；isInChrm 用户是否在聊天室中，1 表示在，0 表示不在。
+                                    批量查询失败时返回该次查询的结果。如：{"code":200,"isInChrm":1}
+        """
+        try:
+            Module._check_param(room_id, str, '1~64')
+            Module._check_param(user_id, str, '1~64')
+        except ParamException as e:
+            return json.loads(str(e))
+        if self._is_async:
+            return self._async_isexist(room_id, user_id)
+        batch, leader = self._enqueue(room_id, user_id, threading.Event)
+        if leader:
+            batch.full.wait(self.max_delay)
+            try:
+                batch.resolve(self._user.isexist(room_id, self._take(room_id, batch)))
+            finally:
+                if batch.rep is None:
+                    batch.rep = {'code': -1, 'reason': 'Batch request failed.'}
+                batch.done.set()
+        else:
+            batch.done.wait()
+        return batch.answer(user_id)
+
+    async def _async_isexist(self, room_id, user_id):
+        import asyncio
+        batch, leader = self._enqueue(room_id, user_id, asyncio.Event)
+        if leader:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                batch.resolve(await self._user.isexist(room_id, self._take(room_id, batch)))
+            finally:
+                if batch.rep is None:
+                    batch.rep = {'code': -1, 'reason': 'Batch request failed.'}
+                batch.done.set()
+        else:
+            await batch.done.wait()
+        return batch.answer(user_id)
+
+    def stats(self):
+        """
+        :return:                    calls 查询次数，requests 实际发出的批量查询数。
+        """
+        with self._lock:
+            return {'calls': self._calls, 'requests': self._requests}
 
 
 class UserGag(Module):
@@ -204,7 +327,7 @@ class UserGag(Module):
                 self._check_param(user_id, str, '1~64')
             self._check_param(room_id, str, '1~64')
             self._check_param(minute, int, '1~43200')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -225,7 +348,7 @@ class UserGag(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -242,7 +365,7 @@ class UserGag(Module):
         format_str = 'chatroomId={{ room_id }}'
         try:
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -273,7 +396,7 @@ class UserBan(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(minute, int, '1~43200')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -291,7 +414,7 @@ class UserBan(Module):
             self._check_param(user_ids, list, '1~20')
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -304,7 +427,7 @@ class UserBan(Module):
         """
         url = '/chatroom/user/ban/query.json'
         try:
-            return self._http_post(url)
+            return self._send(self._form_request(url))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -337,7 +460,7 @@ class UserBlock(Module):
                 self._check_param(user_id, str, '1~64')
             self._check_param(room_id, str, '1~64')
             self._check_param(minute, int, '1~43200')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -358,7 +481,7 @@ class UserBlock(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -375,7 +498,7 @@ class UserBlock(Module):
         format_str = 'chatroomId={{ room_id }}'
         try:
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -408,7 +531,7 @@ class UserWhileList(Module):
             self._check_param(user_ids, list, '1~5')
             for user in user_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -429,7 +552,7 @@ class UserWhileList(Module):
             self._check_param(user_ids, list, '1~5')
             for user in user_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -445,7 +568,7 @@ class UserWhileList(Module):
         format_str = 'chatroomId={{ room_id }}'
         try:
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -468,7 +591,7 @@ class Message(Module):
         format_str = 'chatroomId={{ room_id }}'
         try:
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -482,12 +605,12 @@ class Message(Module):
         format_str = 'chatroomId={{ room_id }}'
         try:
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
     def get_priority(self):
-        return MessagePriority(self._rc)
+        return self._rc._module(MessagePriority)
 
 
 class MessagePriority(Module):
@@ -514,7 +637,7 @@ class MessagePriority(Module):
             self._check_param(obj_names, list, '1~5')
             for obj_name in obj_names:
                 self._check_param(obj_name, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -532,7 +655,7 @@ class MessagePriority(Module):
             self._check_param(obj_names, list, '1~5')
             for obj_name in obj_names:
                 self._check_param(obj_name, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -544,7 +667,7 @@ class MessagePriority(Module):
         """
         url = '/chatroom/message/priority/query.json'
         try:
-            return self._http_post(url)
+            return self._send(self._form_request(url))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -572,7 +695,7 @@ class WhiteList(Module):
             self._check_param(obj_names, list, '1~20')
             for obj_name in obj_names:
                 self._check_param(obj_name, str, '1~32')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -590,7 +713,7 @@ class WhiteList(Module):
             self._check_param(obj_names, list, '1~20')
             for obj_name in obj_names:
                 self._check_param(obj_name, str, '1~32')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -602,7 +725,7 @@ class WhiteList(Module):
         """
         url = '/chatroom/whitelist/query.json'
         try:
-            return self._http_post(url)
+            return self._send(self._form_request(url))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -628,7 +751,7 @@ class KeepAlive(Module):
         format_str = 'chatroomId={{ room_id }}'
         try:
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -643,7 +766,7 @@ class KeepAlive(Module):
         format_str = 'chatroomId={{ room_id }}'
         try:
             self._check_param(room_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -655,6 +778,6 @@ class KeepAlive(Module):
         """
         url = '/chatroom/keepalive/query.json'
         try:
-            return self._http_post(url)
+            return self._send(self._form_request(url))
         except ParamException as e:
             return json.loads(str(e))
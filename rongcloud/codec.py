@@ -0,0 +1,41 @@
+"""
+JSON 编解码，依次尝试 orjson、ujson，均未安装时使用标准库 json。
+编码结果统一为不转义非 ASCII 字符的紧凑 JSON 字符串；orjson、ujson 不支持的对象（如超出 64 位的整数）
+交由标准库编码，结果与未安装时一致。
+"""
+import json
+
+
+def _std_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+try:
+    import orjson
+
+    BACKEND = 'orjson'
+
+    def dumps(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            return _std_dumps(obj)
+
+    loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        BACKEND = 'ujson'
+
+        def dumps(obj):
+            try:
+                return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+            except (TypeError, OverflowError):
+                return _std_dumps(obj)
+
+        loads = ujson.loads
+    except ImportError:
+        BACKEND = 'json'
+        dumps = _std_dumps
+        loads = json.loads
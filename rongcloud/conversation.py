@@ -9,7 +9,7 @@ class Conversation(Module):
         super().__init__(rc)
 
     def get_notification(self):
-        return Notification(self._rc)
+        return self._rc._module(Notification)
 
 
 class Notification(Module):
@@ -38,7 +38,7 @@ class Notification(Module):
             self._check_param(user_id, str, '1~64')
             self._check_param(target_id, str, '1~64')
             self._check_param(is_muted, int, '0~1')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -63,6 +63,6 @@ class Notification(Module):
             self._check_param(conversation_type, int, '1~8')
             self._check_param(user_id, str, '1~64')
             self._check_param(target_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
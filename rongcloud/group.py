@@ -31,7 +31,8 @@ class Group(Module):
             for group_id, group_name in group_info_list:
                 self._check_param(group_id, str, '1~64')
                 self._check_param(group_name, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._invalidate([('/group/user/query.json', group_id) for group_id, _ in group_info_list],
+                                    self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -57,7 +58,8 @@ class Group(Module):
                 self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str, '1~64')
             self._check_param(group_name, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._invalidate([('/group/user/query.json', group_id)],
+                                    self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -81,7 +83,8 @@ class Group(Module):
                 self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str, '1~64')
             self._check_param(group_name, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._invalidate([('/group/user/query.json', group_id)],
+                                    self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -102,7 +105,8 @@ class Group(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._invalidate([('/group/user/query.json', group_id)],
+                                    self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -120,7 +124,8 @@ class Group(Module):
         try:
             self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._invalidate([('/group/user/query.json', group_id)],
+                                    self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -138,7 +143,7 @@ class Group(Module):
         try:
             self._check_param(group_id, str, '1~64')
             self._check_param(group_name, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -154,12 +159,15 @@ class Group(Module):
         format_str = 'groupId={{ group_id }}'
         try:
             self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            rep = self._cached((url, group_id))
+            if rep is not None:
+                return rep
+            return self._cache_result((url, group_id), self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
     def get_user(self):
-        return User(self._rc)
+        return self._rc._module(User)
 
 
 class User(Module):
@@ -178,15 +186,18 @@ class User(Module):
         format_str = 'groupId={{ group_id }}'
         try:
             self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            rep = self._cached((url, group_id))
+            if rep is not None:
+                return rep
+            return self._cache_result((url, group_id), self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
     def get_gag(self):
-        return Gag(self._rc)
+        return self._rc._module(Gag)
 
     def get_ban(self):
-        return Ban(self._rc)
+        return self._rc._module(Ban)
 
 
 class Gag(Module):
@@ -218,7 +229,7 @@ class Gag(Module):
                 self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str, '1~64')
             self._check_param(minute, int, '0~43200')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -239,7 +250,7 @@ class Gag(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -255,7 +266,7 @@ class Gag(Module):
         format_str = '{% if group_id is not none %}groupId={{ group_id }}{% endif %}'
         try:
             self._check_param(group_id, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -282,7 +293,7 @@ class Ban(Module):
             self._check_param(group_ids, list, '1~20')
             for group_id in group_ids:
                 self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -300,7 +311,7 @@ class Ban(Module):
             self._check_param(group_ids, list, '1~20')
             for group_id in group_ids:
                 self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -320,12 +331,12 @@ class Ban(Module):
             self._check_param(group_ids, list, '1~20')
             for group_id in group_ids:
                 self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
     def get_whitelist(self):
-        return Whitelist(self._rc)
+        return self._rc._module(Whitelist)
 
 
 class Whitelist(Module):
@@ -354,7 +365,7 @@ class Whitelist(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -375,7 +386,7 @@ class Whitelist(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -391,6 +402,6 @@ class Whitelist(Module):
         format_str = 'groupId={{ group_id }}'
         try:
             self._check_param(group_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
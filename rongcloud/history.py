@@ -0,0 +1,272 @@
+"""
+消息历史记录日志文件的流式下载与解析。
+
+History.query 返回的下载地址指向 gzip 或 zip 压缩的按小时日志，每行为一条消息，格式如：
+2014-01-01 01:00:00 {"appId":"...","fromUserId":"...","targetId":"...","targetType":1,"classname":"RC:TxtMsg",...}
+本模块边下载边解压、逐行解析，内存占用与文件大小无关。
+"""
+import asyncio
+import itertools
+import struct
+import urllib.request
+import zlib
+from collections import deque
+
+from rongcloud import codec
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZIP_LOCAL_HEADER = b'PK\x03\x04'
+ZIP_CENTRAL_HEADER = b'PK\x01\x02'
+ZIP_END_HEADER = b'PK\x05\x06'
+ZIP_DATA_DESCRIPTOR = b'PK\x07\x08'
+_ZIP_HEADER = struct.Struct('<4sHHHHHIIIHH')
+
+
+class HistoryError(Exception):
+    """
+    获取或解析历史记录失败，result 为接口返回结果或错误信息，如：{'code': 1002, 'msg': ...}。
+    """
+
+    def __init__(self, result):
+        super().__init__(codec.dumps(result))
+        self.result = result
+
+
+class _Stream:
+    """
+    带回退缓冲的分块读取器。
+    """
+
+    def __init__(self, fp, chunk_size, stats):
+        self._fp = fp
+        self.chunk_size = chunk_size
+        self._stats = stats
+        self._buf = b''
+
+    def read(self):
+        if self._buf:
+            data, self._buf = self._buf, b''
+            return data
+        data = self._fp.read(self.chunk_size)
+        self._stats['bytes'] += len(data)
+        return data
+
+    def read_exact(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.read()
+            if not chunk:
+                raise HistoryError({'code': -1, 'reason': 'Unexpected end of archive.'})
+            data += chunk
+        self.unread(data[size:])
+        return data[:size]
+
+    def unread(self, data):
+        if data:
+            self._buf = data + self._buf
+
+
+def _inflate(stream, decompressor):
+    """
+    以 decompressor 解压直至其数据流结束，剩余数据退回 stream。
+    """
+    while not decompressor.eof:
+        data = decompressor.unconsumed_tail or stream.read()
+        if not data:
+            raise HistoryError({'code': -1, 'reason': 'Unexpected end of archive.'})
+        # 限制单次解压输出，高压缩比的日志也不会一次展开出大块内存
+        out = decompressor.decompress(data, stream.chunk_size)
+        if out:
+            yield out
+    stream.unread(decompressor.unused_data)
+
+
+def _gunzip(stream):
+    # 支持多个 gzip 成员首尾相接
+    while True:
+        yield from _inflate(stream, zlib.decompressobj(16 + zlib.MAX_WBITS))
+        head = stream.read()
+        if not head:
+            return
+        stream.unread(head)
+
+
+def _unzip(stream):
+    # 按本地文件头顺序读取各文件，无需中央目录，因此可边下载边解压
+    while True:
+        signature = stream.read_exact(4)
+        if signature in (ZIP_CENTRAL_HEADER, ZIP_END_HEADER):
+            return
+        if signature != ZIP_LOCAL_HEADER:
+            raise HistoryError({'code': -1, 'reason': 'Invalid zip archive.'})
+        header = _ZIP_HEADER.unpack(signature + stream.read_exact(_ZIP_HEADER.size - 4))
+        _, _, flags, method, _, _, _, compressed_size, _, name_len, extra_len = header
+        stream.read_exact(name_len + extra_len)
+        if method == zlib.DEFLATED:
+            yield from _inflate(stream, zlib.decompressobj(-zlib.MAX_WBITS))
+        elif method == 0 and not flags & 0x08:
+            remaining = compressed_size
+            while remaining:
+                data = stream.read()
+                if not data:
+                    raise HistoryError({'code': -1, 'reason': 'Unexpected end of archive.'})
+                stream.unread(data[remaining:])
+                data = data[:remaining]
+                remaining -= len(data)
+                yield data
+        else:
+            raise HistoryError({'code': -1, 'reason': 'Unsupported zip compression method {}.'.format(method)})
+        if flags & 0x08:
+            descriptor = stream.read_exact(4)
+            stream.read_exact(12 if descriptor == ZIP_DATA_DESCRIPTOR else 8)
+
+
+def iter_lines(fp, chunk_size=64 * 1024, stats=None):
+    """
+    从文件对象 fp 中按块读取 gzip、zip 或未压缩的日志，逐行返回 bytes。
+    :param fp:                  支持 read(size) 的文件对象，如 HTTP 响应或本地文件。
+    :param chunk_size:          每次读取的字节数。
+    :param stats:               统计字典，读取过程中累加 bytes 下载字节数。
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('bytes', 0)
+    stream = _Stream(fp, chunk_size, stats)
+    head = stream.read()
+    stream.unread(head)
+    if head.startswith(GZIP_MAGIC):
+        blocks = _gunzip(stream)
+    elif head.startswith(ZIP_LOCAL_HEADER):
+        blocks = _unzip(stream)
+    else:
+        blocks = iter(stream.read, b'')
+    rest = b''
+    for block in blocks:
+        lines = (rest + block).split(b'\n')
+        rest = lines.pop()
+        yield from lines
+    if rest:
+        yield rest
+
+
+def _matcher(object_names, target_types, user_ids):
+    object_names = set(object_names) if object_names else None
+    target_types = set(target_types) if target_types else None
+    user_ids = set(user_ids) if user_ids else None
+    # 按消息类型过滤时，先以字节查找跳过明显不符的行，避免逐行解析 JSON
+    needles = [name.encode('utf8') for name in object_names] if object_names else None
+
+    def prefilter(line):
+        return needles is None or any(needle in line for needle in needles)
+
+    def match(record):
+        if object_names is not None and record.get('classname') not in object_names:
+            return False
+        if target_types is not None and record.get('targetType') not in target_types:
+            return False
+        if user_ids is not None and record.get('fromUserId') not in user_ids \
+                and record.get('targetId') not in user_ids:
+            return False
+        return True
+
+    return prefilter, match
+
+
+def iter_records(fp, object_names=None, target_types=None, user_ids=None, chunk_size=64 * 1024, stats=None):
+    """
+    流式解析日志文件对象 fp，逐条返回符合条件的消息记录字典，无法解析的行跳过并计入 stats['skipped']。
+    :param fp:                  日志文件对象，见 iter_lines。
+    :param object_names:        消息类型列表，如 ['RC:TxtMsg']，为空时不过滤。
+    :param target_types:        会话类型列表，如 [1, 3]，为空时不过滤。
+    :param user_ids:            用户 Id 列表，发送者或接收者在其中时返回，为空时不过滤。
+    :param chunk_size:          每次读取的字节数。
+    :param stats:               统计字典，累加 bytes、lines、records、skipped。
+    """
+    if stats is None:
+        stats = {}
+    for key in ('lines', 'records', 'skipped'):
+        stats.setdefault(key, 0)
+    prefilter, match = _matcher(object_names, target_types, user_ids)
+    for line in iter_lines(fp, chunk_size, stats):
+        line = line.strip()
+        if not line:
+            continue
+        stats['lines'] += 1
+        if not prefilter(line):
+            continue
+        start = line.find(b'{')
+        try:
+            record = codec.loads(line[start:]) if start >= 0 else None
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            stats['skipped'] += 1
+            continue
+        if match(record):
+            stats['records'] += 1
+            yield record
+
+
+def download_records(url, timeout=30, **kwargs):
+    """
+    下载 url 指向的日志文件并流式解析，参数同 iter_records。
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as fp:
+        yield from iter_records(fp, **kwargs)
+
+
+class AsyncRecords:
+    """
+    在线程池中驱动同步的记录迭代器，供 async for 遍历。下载、解压与解析都不在事件循环线程中执行，
+    每次在线程池中取出 batch_size 条记录，减少线程切换。
+    """
+
+    def __init__(self, records, batch_size=1000):
+        self._records = records
+        self._batch_size = batch_size
+        self._batch = deque()
+        self._done = False
+
+    def _next_batch(self):
+        return list(itertools.islice(self._records, self._batch_size))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._batch:
+            if self._done:
+                raise StopAsyncIteration
+            batch = await asyncio.get_running_loop().run_in_executor(None, self._next_batch)
+            self._done = len(batch) < self._batch_size
+            self._batch.extend(batch)
+            if not self._batch:
+                raise StopAsyncIteration
+        return self._batch.popleft()
+
+    async def aclose(self):
+        """
+        提前结束遍历时关闭下载连接。
+        """
+        self._done = True
+        self._batch.clear()
+        close = getattr(self._records, 'close', None)
+        if close is not None:
+            await asyncio.get_running_loop().run_in_executor(None, close)
+
+
+def export_hour(url, handler, timeout=30, **kwargs):
+    """
+    下载并解析单个小时的日志，每条记录调用 handler(record)。
+    :return:                    统计结果，如：{"code":200, "bytes":1024, "lines":10, "records":8, "skipped":0}
+    """
+    stats = {}
+    if url:
+        try:
+            for record in download_records(url, timeout, stats=stats, **kwargs):
+                handler(record)
+        except HistoryError as e:
+            return dict(e.result, **stats)
+        except Exception as e:
+            return dict({'code': -1, 'reason': str(e)}, **stats)
+    return dict({'code': 200, 'bytes': 0, 'lines': 0, 'records': 0, 'skipped': 0}, **stats)
@@ -0,0 +1,155 @@
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class _HostStats:
+    def __init__(self):
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.down = False
+
+
+class HostSelector:
+    """
+    按健康度选择 host，线程安全。
+    每个 host 记录延迟与错误率的指数加权移动平均（EWMA），请求发往得分最好的 host，得分 = 延迟 * (1 + 4 * 错误率)；
+    为避免来回切换，只有当前 host 得分比最优 host 差 hysteresis 以上时才切换。
+    错误率达到 error_threshold 的 host 被标记为不可用，由后台线程定期探测，可连通后恢复。
+    """
+
+    def __init__(self, host_url, alpha=0.3, error_threshold=0.5, hysteresis=0.2, probe_interval=5, probe_timeout=2):
+        """
+        :param host_url:            API 地址，多个地址以 ; 分隔，靠前的地址优先。
+        :param alpha:               EWMA 平滑系数，越大越偏重最近的请求。
+        :param error_threshold:     错误率达到该值时标记 host 不可用。
+        :param hysteresis:          切换 host 的得分差阈值。
+        :param probe_interval:      探测不可用 host 的间隔秒数。
+        :param probe_timeout:       探测连接超时秒数。
+        """
+        self.host_list = host_url.split(';')
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.hysteresis = hysteresis
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self._stats = {host: _HostStats() for host in self.host_list}
+        self._current = self.host_list[0]
+        self._lock = threading.Lock()
+        self._prober = None
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        注册 host 切换回调，切换时以 listener(old_host, new_host) 调用。
+        """
+        self._listeners.append(listener)
+
+    def _score(self, host, default_latency):
+        stats = self._stats[host]
+        latency = default_latency if stats.latency is None else stats.latency
+        return latency * (1 + 4 * stats.error_rate)
+
+    def _best(self, exclude=None):
+        # 未测量过延迟的 host 按已知的最大延迟计算，不会仅因没有数据而被优先选中
+        measured = [stats.latency for stats in self._stats.values() if stats.latency is not None]
+        default_latency = max(measured) if measured else 1.0
+        candidates = [host for host in self.host_list if host != exclude and not self._stats[host].down]
+        if not candidates:
+            candidates = [host for host in self.host_list if host != exclude] or self.host_list
+        return min(candidates, key=lambda host: self._score(host, default_latency)), default_latency
+
+    def get_url(self):
+        with self._lock:
+            best, default_latency = self._best()
+            current = self._current
+            if best == current:
+                return current
+            if not self._stats[current].down and \
+                    self._score(current, default_latency) <= self._score(best, default_latency) * (1 + self.hysteresis):
+                return current
+            self._current = best
+        for listener in self._listeners:
+            listener(current, best)
+        return best
+
+    def next_url(self, url):
+        """
+        返回 url 之外得分最好的 host，用于重试。
+        """
+        with self._lock:
+            return self._best(exclude=url)[0]
+
+    def report(self, url, latency, error=False):
+        """
+        记录一次请求结果。
+        :param latency:             请求耗时秒数。
+        :param error:               是否失败（网络错误或 5xx）。
+        """
+        with self._lock:
+            stats = self._stats.get(url)
+            if stats is None:
+                return
+            stats.requests += 1
+            if error:
+                stats.errors += 1
+            else:
+                stats.latency = latency if stats.latency is None else \
+                    self.alpha * latency + (1 - self.alpha) * stats.latency
+            stats.error_rate = self.alpha * (1.0 if error else 0.0) + (1 - self.alpha) * stats.error_rate
+            if stats.error_rate >= self.error_threshold and not stats.down:
+                stats.down = True
+                self._start_prober()
+            elif stats.error_rate < self.error_threshold / 2:
+                stats.down = False
+
+    def switch_url(self):
+        """
+        将当前 host 记为失败一次，兼容旧接口。
+        """
+        self.report(self._current, 0, error=True)
+
+    def stats(self):
+        """
+        :return:                    各 host 状态，如：{'http://api-cn.ronghub.com': {'latency': 0.05, 'error_rate': 0.0,
+                                    'requests': 10, 'errors': 0, 'down': False, 'current': True}}
+        """
+        with self._lock:
+            return {host: {'latency': stats.latency,
+                           'error_rate': stats.error_rate,
+                           'requests': stats.requests,
+                           'errors': stats.errors,
+                           'down': stats.down,
+                           'current': host == self._current}
+                    for host, stats in self._stats.items()}
+
+    def _start_prober(self):
+        if self._prober is None or not self._prober.is_alive():
+            self._prober = threading.Thread(target=self._probe_loop, name='rongcloud-host-prober', daemon=True)
+            self._prober.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.probe_interval)
+            with self._lock:
+                down = [host for host, stats in self._stats.items() if stats.down]
+            if not down:
+                return
+            for host in down:
+                if self._probe(host):
+                    with self._lock:
+                        stats = self._stats[host]
+                        stats.down = False
+                        stats.error_rate = min(stats.error_rate, self.error_threshold / 2)
+
+    def _probe(self, host):
+        parts = urlsplit(host)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        try:
+            socket.create_connection((parts.hostname, port), self.probe_timeout).close()
+            return True
+        except OSError:
+            return False
@@ -1,18 +1,51 @@
 import json
-import urllib
+import urllib.parse
 
+from rongcloud import codec
 from rongcloud.module import Module, ParamException
 
 
+def _split_recipients(chunk):
+    """
+    将 [(user_id, values[, push_content[, push_data]]), ...] 拆分为模板消息所需的各列表。
+    """
+    to_user_ids = [item[0] for item in chunk]
+    values = [item[1] for item in chunk]
+    push_content = [item[2] for item in chunk] if len(chunk[0]) > 2 else None
+    push_data = [item[3] for item in chunk] if len(chunk[0]) > 3 else None
+    return to_user_ids, values, push_content, push_data
+
+
+def _with_user_info(content, user_info):
+    """
+    将发送者信息写入消息内容的 user 字段，不修改传入的 content。
+    """
+    if user_info is None or not isinstance(content, dict):
+        return content
+    return dict(content, user=user_info)
+
+
 class Message(Module):
     def __init__(self, rc):
         super().__init__(rc)
-        self._user_info = None
+
+    @staticmethod
+    def user_info(user_id, name, icon, extra=None):
+        """
+        生成随消息携带的发送者信息，作为 Private.send、Group.send、Group.send_direction 的 user_info 参数传入。
+        :param user_id:             用户 Id。
+        :param name:                用户名称。
+        :param icon:                用户头像地址。
+        :param extra:               扩展信息。
+        :return:                    如：{"id":"u1","name":"name","portrait":"http://a.com/1.png","extra":""}
+        """
+        return {'id': user_id, 'name': name, 'portrait': icon, 'extra': '' if extra is None else extra}
 
     def set_user_info(self, user_id, name, icon, extra=None):
-        param_dict = locals().copy()
-        format_str = '"id":"{{ user_id }}","name":"{{ name }}","icon":"{{ icon }}","extra":"{{ extra }}"'
-        self._user_info = self._render(param_dict, format_str)
+        """
+        同 user_info。不再保存在 Message 对象上，请将返回值作为发送接口的 user_info 参数传入。
+        """
+        return self.user_info(user_id, name, icon, extra)
 
     def broadcast(self, from_user_id, object_name, content, push_content=None, push_data=None, os=None,
                   content_available=0, push_ext=None):
@@ -38,7 +71,7 @@ class Message(Module):
         :param push_ext             推送通知属性设置，详细查看 pushExt 结构说明，pushExt 为 JSON 结构请求时需要做转义处理。disablePush 为 true 时此属性无效。暂不支持海外数据中心（非必传）
         :return:                    请求返回结果，code 返回码，200 为正常。如：{"code":200}
         """
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(content))
         param_dict = locals().copy()
         url = '/message/broadcast.json'
         format_str = 'fromUserId={{ from_user_id }}' \
@@ -58,24 +91,24 @@ class Message(Module):
             self._check_param(os, str)
             self._check_param(content_available, int, '0~1')
             self._check_param(push_ext, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
     def get_private(self):
-        return Private(self._rc)
+        return self._rc._module(Private)
 
     def get_group(self):
-        return Group(self._rc)
+        return self._rc._module(Group)
 
     def get_chatroom(self):
-        return Chatroom(self._rc)
+        return self._rc._module(Chatroom)
 
     def get_system(self):
-        return System(self._rc)
+        return self._rc._module(System)
 
     def get_history(self):
-        return History(self._rc)
+        return self._rc._module(History)
 
 
 class Private(Module):
@@ -83,7 +116,8 @@ class Private(Module):
         super().__init__(rc)
 
     def send(self, from_user_id, to_user_ids, object_name, content, push_content=None, push_data=None,
-             count=-1, verify_blacklist=0, is_persisted=1, is_include_sender=0, content_available=0, expansion=False, disable_push=False, push_ext=None):
+             count=-1, verify_blacklist=0, is_persisted=1, is_include_sender=0, content_available=0, expansion=False, disable_push=False, push_ext=None,
+             user_info=None):
         """
         发送单聊消息。
         :param from_user_id:        发送人用户 Id。（必传）
@@ -110,14 +144,14 @@ class Private(Module):
         :param content_available:   针对 iOS 平台，对 SDK 处于后台暂停状态时为静默推送，是 iOS7 之后推出的一种推送方式。
                                     允许应用在收到通知后在后台运行一段代码，且能够马上执行，查看详细。
                                     1 表示为开启，0 表示为关闭，默认为 0（非必传）
-        :param attach_user_info:    是否携带用户信息，默认为 False。（非必传）
+        :param user_info:           随消息携带的发送者信息，如 Message.user_info(...) 的返回值，content 为 dict 时写入其 user 字段。（非必传）
         :param expansion            是否为可扩展消息，默认为 false，设为 true 时终端在收到该条消息后，可对该条消息设置扩展信息。暂不支持海外数据中心（非必传）
         :param disable_push         是否为静默消息，默认为 false，设为 true 时终端用户离线情况下不会收到通知提醒。暂不支持海外数据中心（非必传）
         :param push_ext             推送通知属性设置，详细查看 pushExt 结构说明，pushExt 为 JSON 结构请求时需要做转义处理。disablePush 为 true 时此属性无效。暂不支持海外数据中心（非必传）
         :return:                    返回码，200 为正常。如：{"code":200}
         """
         to_user_ids = self._tran_list(to_user_ids)
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(_with_user_info(content, user_info)))
         param_dict = locals().copy()
         url = '/message/private/publish.json'
         format_str = 'fromUserId={{ from_user_id }}' \
@@ -152,10 +186,38 @@ class Private(Module):
             self._check_param(expansion, bool)
             self._check_param(disable_push, bool)
             self._check_param(push_ext, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
+        except ParamException as e:
+            return json.loads(str(e))
+
+    def send_bulk(self, from_user_id, to_user_ids, object_name, content, chunk_size=1000, max_workers=4, **kwargs):
+        """
+        向任意数量的用户发送单聊消息。接收用户按 chunk_size 分片，以最多 max_workers 个并发请求发送。
+        :param from_user_id:        发送人用户 Id。（必传）
+        :param to_user_ids:         接收用户 Id 的可迭代对象，数量不限，可为生成器，按分片惰性读取；
+                                    AsyncRongCloud 下还可为异步可迭代对象。（必传）
+        :param object_name:         消息类型，同 send。（必传）
+        :param content:             发送消息内容，同 send。（必传）
+        :param chunk_size:          每次请求的接收用户数，上限为 1000，默认为 1000。（非必传）
+        :param max_workers:         并发请求数，默认为 4。（非必传）
+        :param kwargs:              其余参数同 send。（非必传）
+        :return:                    合并后的发送结果，code 为 200 表示全部分片发送成功，否则为首个失败分片的返回码；
+                                    total 接收用户总数；chunks 各分片结果；failed 失败的分片，其 items 为该分片的接收用户，可重新发送。如：
+                                    {"code":1004, "total":2000, "chunks":[{"index":0, "count":1000, "result":{"code":200}},
+                                    {"index":1, "count":1000, "items":[...], "result":{"code":1004}}],
+                                    "failed":[{"index":1, "count":1000, "items":[...], "result":{"code":1004}}]}
+        """
+        try:
+            self._check_param(chunk_size, int, '1~1000')
+            self._check_param(max_workers, int, '1~64')
         except ParamException as e:
             return json.loads(str(e))
 
+        def send_chunk(chunk):
+            return self.send(from_user_id, chunk, object_name, content, **kwargs)
+
+        return self._fan_out(send_chunk, self._tran_list(to_user_ids), chunk_size, max_workers)
+
     def recall(self, from_user_id, target_id, uid, sent_time, is_admin=0, is_delete=0, extra=None):
         """
         撤回已发送的单聊消息，撤回时间无限制，只允许撤回用户自己发送的消息。
@@ -188,7 +250,7 @@ class Private(Module):
             self._check_param(is_admin, int)
             self._check_param(is_delete, int)
             self._check_param(extra, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -220,7 +282,7 @@ class Private(Module):
         if push_content is None:
             push_content = []
         to_user_ids = self._tran_list(to_user_ids)
-        content = json.dumps(content).replace('\"', '\\"')
+        content = codec.dumps(content).replace('\"', '\\"')
         param_dict = locals().copy()
         url = '/message/private/publish_template.json'
         format_str = '{' \
@@ -255,11 +317,38 @@ class Private(Module):
             self._check_param(verify_blacklist, int, '0~1')
             self._check_param(content_available, int, '0~1')
             self._check_param(disable_push, bool)
-            xx = self._render(param_dict, format_str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._json_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
+    def send_template_bulk(self, from_user_id, recipients, object_name, content, chunk_size=1000, max_workers=4,
+                           **kwargs):
+        """
+        向任意数量的用户发送单聊模板消息。接收用户按 chunk_size 分片，以最多 max_workers 个并发请求发送。
+        :param from_user_id:        发送人用户 Id。（必传）
+        :param recipients:          接收用户的可迭代对象，每项为 (user_id, values) 或 (user_id, values, push_content)
+                                    或 (user_id, values, push_content, push_data)，含义同 send_template 中对应列表的元素。
+                                    可为生成器，按分片惰性读取；AsyncRongCloud 下还可为异步可迭代对象。（必传）
+        :param object_name:         消息类型，同 send_template。（必传）
+        :param content:             发送消息内容，同 send_template。（必传）
+        :param chunk_size:          每次请求的接收用户数，上限为 1000，默认为 1000。（非必传）
+        :param max_workers:         并发请求数，默认为 4。（非必传）
+        :param kwargs:              其余参数同 send_template。（非必传）
+        :return:                    合并后的发送结果，格式同 send_bulk。
+        """
+        try:
+            self._check_param(chunk_size, int, '1~1000')
+            self._check_param(max_workers, int, '1~64')
+        except ParamException as e:
+            return json.loads(str(e))
+
+        def send_chunk(chunk):
+            to_user_ids, values, push_content, push_data = _split_recipients(chunk)
+            return self.send_template(from_user_id, to_user_ids, object_name, values, content,
+                                      push_content, push_data, **kwargs)
+
+        return self._fan_out(send_chunk, recipients, chunk_size, max_workers)
+
     def send_status_message(self, from_user_id, to_user_ids, object_name, content, verify_blacklist=0, is_include_sender=0):
         '''
         发送单聊状态消息
@@ -273,7 +362,7 @@ class Private(Module):
         :return:                        请求返回结果，code 返回码，200 为正常。如：{"code":200}
         '''
 
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(content))
         to_user_ids = self._tran_list(to_user_ids)
         param_dict = locals().copy()
 
@@ -295,7 +384,7 @@ class Private(Module):
             self._check_param(content, str)
             self._check_param(verify_blacklist, int, '0~1')
             self._check_param(is_include_sender, int, '0~1')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e.info))
 
@@ -305,7 +394,8 @@ class Group(Module):
         super().__init__(rc)
 
     def send(self, from_user_id, to_group_id, object_name, content, push_content=None, push_data=None,
-             is_persisted=1, is_include_sender=0, is_mentioned=0, content_available=0, expansion=False, disable_push=False, push_ext=None):
+             is_persisted=1, is_include_sender=0, is_mentioned=0, content_available=0, expansion=False, disable_push=False, push_ext=None,
+             user_info=None):
         """
         发送群组消息，以一个用户身份向群组发送消息，单条消息最大 128k。
         :param from_user_id:        发送人用户 Id 。（必传）
@@ -332,14 +422,14 @@ class Group(Module):
         :param content_available:   针对 iOS 平台，对 SDK 处于后台暂停状态时为静默推送，是 iOS7 之后推出的一种推送方式。
                                     允许应用在收到通知后在后台运行一段代码，且能够马上执行，查看详细。
                                     1 表示为开启，0 表示为关闭，默认为 0（非必传）
-        :param attach_user_info:    是否携带用户信息，默认为 False。（非必传）
+        :param user_info:           随消息携带的发送者信息，如 Message.user_info(...) 的返回值，content 为 dict 时写入其 user 字段。（非必传）
         :param expansion            是否为可扩展消息，默认为 false，设为 true 时终端在收到该条消息后，可对该条消息设置扩展信息。暂不支持海外数据中心（非必传）
         :param disable_push         是否为静默消息，默认为 false，设为 true 时终端用户离线情况下不会收到通知提醒。暂不支持海外数据中心
         :param push_ext             推送通知属性设置，详细查看 pushExt 结构说明，pushExt 为 JSON 结构请求时需要做转义处理。
                                     disablePush 为 true 时此属性无效。暂不支持海外数据中心（非必传）
         :return:                    请求返回结果，code 返回码，200 为正常。如：{"code":200}
         """
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(_with_user_info(content, user_info)))
         param_dict = locals().copy()
         url = '/message/group/publish.json'
         format_str = 'fromUserId={{ from_user_id }}' \
@@ -369,12 +459,12 @@ class Group(Module):
             self._check_param(expansion, bool)
             self._check_param(disable_push, bool)
             self._check_param(push_ext, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
     def send_direction(self, from_user_id, to_group_id, to_user_ids, object_name, content, push_content=None, push_data=None,
-             is_persisted=1, is_include_sender=0, is_mentioned=0, content_available=0):
+             is_persisted=1, is_include_sender=0, is_mentioned=0, content_available=0, user_info=None):
         """
         发送群组定向消息
         :param from_user_id:        发送人用户 Id 。（必传）
@@ -403,11 +493,11 @@ class Group(Module):
         :param content_available:   针对 iOS 平台，对 SDK 处于后台暂停状态时为静默推送，是 iOS7 之后推出的一种推送方式。
                                     允许应用在收到通知后在后台运行一段代码，且能够马上执行，查看详细。
                                     1 表示为开启，0 表示为关闭，默认为 0（非必传）
-        :param attach_user_info:    是否携带用户信息，默认为 False。（非必传）
+        :param user_info:           随消息携带的发送者信息，如 Message.user_info(...) 的返回值，content 为 dict 时写入其 user 字段。（非必传）
         :return:                    请求返回结果，code 返回码，200 为正常。如：{"code":200}
         """
         to_user_ids = self._tran_list(to_user_ids)
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(_with_user_info(content, user_info)))
         param_dict = locals().copy()
         url = '/message/group/publish.json'
         format_str = 'fromUserId={{ from_user_id }}' \
@@ -434,7 +524,7 @@ class Group(Module):
             self._check_param(is_include_sender, int, '0~1')
             self._check_param(is_mentioned, int, '0~1')
             self._check_param(content_available, int, '0~1')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -470,7 +560,7 @@ class Group(Module):
             self._check_param(is_admin, int)
             self._check_param(is_delete, int)
             self._check_param(extra, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -487,7 +577,7 @@ class Group(Module):
         :return:                        请求返回结果，code 返回码，200 为正常。如：{"code":200}
         '''
 
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(content))
         to_group_ids = self._tran_list(to_group_ids)
         param_dict = locals().copy()
         url = '/statusmessage/group/publish.json'
@@ -513,7 +603,7 @@ class Group(Module):
             self._check_param(content, str)
             self._check_param(verify_blacklist, int, '0~1')
             self._check_param(is_include_sender, int, '0~1')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e.info))
 
@@ -534,7 +624,7 @@ class Chatroom(Module):
                                     如果 objectName 为自定义消息类型，该参数可自定义格式，不限于 JSON。（必传）
         :return:                    请求返回结果，code 返回码，200 为正常。如：{"code":200}
         """
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(content))
         param_dict = locals().copy()
         url = '/message/chatroom/publish.json'
         format_str = 'fromUserId={{ from_user_id }}' \
@@ -546,7 +636,7 @@ class Chatroom(Module):
             self._check_param(to_chatroom_id, str)
             self._check_param(object_name, str, '1~32')
             self._check_param(content, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -582,7 +672,7 @@ class Chatroom(Module):
             self._check_param(is_admin, int)
             self._check_param(is_delete, int)
             self._check_param(extra, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -598,7 +688,7 @@ class Chatroom(Module):
                                     如果 objectName 为自定义消息类型，该参数可自定义格式，不限于 JSON。（必传）
         :return:                    请求返回结果，code 返回码，200 为正常。如：{"code":200}
         """
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(content))
         param_dict = locals().copy()
         url = '/message/chatroom/broadcast.json'
         format_str = 'fromUserId={{ from_user_id }}' \
@@ -608,7 +698,7 @@ class Chatroom(Module):
             self._check_param(from_user_id, str, '1~64')
             self._check_param(object_name, str, '1~32')
             self._check_param(content, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -644,7 +734,7 @@ class System(Module):
         :return:                    请求返回结果，code 返回码，200 为正常。如：{"code":200}
         """
         to_user_ids = self._tran_list(to_user_ids)
-        content = urllib.parse.quote(json.dumps(content))
+        content = urllib.parse.quote(codec.dumps(content))
         param_dict = locals().copy()
         url = '/message/system/publish.json'
         format_str = 'fromUserId={{ from_user_id }}' \
@@ -670,10 +760,60 @@ class System(Module):
             self._check_param(content_available, int, '0~1')
             self._check_param(disable_push, bool)
             self._check_param(push_ext, str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
+    def send_bulk(self, from_user_id, to_user_ids, object_name, content, chunk_size=100, max_workers=4, **kwargs):
+        """
+        向任意数量的用户发送系统消息。接收用户按 chunk_size 分片，以最多 max_workers 个并发请求发送。
+        :param from_user_id:        发送人用户 Id。（必传）
+        :param to_user_ids:         接收用户 Id 的可迭代对象，数量不限，可为生成器，按分片惰性读取；
+                                    AsyncRongCloud 下还可为异步可迭代对象。（必传）
+        :param object_name:         消息类型，同 send。（必传）
+        :param content:             发送消息内容，同 send。（必传）
+        :param chunk_size:          每次请求的接收用户数，上限为 100，默认为 100。（非必传）
+        :param max_workers:         并发请求数，默认为 4。（非必传）
+        :param kwargs:              其余参数同 send。（非必传）
+        :return:                    合并后的发送结果，格式同 Private.send_bulk。
+        """
+        try:
+            self._check_param(chunk_size, int, '1~100')
+            self._check_param(max_workers, int, '1~64')
+        except ParamException as e:
+            return json.loads(str(e))
+
+        def send_chunk(chunk):
+            return self.send(from_user_id, chunk, object_name, content, **kwargs)
+
+        return self._fan_out(send_chunk, self._tran_list(to_user_ids), chunk_size, max_workers)
+
+    def send_template_bulk(self, from_user_id, recipients, object_name, content, chunk_size=1000, max_workers=4,
+                           **kwargs):
+        """
+        向任意数量的用户发送系统模板消息。接收用户按 chunk_size 分片，以最多 max_workers 个并发请求发送。
+        :param from_user_id:        发送人用户 Id。（必传）
+        :param recipients:          接收用户的可迭代对象，格式同 Private.send_template_bulk。（必传）
+        :param object_name:         消息类型，同 send_template。（必传）
+        :param content:             发送消息内容，同 send_template。（必传）
+        :param chunk_size:          每次请求的接收用户数，上限为 1000，默认为 1000。（非必传）
+        :param max_workers:         并发请求数，默认为 4。（非必传）
+        :param kwargs:              其余参数同 send_template。（非必传）
+        :return:                    合并后的发送结果，格式同 Private.send_bulk。
+        """
+        try:
+            self._check_param(chunk_size, int, '1~1000')
+            self._check_param(max_workers, int, '1~64')
+        except ParamException as e:
+            return json.loads(str(e))
+
+        def send_chunk(chunk):
+            to_user_ids, values, push_content, push_data = _split_recipients(chunk)
+            return self.send_template(from_user_id, to_user_ids, object_name, content, values,
+                                      push_content, push_data, **kwargs)
+
+        return self._fan_out(send_chunk, recipients, chunk_size, max_workers)
+
     def send_template(self, from_user_id, to_user_ids, object_name, content, values,
                       push_content=None, push_data=None, content_available=0):
         """
@@ -702,7 +842,7 @@ class System(Module):
         """
         向多个用户发送不同内容的系统消息。。
         """
-        content = json.dumps(content).replace('\"', '\\"')
+        content = codec.dumps(content).replace('\"', '\\"')
         param_dict = locals().copy()
         url = '/message/system/publish_template.json'
         format_str = '{' \
@@ -733,8 +873,7 @@ class System(Module):
             self._check_param(push_content, list)
             self._check_param(push_data, list)
             self._check_param(content_available, int, '0~1')
-            xx = self._render(param_dict, format_str)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._json_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -764,10 +903,76 @@ class History(Module):
         format_str = 'date={{ date }}'
         try:
             self._check_param(date, str, '10~10')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
+        except ParamException as e:
+            return json.loads(str(e))
+
+    def records(self, date, object_names=None, target_types=None, user_ids=None, timeout=30):
+        """
+        获取指定小时的历史记录并流式下载、解压、解析，逐条返回消息记录字典，内存占用与日志文件大小无关。
+        :param date:                指定小时，格式同 query，如 "2014010101"。（必传）
+        :param object_names:        消息类型列表，如 ['RC:TxtMsg']，为空时不过滤。
+        :param target_types:        会话类型列表，如 [1, 3]，为空时不过滤。
+        :param user_ids:            用户 Id 列表，发送者或接收者在其中时返回，为空时不过滤。
+        :param timeout:             下载超时秒数。
+        :return:                    消息记录迭代器，如：{"fromUserId":"u1","targetId":"u2","targetType":1,
+                                    "classname":"RC:TxtMsg","content":{...},"msgUID":"..."}。
+                                    获取下载地址失败时抛出 history.HistoryError。AsyncRongCloud 下需 await 获取
+                                    history.AsyncRecords 异步迭代器，以 async for 遍历，下载与解析在线程池中进行。
+        """
+        from rongcloud.history import AsyncRecords, HistoryError, download_records
+
+        def open_records(rep):
+            if rep.get('code') != 200:
+                raise HistoryError(dict(rep))
+            if not rep.get('url'):
+                records = iter(())
+            else:
+                records = download_records(rep['url'], timeout, object_names=object_names, target_types=target_types,
+                                           user_ids=user_ids)
+            return AsyncRecords(records) if self._rc.is_async else records
+
+        return self._then(self.query(date), open_records)
+
+    def export(self, dates, handler, object_names=None, target_types=None, user_ids=None, max_workers=4,
+               timeout=30):
+        """
+        并发下载、解析多个小时的历史记录，每条符合条件的记录调用 handler(record)。
+        :param dates:               小时列表，如 ["2014010100", "2014010101"]，也可为单个小时字符串。（必传）
+        :param handler:             处理单条记录的函数，会在多个线程中并发调用。（必传）
+        :param object_names:        消息类型列表，为空时不过滤。
+        :param target_types:        会话类型列表，为空时不过滤。
+        :param user_ids:            用户 Id 列表，为空时不过滤。
+        :param max_workers:         同时处理的小时数，默认为 4。
+        :param timeout:             下载超时秒数。
+        :return:                    合并结果，格式同 Private.send_bulk，每个分片为一个小时，failed 中 items 为该小时，可再次传入重试；
+                                    分片的 result 为该小时的统计，获取下载地址失败时为 query 的返回结果，
+                                    如：{"code":200, "date":"2014010101", "bytes":1024, "lines":10, "records":8, "skipped":0}
+        """
+        try:
+            self._check_param(max_workers, int, '1~64')
         except ParamException as e:
             return json.loads(str(e))
 
+        from rongcloud.history import export_hour
+        filters = {'object_names': object_names, 'target_types': target_types, 'user_ids': user_ids}
+
+        def export(rep, date):
+            if rep.get('code') != 200:
+                return rep
+            return dict(export_hour(rep.get('url'), handler, timeout, **filters), date=date)
+
+        if self._rc.is_async:
+            import asyncio
+
+            async def run(chunk):
+                rep = await self.query(chunk[0])
+                return await asyncio.get_running_loop().run_in_executor(None, export, rep, chunk[0])
+
+            return self._fan_out(run, self._tran_list(dates), 1, max_workers)
+        return self._fan_out(lambda chunk: export(self.query(chunk[0]), chunk[0]), self._tran_list(dates), 1,
+                             max_workers)
+
     def remove(self, date):
         """
         删除服务端消息记录日志文件，文件内容为 APP 内指定某天某小时内的所有会话消息记录，删除后文件将在随后的 10 分钟内被永久删除。
@@ -781,6 +986,6 @@ class History(Module):
         format_str = 'date={{ date }}'
         try:
             self._check_param(date, str, '10~10')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
@@ -0,0 +1,122 @@
+import bisect
+import threading
+
+PHASES = ('render', 'sign', 'connect', 'send', 'first_byte', 'read', 'parse', 'total')
+
+
+class RequestEvent:
+    """
+    一次请求（每次重试各算一次）的结果与分阶段耗时。
+    endpoint 接口地址；host 请求的 host；attempt 第几次请求，从 1 开始；
+    code 返回码，网络错误为 -1，将被重试的 HTTP 错误为 HTTP 状态码；error 网络错误类型，见 retry 模块；
+    timings 各阶段耗时秒数，键见 PHASES，未经历的阶段不存在。
+    """
+
+    def __init__(self, endpoint, host, attempt, code, error, timings):
+        self.endpoint = endpoint
+        self.host = host
+        self.attempt = attempt
+        self.code = code
+        self.error = error
+        self.timings = timings
+
+    def __repr__(self):
+        return 'RequestEvent({}, {}, attempt={}, code={}, total={:.4f})'.format(
+            self.endpoint, self.host, self.attempt, self.code, self.timings.get('total', 0))
+
+
+class Observer:
+    """
+    请求观察者基类，通过 RongCloud(observers=[...]) 或 RongCloud.add_observer 注册。
+    回调在发起请求的线程中同步执行，应尽量轻量；回调抛出的异常会被忽略。
+    """
+
+    def on_request(self, event):
+        pass
+
+    def on_host_switch(self, old_host, new_host):
+        pass
+
+
+class Histogram:
+    """
+    对数分桶直方图，范围 0.1 毫秒至 60 秒，分位数按桶上界估算。
+    """
+    BOUNDS = [0.0001 * (1.25 ** i) for i in range(60)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        return {'count': self.count,
+                'mean': self.sum / self.count if self.count else 0.0,
+                'p50': self.percentile(0.5),
+                'p90': self.percentile(0.9),
+                'p99': self.percentile(0.99),
+                'max': self.max}
+
+
+class HistogramObserver(Observer):
+    """
+    进程内聚合：按接口统计各阶段耗时直方图与返回码分布，以及 host 切换次数，线程安全。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.host_switches = 0
+
+    def on_request(self, event):
+        with self._lock:
+            stats = self._endpoints.get(event.endpoint)
+            if stats is None:
+                stats = self._endpoints[event.endpoint] = {'codes': {}, 'hosts': {}, 'phases': {}}
+            stats['codes'][event.code] = stats['codes'].get(event.code, 0) + 1
+            stats['hosts'][event.host] = stats['hosts'].get(event.host, 0) + 1
+            for phase, value in event.timings.items():
+                histogram = stats['phases'].get(phase)
+                if histogram is None:
+                    histogram = stats['phases'][phase] = Histogram()
+                histogram.add(value)
+
+    def on_host_switch(self, old_host, new_host):
+        with self._lock:
+            self.host_switches += 1
+
+    def summary(self):
+        """
+        :return:                    如：{'/message/private/publish.json': {'codes': {200: 10}, 'hosts': {...},
+                                    'phases': {'total': {'count': 10, 'mean': 0.05, 'p50': ..., 'p90': ...,
+                                    'p99': ..., 'max': ...}, ...}}}
+        """
+        with self._lock:
+            return {endpoint: {'codes': dict(stats['codes']),
+                               'hosts': dict(stats['hosts']),
+                               'phases': {phase: histogram.summary() for phase, histogram in stats['phases'].items()}}
+                    for endpoint, stats in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self.host_switches = 0
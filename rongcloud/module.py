@@ -1,19 +1,27 @@
-import hashlib
-import json
-import random
+import functools
+import http.client
 import socket
 import time
-from urllib import request
-from urllib.error import HTTPError, URLError
 
-from jinja2 import Template
+from rongcloud import codec, results
+from rongcloud.metrics import RequestEvent
+from rongcloud.pool import ConnectError
+from rongcloud.retry import ERROR_CONNECT, ERROR_NETWORK, ERROR_TIMEOUT
+from rongcloud.timeouts import Timeout
 
-HEADER_APP_KEY = 'App-Key'
-HEADER_NONCE = 'Nonce'
-HEADER_TIMESTAMP = 'Timestamp'
-HEADER_SIGNATURE = 'Signature'
-HEADER_USER_AGENT = 'User-Agent'
-HEADER_CONTENT_TYPE = 'Content-Type'
+CONTENT_TYPE_FORM = 'application/x-www-form-urlencoded'
+CONTENT_TYPE_JSON = 'application/json'
+
+BODY_FORM = 'form'
+BODY_JSON = 'json'
+_CONTENT_TYPES = {BODY_FORM: CONTENT_TYPE_FORM, BODY_JSON: CONTENT_TYPE_JSON}
+
+
+@functools.lru_cache(maxsize=512)
+def _compile(format_str):
+    # jinja2 仅在首次渲染请求体时导入，避免拖慢 SDK 的导入速度
+    from jinja2 import Template
+    return Template(format_str)
 
 
 class ParamException(Exception):
@@ -25,45 +33,247 @@ class ParamException(Exception):
         return self.info
 
 
+class Request:
+    """
+    待发送的请求，由 Module._form_request / Module._json_request 构造。
+    请求体在构造时编码为 bytes，Content-Type 由请求体类型决定，传输层不再检查请求体内容。
+    """
+
+    def __init__(self, url, body=b'', kind=BODY_FORM, render_time=None):
+        """
+        :param url:                 接口地址，如：/user/info.json。
+        :param body:                请求体，str 按 UTF-8 编码。
+        :param kind:                请求体类型，BODY_FORM 或 BODY_JSON。
+        :param render_time:         构造请求体的耗时秒数，用于请求观察者。
+        """
+        self.url = url
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.kind = kind
+        self.content_type = _CONTENT_TYPES[kind]
+        self.render_time = render_time
+
+
+def _error_kind(e):
+    """
+    :return:                    transport 抛出的异常对应的错误类型，ERROR_CONNECT、ERROR_TIMEOUT 或 ERROR_NETWORK。
+    """
+    if isinstance(e, ConnectError):
+        return ERROR_CONNECT
+    if isinstance(e, socket.timeout):
+        return ERROR_TIMEOUT
+    return ERROR_NETWORK
+
+
+class _Call:
+    """
+    一次 Module._send 调用的限流、截止时间与重试状态。_sync_send 与 _async_send 共用，只在等待与发送时是否 await 上不同。
+    """
+
+    def __init__(self, module, request):
+        self._module = module
+        self._rc = module._rc
+        self._request = request
+        self._url = request.url
+        self._timeout = module._timeout(request.url)
+        self._called = time.monotonic()
+        self._start = None
+        self._host = None
+        self._attempt = 0
+        self._timings = None
+        self._begin = None
+        self._sent = None
+        self.result = None
+
+    def reserve(self):
+        """
+        :return:                    限流需等待的秒数；超出等待上限时返回 None，此时 result 为限流错误。
+        """
+        wait = self._rc.rate_limiter.reserve(self._url, self._module._wait_limit(self._timeout))
+        if wait is None:
+            self.result = self._module._rate_limited(self._url)
+        return wait
+
+    def prepare(self):
+        """
+        开始下一次尝试，首次尝试选择主机，之后切换到下一个主机。
+        :return:                    transport.request 的参数元组；已超过截止时间时返回 None，此时 result 为超时错误。
+        """
+        if self._attempt == 0:
+            self._start = time.monotonic()
+            self._host = self._rc.host_url.get_url()
+        else:
+            self._host = self._rc.host_url.next_url(self._host)
+        self._attempt += 1
+        render_time = self._request.render_time
+        self._timings = {'render': render_time} if self._attempt == 1 and render_time is not None else {}
+        self._begin = time.perf_counter()
+        budget = self._timeout.budget(self._called)
+        if budget is None:
+            self.result = self._module._finish(self._url, self._host, self._attempt, None, None, ERROR_TIMEOUT,
+                                               self._timings, self._begin)
+            return None
+        headers = self._rc.signer.sign(self._request.content_type)
+        self._timings['sign'] = time.perf_counter() - self._begin
+        self._sent = time.monotonic()
+        return self._host, self._url, self._request.body, headers, self._timings, budget
+
+    def retry_delay(self, status, rep, error):
+        """
+        记录本次尝试的结果。
+        :return:                    重试前等待的秒数；不再重试时返回 None，此时 result 为最终返回值。
+        """
+        now = time.monotonic()
+        self._rc.host_url.report(self._host, now - self._sent, error is not None or status >= 500)
+        delay = self._rc.retry_policy.next_delay(self._url, self._attempt, now - self._start, error, status)
+        deadline = self._timeout.deadline
+        if delay is not None and deadline is not None and now - self._called + delay >= deadline:
+            delay = None
+        if delay is None:
+            self.result = self._module._finish(self._url, self._host, self._attempt, status, rep, error,
+                                               self._timings, self._begin)
+        else:
+            self._module._observe(self._url, self._host, self._attempt, -1 if error else status, error,
+                                  self._timings, self._begin)
+        return delay
+
+
 class Module:
     def __init__(self, rc):
         self._rc = rc
-        socket.setdefaulttimeout(10)
-
-    def _signature(self):
-        nonce = str(random.randint(0, 1000000000))
-        timestamp = str(int(time.time()))
-        sha1 = (self._rc.app_secret + nonce + timestamp).encode('utf8')
-        signature = hashlib.sha1(sha1).hexdigest()
-        return {HEADER_APP_KEY: self._rc.app_key,
-                HEADER_NONCE: nonce,
-                HEADER_TIMESTAMP: timestamp,
-                HEADER_SIGNATURE: signature,
-                HEADER_USER_AGENT: 'rc-python-sdk/3.1.1'}
-
-    def _http_post(self, url, data=''):
-        data = '{}'.encode('utf-8') if data is None else data.encode('utf-8')
-        headers = self._signature()
-        try:
-            json.loads(data)
-            headers[HEADER_CONTENT_TYPE] = 'application/json'
-        except ValueError:
-            pass
-        try:
-            req = request.Request(self._rc.host_url.get_url() + url, headers=headers, data=data)
-            rep = request.urlopen(req).read()
-        except HTTPError as e:
-            rep = e.read()
-        except URLError:
-            self._rc.host_url.switch_url()
-            rep = json.loads('{"code":-1, "reason":"URL error."}')
-        except socket.timeout:
-            self._rc.host_url.switch_url()
-            rep = json.loads('{"code":-1, "reason":"Socket timeout."}')
+
+    @staticmethod
+    def _form_request(url, params=None, format_str=None):
+        """
+        以模板渲染 application/x-www-form-urlencoded 请求体，不传 format_str 时请求体为空。
+        """
+        if format_str is None:
+            return Request(url)
+        start = time.perf_counter()
+        body = _compile(format_str).render(params)
+        return Request(url, body, BODY_FORM, time.perf_counter() - start)
+
+    @staticmethod
+    def _json_request(url, params, format_str=None):
+        """
+        以模板渲染 JSON 请求体；不传 format_str 时将 params 直接序列化为 JSON。
+        """
+        start = time.perf_counter()
+        body = codec.dumps(params) if format_str is None else _compile(format_str).render(params)
+        return Request(url, body, BODY_JSON, time.perf_counter() - start)
+
+    def _send(self, request):
+        flight = self._rc.single_flight
+        if flight is not None and request.url in flight.urls:
+            key = (request.url, request.body)
+            if self._rc.is_async:
+                return flight.async_do(key, functools.partial(self._async_send, request))
+            return flight.do(key, functools.partial(self._sync_send, request))
+        if self._rc.is_async:
+            return self._async_send(request)
+        return self._sync_send(request)
+
+    def _sync_send(self, request):
+        call = _Call(self, request)
+        wait = call.reserve()
+        if wait is None:
+            return call.result
+        if wait > 0:
+            time.sleep(wait)
+        while True:
+            args = call.prepare()
+            if args is None:
+                return call.result
+            status = rep = error = None
+            try:
+                status, rep = self._rc.transport.request(*args)
+            except (OSError, http.client.HTTPException) as e:
+                error = _error_kind(e)
+            delay = call.retry_delay(status, rep, error)
+            if delay is None:
+                return call.result
+            time.sleep(delay)
+
+    async def _async_send(self, request):
+        import asyncio
+        call = _Call(self, request)
+        wait = call.reserve()
+        if wait is None:
+            return call.result
+        if wait > 0:
+            await asyncio.sleep(wait)
+        while True:
+            args = call.prepare()
+            if args is None:
+                return call.result
+            status = rep = error = None
+            try:
+                status, rep = await self._rc.transport.request(*args)
+            except (OSError, http.client.HTTPException) as e:
+                error = _error_kind(e)
+            delay = call.retry_delay(status, rep, error)
+            if delay is None:
+                return call.result
+            await asyncio.sleep(delay)
+
+    def _finish(self, url, host, attempt, status, rep, error, timings, begin):
+        if error is None and self._rc.typed_results:
+            # 类型化结果在首次访问字段时才解析，不计入 parse 阶段
+            rep = results.wrap(url, rep, status)
         else:
-            rep = json.loads(rep.decode('utf8'))
+            mark = time.perf_counter()
+            rep = self._on_response(status, rep, error)
+            if error is None:
+                timings['parse'] = time.perf_counter() - mark
+        if self._rc.observers:
+            self._observe(url, host, attempt, rep.get('code'), error, timings, begin)
         return rep
 
+    def _observe(self, url, host, attempt, code, error, timings, begin):
+        observers = self._rc.observers
+        if not observers:
+            return
+        timings['total'] = time.perf_counter() - begin + timings.get('render', 0)
+        event = RequestEvent(url, host, attempt, code, error, timings)
+        for observer in observers:
+            try:
+                observer.on_request(event)
+            except Exception:
+                pass
+
+    def _timeout(self, url):
+        """
+        接口的超时设置。RetryPolicy.deadline 与 TimeoutPolicy 的 deadline 含义相同，同时设置时以较小者为准。
+        """
+        timeout = self._rc.timeouts.get(url)
+        deadline = self._rc.retry_policy.deadline
+        if deadline is not None and (timeout.deadline is None or deadline < timeout.deadline):
+            timeout = Timeout(timeout.connect, timeout.read, deadline)
+        return timeout
+
+    def _wait_limit(self, timeout):
+        """
+        等待限流令牌的最长秒数，不超过接口的 deadline。
+        """
+        limit = self._rc.rate_limiter.timeout
+        if timeout.deadline is not None and (limit is None or limit > timeout.deadline):
+            return timeout.deadline
+        return limit
+
+    @staticmethod
+    def _rate_limited(url):
+        return {'code': 1008, 'msg': '{} 调用频率超限！'.format(url)}
+
+    @staticmethod
+    def _on_response(status, rep, error):
+        if error == ERROR_TIMEOUT:
+            return {'code': -1, 'reason': 'Socket timeout.'}
+        if error is not None:
+            return {'code': -1, 'reason': 'URL error.'}
+        try:
+            return codec.loads(rep)
+        except ValueError:
+            return {'code': -1, 'reason': 'HTTP error {}.'.format(status)}
+
     @staticmethod
     def _check_param(obj, obj_type, obj_range=None):
         if obj is None:
@@ -84,9 +294,78 @@ class Module:
 
     @staticmethod
     def _render(params, format_str):
-        template = Template(format_str)
-        data = template.render(params)
-        return data
+        return _compile(format_str).render(params)
+
+    def _fan_out(self, func, items, chunk_size, max_workers):
+        """
+        将 items 按 chunk_size 分片后并发执行 func(chunk)，items 可为生成器，AsyncRongCloud 下还可为异步可迭代对象。
+        """
+        from rongcloud.bulk import async_chunked, chunked
+        if self._rc.is_async and hasattr(items, '__aiter__'):
+            return self._run_chunks(func, async_chunked(items, chunk_size), max_workers)
+        return self._run_chunks(func, chunked(items, chunk_size), max_workers)
+
+    def _run_chunks(self, func, chunks, max_workers):
+        """
+        并发执行 func(chunk)，chunks 为已分好的分片，AsyncRongCloud 下返回协程。
+        """
+        from rongcloud.bulk import async_fan_out, fan_out
+        if self._rc.is_async:
+            return async_fan_out(func, chunks, max_workers)
+        return fan_out(func, chunks, max_workers)
+
+    def _then(self, rep, func):
+        """
+        对接口返回值执行 func 后返回；AsyncRongCloud 下 rep 为协程，返回等待 rep 后再执行 func 的协程。
+        """
+        if self._rc.is_async:
+            async def then():
+                return func(await rep)
+            return then()
+        return func(rep)
+
+    def _cached(self, key):
+        """
+        :param key:                 (url, id)。
+        :return:                    读缓存中 key 对应的返回值，未启用缓存或未命中时返回 None。
+        """
+        cache = self._rc.cache
+        rep = None if cache is None else cache.get(key)
+        return None if rep is None else self._typed(key[0], rep)
+
+    def _typed(self, url, rep):
+        """
+        typed_results 时将不经过 _send 得到的 dict 返回值（读缓存、合并结果）包装为 url 对应的结果类型。
+        """
+        return results.wrap(url, rep) if self._rc.typed_results else rep
+
+    def _cache_result(self, key, rep):
+        """
+        将成功的返回值写入读缓存后返回，AsyncRongCloud 下 rep 为协程。
+        """
+        cache = self._rc.cache
+        if cache is None:
+            return rep
+
+        def store(rep):
+            if rep.get('code') == 200:
+                # 缓存解析后的 dict，命中时再按 typed_results 包装
+                cache.set(key, rep.data if isinstance(rep, results.Result) else rep)
+            return rep
+        return self._then(rep, store)
+
+    def _invalidate(self, keys, rep):
+        """
+        写接口完成后清除读缓存中的 keys，AsyncRongCloud 下 rep 为协程。
+        """
+        cache = self._rc.cache
+        if cache is None:
+            return rep
+
+        def drop(rep):
+            cache.invalidate(keys)
+            return rep
+        return self._then(rep, drop)
 
     @staticmethod
     def _tran_list(param):
@@ -0,0 +1,231 @@
+import http.client
+import select
+import socket
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from rongcloud.transport import DEFAULT_TIMEOUT, Transport
+
+# 复用的 keep-alive 连接可能已被服务端关闭，发送请求时出现此类异常说明请求未送达，换一条新连接重发一次；
+# 请求发出后的异常可能发生在服务端处理之后，交由 RetryPolicy 决定是否重试，避免重复发送消息
+_STALE_ERRORS = (ConnectionResetError, BrokenPipeError)
+
+
+def _mark(timings, phase, start):
+    now = time.perf_counter()
+    if timings is not None:
+        timings[phase] = now - start
+    return now
+
+
+def _is_dropped(sock):
+    """
+    空闲连接上有可读事件说明服务端已关闭连接（或发来了意外的数据），不能再复用。
+    """
+    try:
+        if hasattr(select, 'poll'):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class ConnectError(OSError):
+    """
+    建立连接失败，请求尚未发出。
+    """
+
+
+def _set_remaining(sock, deadline):
+    # 按本次请求剩余的时长设置 socket 超时，服务端逐字节慢速返回时也不会超过读取超时
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise socket.timeout('timed out')
+    sock.settimeout(remaining)
+
+
+class ConnectionPool:
+    """
+    单个 host 的 HTTP/1.1 keep-alive 连接池，线程安全。
+    """
+
+    def __init__(self, host_url, max_connections=10, idle_timeout=60):
+        """
+        :param host_url:            host 地址，如：http://api-cn.ronghub.com。
+        :param max_connections:     该 host 最大连接数，超出时请求会等待空闲连接。
+        :param idle_timeout:        空闲连接保留秒数，超时后被回收。
+        """
+        parts = urlsplit(host_url)
+        self.host_url = host_url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._idle = deque()
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+        self._requests = 0
+
+    def _new_conn(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port)
+        return http.client.HTTPConnection(self.host, self.port)
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] >= self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            conn.close()
+            self._evicted += 1
+
+    def _get_conn(self, wait_timeout=None):
+        """
+        :param wait_timeout:        连接数已满时等待空闲连接的最长秒数，超时抛出 ConnectError，None 为一直等待。
+        """
+        end = None if wait_timeout is None else time.monotonic() + wait_timeout
+        with self._cond:
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    if conn.sock is None or _is_dropped(conn.sock):
+                        conn.close()
+                        self._evicted += 1
+                        continue
+                    self._in_use += 1
+                    self._reused += 1
+                    return conn, True
+                if self._in_use < self.max_connections:
+                    self._in_use += 1
+                    self._created += 1
+                    return self._new_conn(), False
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise ConnectError(socket.timeout('timed out waiting for a free connection'))
+                self._cond.wait(remaining)
+
+    def _put_conn(self, conn, reusable):
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                conn.close()
+            self._cond.notify()
+
+    def request(self, method, url, body=None, headers=None, timings=None, timeout=DEFAULT_TIMEOUT):
+        """
+        发送请求并读取完整响应。
+        :param timings:             传入 dict 时记录各阶段耗时秒数：connect（仅新建连接）、send、first_byte、read。
+        :param timeout:             (连接超时, 读取超时) 秒数，只设置在本连接的 socket 上。连接超时同时限制连接数已满时
+                                    等待空闲连接的时长；读取超时为发出请求至读完响应的总时长，与 asyncio 版本一致。
+        :return:                    (status, body)
+        """
+        connect_timeout, read_timeout = timeout
+        with self._cond:
+            self._requests += 1
+        while True:
+            conn, reused = self._get_conn(connect_timeout)
+            reusable = False
+            try:
+                mark = time.perf_counter()
+                if conn.sock is None:
+                    conn.timeout = connect_timeout
+                    try:
+                        conn.connect()
+                    except OSError as e:
+                        raise ConnectError(e)
+                    mark = _mark(timings, 'connect', mark)
+                sock = conn.sock
+                deadline = time.monotonic() + read_timeout
+                sock.settimeout(read_timeout)
+                try:
+                    conn.request(method, self.prefix + url, body, headers or {})
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    continue
+                mark = _mark(timings, 'send', mark)
+                _set_remaining(sock, deadline)
+                rep = conn.getresponse()
+                mark = _mark(timings, 'first_byte', mark)
+                chunks = []
+                while True:
+                    _set_remaining(sock, deadline)
+                    chunk = rep.read1(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                if rep.length:
+                    # 读完 Content-Length 之前连接已关闭，与 rep.read() 一样抛出 IncompleteRead
+                    raise http.client.IncompleteRead(b''.join(chunks), rep.length)
+                # 按 Content-Length 读完时 read1 不会关闭响应，关闭后连接才能发送下一个请求
+                rep.close()
+                data = b''.join(chunks)
+                _mark(timings, 'read', mark)
+                reusable = not rep.will_close
+                return rep.status, data
+            finally:
+                self._put_conn(conn, reusable)
+
+    def stats(self):
+        with self._cond:
+            self._evict_idle()
+            return {'created': self._created,
+                    'reused': self._reused,
+                    'evicted': self._evicted,
+                    'requests': self._requests,
+                    'idle': len(self._idle),
+                    'in_use': self._in_use}
+
+    def close(self):
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                conn.close()
+
+
+class PoolManager(Transport):
+    """
+    按 host 管理连接池，同一个 RongCloud 实例下的所有模块共享，为默认的 Transport 实现。
+    """
+
+    def __init__(self, host_list, max_connections=10, idle_timeout=60):
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._pools = {}
+        for host_url in host_list:
+            self.get_pool(host_url)
+
+    def get_pool(self, host_url):
+        pool = self._pools.get(host_url)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(host_url)
+                if pool is None:
+                    pool = ConnectionPool(host_url, self.max_connections, self.idle_timeout)
+                    self._pools[host_url] = pool
+        return pool
+
+    def request(self, host_url, url, body=None, headers=None, timings=None, timeout=DEFAULT_TIMEOUT):
+        return self.get_pool(host_url).request('POST', url, body, headers, timings, timeout)
+
+    def stats(self):
+        """
+        :return:                    各 host 连接池统计，如：{'http://api-cn.ronghub.com': {'created': 1, ...}}
+        """
+        return {host_url: pool.stats() for host_url, pool in list(self._pools.items())}
+
+    def close(self):
+        for pool in list(self._pools.values()):
+            pool.close()
@@ -1,6 +1,7 @@
 import json
-import urllib
+import urllib.parse
 
+from rongcloud import codec
 from rongcloud.module import Module, ParamException
 
 
@@ -47,7 +48,6 @@ class Push(Module):
         :return:                    请求返回结果，code 返回码，200 为正常；id 推送唯一标识。
                                     如：{"code":200,"id":"50whSR6kQiHb7YgFwQzXIb"}
         """
-        param_dict = locals().copy()
         url = '/push.json'
         try:
             # key - platform
@@ -74,7 +74,7 @@ class Push(Module):
             audience['is_to_all'] = is_to_all
             # key - message
             self._check_param(object_name, str, '1~32')
-            content = urllib.parse.quote(json.dumps(content))
+            content = urllib.parse.quote(codec.dumps(content))
             message = {'content': content, 'objectName': object_name}
             # key - notification
             notification = {'alert': alert}
@@ -96,8 +96,7 @@ class Push(Module):
                 notification['android'] = android
             json_data = {'platform': platforms, 'fromuserid': from_user_id, 'audience': audience,
                          'message': message, 'notification': notification}
-            format_str = json.dumps(json_data, ensure_ascii=False)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._json_request(url, json_data))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -139,7 +138,6 @@ class Push(Module):
         :return:                    请求返回结果，code 返回码，200 为正常；id 推送唯一标识。
                                     如：{"code":200,"id":"50whSR6kQiHb7YgFwQzXIb"}
         """
-        param_dict = locals().copy()
         url = '/push.json'
         try:
             # key - platform
@@ -196,7 +194,6 @@ class Push(Module):
             if len(android) > 0:
                 notification['android'] = android
             json_data = {'platform': platforms, 'audience': audience, 'notification': notification}
-            format_str = json.dumps(json_data, ensure_ascii=False)
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._json_request(url, json_data))
         except ParamException as e:
             return json.loads(str(e))
@@ -0,0 +1,82 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    令牌桶，线程安全。rate 为每秒生成的令牌数，capacity 为桶容量（允许的突发请求数）。
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, timeout=None):
+        """
+        预占一个令牌。
+        :param timeout:             最长等待秒数，None 为不限，0 为不等待。
+        :return:                    需要等待的秒数，0 表示可立即发送；超过 timeout 时返回 None，且不占用令牌。
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if timeout is not None and wait > timeout:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def acquire(self, timeout=None):
+        """
+        获取一个令牌，必要时阻塞等待。
+        :return:                    是否获取成功。
+        """
+        wait = self.reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+class RateLimiter:
+    """
+    按接口地址限流，如：RateLimiter({'/message/broadcast.json': (2, 3600), '/message/private/publish.json': (100, 1)})。
+    未配置的接口不限流。
+    """
+
+    def __init__(self, limits=None, timeout=None):
+        """
+        :param limits:              接口限额，{url: (count, per)} 表示每 per 秒最多 count 次，
+                                    也可为 (count, per, burst)，burst 为允许的突发请求数，默认为 1，即请求均匀发出。
+        :param timeout:             等待令牌的最长秒数，None 为一直等待，0 为立即失败。
+        """
+        self.timeout = timeout
+        self._buckets = {}
+        for url, limit in (limits or {}).items():
+            self.set_limit(url, *limit)
+
+    def set_limit(self, url, count, per=1, burst=1):
+        self._buckets[url] = TokenBucket(count / per, burst)
+
+    def remove_limit(self, url):
+        self._buckets.pop(url, None)
+
+    def reserve(self, url, timeout=None):
+        """
+        :return:                    需要等待的秒数，超时返回 None，见 TokenBucket.reserve。
+        """
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            return 0
+        return bucket.reserve(self.timeout if timeout is None else timeout)
+
+    def acquire(self, url, timeout=None):
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            return True
+        return bucket.acquire(self.timeout if timeout is None else timeout)
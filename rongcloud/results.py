@@ -0,0 +1,174 @@
+"""
+可选的类型化返回结果，RongCloud(typed_results=True) 时启用。
+结果对象只保存响应的原始 bytes，首次访问字段时才解析；支持 rep['code']、rep.get('code') 等 dict 用法，
+不需要改写按 dict 使用返回值的代码。参数错误、网络错误等未收到响应的情况仍返回 dict。
+"""
+from rongcloud import codec
+
+
+class Result:
+    """
+    通用返回结果。
+    """
+    __slots__ = ('_raw', '_status', '_data')
+
+    def __init__(self, raw, status=200):
+        """
+        :param raw:                 响应体 bytes。
+        :param status:              HTTP 状态码，响应体不是 JSON 时用于生成错误信息。
+        """
+        self._raw = raw
+        self._status = status
+        self._data = None
+
+    @property
+    def data(self):
+        """
+        解析后的 dict，首次访问时解析并释放原始响应体。
+        """
+        if self._data is None:
+            try:
+                self._data = codec.loads(self._raw)
+            except ValueError:
+                self._data = {'code': -1, 'reason': 'HTTP error {}.'.format(self._status)}
+            self._raw = None
+        return self._data
+
+    @property
+    def code(self):
+        return self.data.get('code')
+
+    @property
+    def ok(self):
+        return self.code == 200
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __eq__(self, other):
+        if isinstance(other, Result):
+            other = other.data
+        return self.data == other
+
+    __hash__ = None
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def keys(self):
+        return self.data.keys()
+
+    def items(self):
+        return self.data.items()
+
+    def to_dict(self):
+        return self.data
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.data)
+
+
+class SendResult(Result):
+    """
+    发送消息的返回结果。
+    """
+    __slots__ = ()
+
+    @property
+    def message_uids(self):
+        """
+        服务端返回的消息 UID 列表，未返回时为空列表。
+        """
+        return self.data.get('messageUIDs', [])
+
+
+class ChatroomMember:
+    __slots__ = ('id', 'time')
+
+    def __init__(self, id, time):
+        self.id = id
+        self.time = time
+
+    def __repr__(self):
+        return 'ChatroomMember({!r}, {!r})'.format(self.id, self.time)
+
+
+class ChatroomMembers(Result):
+    """
+    查询聊天室成员的返回结果。
+    """
+    __slots__ = ('_users',)
+
+    def __init__(self, raw, status=200):
+        super().__init__(raw, status)
+        self._users = None
+
+    @property
+    def total(self):
+        return self.data.get('total', 0)
+
+    @property
+    def users(self):
+        """
+        :return:                    ChatroomMember 列表。
+        """
+        if self._users is None:
+            self._users = [ChatroomMember(user.get('id'), user.get('time')) for user in self.data.get('users', [])]
+        return self._users
+
+    @property
+    def user_ids(self):
+        return [user.get('id') for user in self.data.get('users', [])]
+
+
+class TagMap(Result):
+    """
+    查询用户标签的返回结果。
+    """
+    __slots__ = ()
+
+    @property
+    def tags(self):
+        """
+        :return:                    {user_id: [tag, ...]}
+        """
+        return self.data.get('result', {})
+
+    def tags_of(self, user_id):
+        return self.tags.get(user_id, [])
+
+
+RESULT_TYPES = {
+    '/message/private/publish.json': SendResult,
+    '/message/private/publish_template.json': SendResult,
+    '/statusmessage/private/publish.json': SendResult,
+    '/message/group/publish.json': SendResult,
+    '/statusmessage/group/publish.json': SendResult,
+    '/message/chatroom/publish.json': SendResult,
+    '/message/chatroom/broadcast.json': SendResult,
+    '/message/system/publish.json': SendResult,
+    '/message/system/publish_template.json': SendResult,
+    '/message/broadcast.json': SendResult,
+    '/chatroom/user/query.json': ChatroomMembers,
+    '/user/tags/get.json': TagMap,
+}
+
+
+def wrap(url, raw, status=200):
+    """
+    按接口地址将响应体包装为对应的结果类型，未登记的接口使用 Result。
+    raw 也可为已解析的 dict，如读缓存中保存的返回值。
+    """
+    rep = RESULT_TYPES.get(url, Result)(raw, status)
+    if isinstance(raw, dict):
+        rep._raw, rep._data = None, raw
+    return rep
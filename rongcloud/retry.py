@@ -0,0 +1,84 @@
+import random
+
+# 只读接口，请求已发出后失败也可以安全重试
+IDEMPOTENT_URLS = frozenset([
+    '/user/info.json',
+    '/user/checkOnline.json',
+    '/user/block/query.json',
+    '/user/blacklist/query.json',
+    '/user/whitelist/query.json',
+    '/user/tags/get.json',
+    '/group/user/query.json',
+    '/group/user/gag/list.json',
+    '/group/ban/query.json',
+    '/group/user/ban/whitelist/query.json',
+    '/chatroom/query.json',
+    '/chatroom/user/query.json',
+    '/chatroom/user/exist.json',
+    '/chatroom/users/exist.json',
+    '/chatroom/user/gag/list.json',
+    '/chatroom/user/ban/query.json',
+    '/chatroom/user/block/list.json',
+    '/chatroom/user/whitelist/query.json',
+    '/chatroom/message/priority/query.json',
+    '/chatroom/whitelist/query.json',
+    '/chatroom/keepalive/query.json',
+    '/message/history.json',
+    '/sensitiveword/list.json',
+    '/conversation/notification/get.json',
+])
+
+# 请求失败的类型
+ERROR_CONNECT = 'connect'
+ERROR_TIMEOUT = 'timeout'
+ERROR_NETWORK = 'network'
+
+
+class RetryPolicy:
+    """
+    请求重试策略。连接失败时请求尚未发出，任何接口都会重试；
+    超时、连接中断及 retry_status 中的 HTTP 状态码只对 idempotent_urls 中的接口重试，避免重复发送消息。
+    每次重试都会切换到另一个 host。
+    """
+
+    def __init__(self, max_attempts=2, backoff=0.1, max_backoff=2.0, jitter=True,
+                 retry_status=(500, 502, 503, 504), idempotent_urls=IDEMPOTENT_URLS, deadline=None):
+        """
+        :param max_attempts:        最大请求次数（含首次），1 为不重试。
+        :param backoff:             首次重试前的等待秒数，之后每次翻倍。
+        :param max_backoff:         单次等待的最大秒数。
+        :param jitter:              是否在 [0, 等待时间] 内随机取值，避免大量客户端同时重试。
+        :param retry_status:        可重试的 HTTP 状态码。
+        :param idempotent_urls:     可安全重试的接口地址集合。
+        :param deadline:            一次调用（含限流等待与所有重试）的总时长上限秒数，None 为不限。与 TimeoutPolicy 的
+                                    deadline 含义相同，同样会缩短每次请求的超时，两者同时设置时以较小者为准。
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_status = frozenset(retry_status)
+        self.idempotent_urls = frozenset(idempotent_urls)
+        self.deadline = deadline
+
+    def is_retryable(self, url, error=None, status=None):
+        if error == ERROR_CONNECT:
+            return True
+        if url not in self.idempotent_urls:
+            return False
+        return error is not None or status in self.retry_status
+
+    def next_delay(self, url, attempt, elapsed, error=None, status=None):
+        """
+        :param attempt:             已完成的请求次数。
+        :param elapsed:             本次调用已耗时秒数。
+        :return:                    下次重试前的等待秒数，不再重试时返回 None。
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(url, error, status):
+            return None
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
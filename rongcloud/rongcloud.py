@@ -1,60 +1,166 @@
-from rongcloud.chatroom import Chatroom
-from rongcloud.conversation import Conversation
-from rongcloud.group import Group
-from rongcloud.message import Message
-from rongcloud.push import Push
-from rongcloud.sensitive import Sensitive
-from rongcloud.user import User
+import importlib
 import threading
-import time
-import datetime
+
+# 兼容 from rongcloud.rongcloud import User 等旧用法，各模块在首次访问时才导入
+_LAZY_EXPORTS = {
+    'Chatroom': 'rongcloud.chatroom',
+    'Conversation': 'rongcloud.conversation',
+    'Group': 'rongcloud.group',
+    'Message': 'rongcloud.message',
+    'Push': 'rongcloud.push',
+    'Sensitive': 'rongcloud.sensitive',
+    'User': 'rongcloud.user',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    return getattr(importlib.import_module(module), name)
+
 
 class RongCloud:
-    class _HostUrl:
-        def __init__(self, host_url):
-            self.host_list = host_url.split(';')
-            self.now = 0
-            self.last_change_url_duration = 30
-            self.last_change_url_time = 0
-
-        def get_url(self):
-            return self.host_list[self.now]
-
-        def switch_url(self):
-            lock = threading.Lock()
-            with lock:
-                # 检查距离上次更换uri的时间间隔
-                now = time.time()
-                seconds = (datetime.datetime.fromtimestamp(now) - datetime.datetime.fromtimestamp(self.last_change_url_time)).seconds
-                if seconds >= self.last_change_url_duration:
-                    if self.now < len(self.host_list) - 1:
-                        self.now = self.now + 1
-                    else:
-                        self.now = 0
-                    self.last_change_url_time = time.time()
-
-    def __init__(self, app_key, app_secret, host_url='http://api-cn.ronghub.com;http://api2-cn.ronghub.com'):
+    is_async = False
+
+    def __init__(self, app_key, app_secret, host_url='http://api-cn.ronghub.com;http://api2-cn.ronghub.com',
+                 max_connections=10, idle_timeout=60, rate_limits=None, rate_limit_timeout=None, retry_policy=None,
+                 observers=None, reuse_signature=False, typed_results=False, cache=None, single_flight=None,
+                 timeouts=None, transport=None):
+        """
+        :param app_key:             应用 App Key。
+        :param app_secret:          应用 App Secret。
+        :param host_url:            API 地址，多个地址以 ; 分隔，按健康度选择，详见 HostSelector。
+        :param max_connections:     每个 host 的最大 keep-alive 连接数。
+        :param idle_timeout:        空闲连接保留秒数，超时后被回收。
+        :param rate_limits:         按接口限流，{url: (count, per)} 表示每 per 秒最多 count 次，
+                                    如：{'/message/broadcast.json': (2, 3600)}，详见 RateLimiter。
+        :param rate_limit_timeout:  等待限流令牌的最长秒数，None 为一直等待，0 为不等待；
+                                    超时的请求不会发出，返回 {"code":1008, "msg":"..."}。
+        :param retry_policy:        请求失败时的重试策略，默认为 RetryPolicy()，即失败后切换 host 重试一次，详见 RetryPolicy。
+        :param observers:           请求观察者列表，每次请求结束及 host 切换时回调，详见 metrics.Observer。
+        :param reuse_signature:     同一秒内的请求是否复用同一组签名，详见 Signer。
+        :param typed_results:       为 True 时收到响应的接口返回 results 模块中的结果对象（支持 dict 用法），
+                                    如 SendResult、ChatroomMembers、TagMap，默认返回 dict。
+        :param cache:               读接口本地缓存，如：ReadCache(maxsize=10000, ttl=60)，默认不缓存，详见 cache.ReadCache。
+        :param single_flight:       合并相同的并发只读请求，如：SingleFlight()，默认不合并，详见 singleflight.SingleFlight。
+        :param timeouts:            按接口设置连接超时、读取超时与单次调用总时长，默认为 TimeoutPolicy()，
+                                    即连接与读取各 10 秒、不限总时长，详见 timeouts.TimeoutPolicy。
+        :param transport:           请求传输实现，默认为按 host 复用 keep-alive 连接的 PoolManager，
+                                    传入时 max_connections 与 idle_timeout 不生效，详见 transport.Transport。
+        """
+        from rongcloud.hosts import HostSelector
+        from rongcloud.ratelimit import RateLimiter
+        from rongcloud.retry import RetryPolicy
+        from rongcloud.signer import Signer
+        from rongcloud.timeouts import TimeoutPolicy
         self.app_key = app_key
         self.app_secret = app_secret
-        self.host_url = self._HostUrl(host_url)
+        self.signer = Signer(app_key, app_secret, reuse_signature)
+        self.host_url = HostSelector(host_url)
+        self.transport = self._new_transport(max_connections, idle_timeout) if transport is None else transport
+        self.rate_limiter = RateLimiter(rate_limits, rate_limit_timeout)
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.timeouts = TimeoutPolicy() if timeouts is None else timeouts
+        self.observers = list(observers or [])
+        self.typed_results = typed_results
+        self.cache = cache
+        self.single_flight = single_flight
+        self.host_url.add_listener(self._on_host_switch)
+        self._modules = {}
+        self._modules_lock = threading.Lock()
+
+    def _new_transport(self, max_connections, idle_timeout):
+        from rongcloud.pool import PoolManager
+        return PoolManager(self.host_url.host_list, max_connections, idle_timeout)
+
+    @property
+    def pool(self):
+        """
+        同 transport，保留以兼容旧代码。
+        """
+        return self.transport
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def _on_host_switch(self, old_host, new_host):
+        for observer in self.observers:
+            try:
+                observer.on_host_switch(old_host, new_host)
+            except Exception:
+                pass
+
+    def get_pool_stats(self):
+        """
+        :return:                    各 host 连接池统计：created 新建连接数，reused 复用次数，evicted 空闲回收数，
+                                    requests 请求数，idle 当前空闲连接数，in_use 当前使用中连接数。
+        """
+        return self.transport.stats()
+
+    def get_host_stats(self):
+        """
+        :return:                    各 host 的延迟、错误率与可用状态，详见 HostSelector.stats。
+        """
+        return self.host_url.stats()
+
+    def get_cache_stats(self):
+        """
+        :return:                    读缓存统计，未启用缓存时返回 None，详见 ReadCache.stats。
+        """
+        return None if self.cache is None else self.cache.stats()
+
+    def _module(self, cls):
+        """
+        返回 cls 模块在本实例上的共享对象，首次访问时创建，线程安全。各模块不保存调用状态，可在多个线程间复用。
+        """
+        module = self._modules.get(cls)
+        if module is None:
+            with self._modules_lock:
+                module = self._modules.get(cls)
+                if module is None:
+                    module = self._modules[cls] = self._new_module(cls)
+        return module
+
+    def _new_module(self, cls):
+        return cls(self)
+
+    def batch(self, max_workers=8):
+        """
+        并发执行多个任意接口调用，详见 bulk.Batch。
+        :param max_workers:         并发数，建议不超过 max_connections。
+        :return:                    Batch 对象，可用作上下文管理器。
+        """
+        from rongcloud.bulk import Batch
+        return Batch(max_workers)
 
     def get_user(self):
-        return User(self)
+        from rongcloud.user import User
+        return self._module(User)
 
     def get_message(self):
-        return Message(self)
+        from rongcloud.message import Message
+        return self._module(Message)
 
     def get_group(self):
-        return Group(self)
+        from rongcloud.group import Group
+        return self._module(Group)
 
     def get_conversation(self):
-        return Conversation(self)
+        from rongcloud.conversation import Conversation
+        return self._module(Conversation)
 
     def get_chatroom(self):
-        return Chatroom(self)
+        from rongcloud.chatroom import Chatroom
+        return self._module(Chatroom)
 
     def get_sensitive(self):
-        return Sensitive(self)
+        from rongcloud.sensitive import Sensitive
+        return self._module(Sensitive)
 
     def get_push(self):
-        return Push(self)
\ No newline at end of file
+        from rongcloud.push import Push
+        return self._module(Push)
\ No newline at end of file
@@ -31,7 +31,7 @@ class Sensitive(Module):
         try:
             self._check_param(word, str, '1~32')
             self._check_param(replace_word, str, '1~32')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -51,7 +51,7 @@ class Sensitive(Module):
                 self._check_param(words, list, '1~1')
                 for user in words:
                     self._check_param(user, str, '1~32')
-                return self._http_post(url, self._render(param_dict, format_str))
+                return self._send(self._form_request(url, param_dict, format_str))
             except ParamException as e:
                 return json.loads(str(e))
         else:
@@ -61,7 +61,7 @@ class Sensitive(Module):
                 self._check_param(words, list, '1~50')
                 for user in words:
                     self._check_param(user, str, '1~32')
-                return self._http_post(url, self._render(param_dict, format_str))
+                return self._send(self._form_request(url, param_dict, format_str))
             except ParamException as e:
                 return json.loads(str(e))
 
@@ -79,6 +79,6 @@ class Sensitive(Module):
         format_str = 'type={{ word_type }}'
         try:
             self._check_param(word_type, int, '0~2')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
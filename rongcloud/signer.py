@@ -0,0 +1,63 @@
+import hashlib
+import itertools
+import random
+import time
+
+from rongcloud import __version__
+
+HEADER_APP_KEY = 'App-Key'
+HEADER_NONCE = 'Nonce'
+HEADER_TIMESTAMP = 'Timestamp'
+HEADER_SIGNATURE = 'Signature'
+HEADER_USER_AGENT = 'User-Agent'
+HEADER_CONTENT_TYPE = 'Content-Type'
+
+USER_AGENT = 'rc-python-sdk/{}'.format(__version__)
+
+
+class Signer:
+    """
+    生成请求签名头，线程安全。Signature = SHA1(App Secret + Nonce + Timestamp)。
+    App Secret 只哈希一次，之后每次签名复制该 SHA1 状态再追加 Nonce 与 Timestamp；
+    Nonce 取自随机起点的自增计数器，App-Key、User-Agent 等固定请求头预先生成。
+    """
+
+    def __init__(self, app_key, app_secret, reuse=False):
+        """
+        :param app_key:             应用 App Key。
+        :param app_secret:          应用 App Secret。
+        :param reuse:               同一秒内的请求是否复用同一组 Nonce 与签名，可进一步减少高并发下的签名开销。
+        """
+        self.reuse = reuse
+        self._static = {HEADER_APP_KEY: app_key, HEADER_USER_AGENT: USER_AGENT}
+        self._secret = hashlib.sha1(app_secret.encode('utf-8'))
+        self._nonce = itertools.count(random.randrange(1000000000))
+        self._cached = None
+
+    def _sign(self, timestamp):
+        nonce = str(next(self._nonce))
+        timestamp = str(timestamp)
+        sha1 = self._secret.copy()
+        sha1.update((nonce + timestamp).encode('ascii'))
+        return nonce, timestamp, sha1.hexdigest()
+
+    def sign(self, content_type=None):
+        """
+        :param content_type:        请求体的 Content-Type，为 None 时不设置。
+        :return:                    新的请求头 dict，调用方可以修改。
+        """
+        now = int(time.time())
+        if self.reuse:
+            cached = self._cached
+            if cached is None or cached[0] != now:
+                cached = self._cached = (now, self._sign(now))
+            nonce, timestamp, signature = cached[1]
+        else:
+            nonce, timestamp, signature = self._sign(now)
+        headers = self._static.copy()
+        headers[HEADER_NONCE] = nonce
+        headers[HEADER_TIMESTAMP] = timestamp
+        headers[HEADER_SIGNATURE] = signature
+        if content_type is not None:
+            headers[HEADER_CONTENT_TYPE] = content_type
+        return headers
@@ -0,0 +1,77 @@
+import threading
+
+from rongcloud.retry import IDEMPOTENT_URLS
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    合并相同的并发只读请求，线程安全。接口地址与请求体均相同的请求在途时，后来的调用等待并共享首个请求的结果，
+    不再单独发出请求。通过 RongCloud(single_flight=SingleFlight()) 启用；共享的返回值请勿修改。
+    """
+
+    def __init__(self, urls=IDEMPOTENT_URLS):
+        """
+        :param urls:                允许合并的接口地址集合，默认为 retry.IDEMPOTENT_URLS 中的只读接口。
+        """
+        self.urls = frozenset(urls)
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self._requests = 0
+        self._shared = 0
+
+    def do(self, key, func):
+        """
+        执行 func()，key 相同的调用在途时等待其结果。
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._requests += 1
+                leader = True
+            else:
+                self._shared += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = func()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def async_do(self, key, func):
+        """
+        do 的 asyncio 版本，func() 返回协程；同一事件循环中 key 相同的调用共享一个任务。
+        """
+        import asyncio
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self._requests += 1
+        else:
+            self._shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """
+        :return:                    requests 实际发出的请求数，shared 共享结果而未发出请求的调用数。
+        """
+        with self._lock:
+            return {'requests': self._requests, 'shared': self._shared, 'in_flight': len(self._calls) + len(self._tasks)}
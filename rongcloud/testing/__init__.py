@@ -0,0 +1,7 @@
+"""
+融云 Server API 的本地替身，用于无网络环境下的测试与压测。
+"""
+from rongcloud.testing.fake import FakeRongCloud, lognormal_latency
+from rongcloud.testing.faults import FaultyCluster, Faults, fixed_latency, spiky_latency, uniform_latency
+from rongcloud.testing.server import LocalServer
+from rongcloud.testing.transport import AsyncFakeTransport, FakeTransport
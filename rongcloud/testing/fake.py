@@ -0,0 +1,467 @@
+import hashlib
+import itertools
+import math
+import random
+import threading
+import time
+from collections import Counter, deque
+from urllib.parse import parse_qs, unquote
+
+from rongcloud import codec
+from rongcloud.signer import HEADER_APP_KEY, HEADER_NONCE, HEADER_SIGNATURE, HEADER_TIMESTAMP
+
+_ROUTES = {}
+
+# 未单独实现状态的写接口，按真实服务返回 {"code":200}
+_OK_URLS = frozenset([
+    '/group/user/gag/add.json',
+    '/group/user/gag/rollback.json',
+    '/group/ban/add.json',
+    '/group/ban/rollback.json',
+    '/group/user/ban/whitelist/add.json',
+    '/group/user/ban/whitelist/rollback.json',
+    '/chatroom/user/gag/add.json',
+    '/chatroom/user/gag/rollback.json',
+    '/chatroom/user/ban/add.json',
+    '/chatroom/user/ban/remove.json',
+    '/chatroom/user/block/add.json',
+    '/chatroom/user/block/rollback.json',
+    '/chatroom/user/whitelist/add.json',
+    '/chatroom/user/whitelist/remove.json',
+    '/chatroom/whitelist/add.json',
+    '/chatroom/whitelist/delete.json',
+    '/chatroom/keepalive/add.json',
+    '/chatroom/keepalive/remove.json',
+    '/chatroom/message/priority/add.json',
+    '/chatroom/message/priority/remove.json',
+    '/chatroom/message/stopDistribution.json',
+    '/chatroom/message/resumeDistribution.json',
+    '/message/recall.json',
+    '/message/history/delete.json',
+])
+
+# 未单独实现状态的查询接口及其空结果
+_EMPTY_RESULTS = {
+    '/group/user/gag/list.json': {'users': []},
+    '/group/ban/query.json': {'groupinfo': []},
+    '/group/user/ban/whitelist/query.json': {'userIds': []},
+    '/chatroom/user/gag/list.json': {'users': []},
+    '/chatroom/user/ban/query.json': {'users': []},
+    '/chatroom/user/block/list.json': {'users': []},
+    '/chatroom/user/whitelist/query.json': {'users': []},
+    '/chatroom/whitelist/query.json': {'objectNames': []},
+    '/chatroom/keepalive/query.json': {'chatrooms': []},
+    '/chatroom/message/priority/query.json': {'objectNames': []},
+}
+
+_SEND_URLS = frozenset([
+    '/message/private/publish.json',
+    '/message/private/publish_template.json',
+    '/statusmessage/private/publish.json',
+    '/message/group/publish.json',
+    '/statusmessage/group/publish.json',
+    '/message/chatroom/publish.json',
+    '/message/chatroom/broadcast.json',
+    '/message/system/publish.json',
+    '/message/system/publish_template.json',
+    '/message/broadcast.json',
+])
+
+
+def _route(url):
+    def decorator(func):
+        _ROUTES[url] = func
+        return func
+    return decorator
+
+
+def lognormal_latency(median=0.02, sigma=0.5, minimum=0.001):
+    """
+    对数正态分布的延迟，接近公网 API 的长尾特征，如 median=0.02、sigma=0.5 时 p99 约为 0.064 秒。
+    :return:                    每次调用返回一个延迟秒数的函数，可作为 FakeRongCloud 的 latency 参数。
+    """
+    mu = math.log(median)
+
+    def latency():
+        return max(minimum, random.lognormvariate(mu, sigma))
+    return latency
+
+
+class Params:
+    """
+    请求参数，表单请求的同名参数按出现顺序保存为列表。
+    """
+
+    def __init__(self, body, content_type):
+        text = body.decode('utf-8') if body else ''
+        if content_type and 'json' in content_type:
+            self.data = codec.loads(text) if text else {}
+            self._form = None
+        else:
+            self.data = None
+            self._form = parse_qs(text, keep_blank_values=True)
+
+    def get(self, name, default=None):
+        if self._form is None:
+            return self.data.get(name, default)
+        values = self._form.get(name)
+        return values[0] if values else default
+
+    def get_list(self, name):
+        if self._form is None:
+            value = self.data.get(name, [])
+            return value if isinstance(value, list) else [value]
+        return self._form.get(name, [])
+
+    def indexed(self, prefix):
+        """
+        :return:                    形如 prefix[key]=value 的参数，如 chatroom[id]=name，按出现顺序返回 [(key, value)]。
+        """
+        if self._form is None:
+            return []
+        head = prefix + '['
+        return [(key[len(head):-1], values[0]) for key, values in self._form.items()
+                if key.startswith(head) and key.endswith(']')]
+
+
+class FakeRongCloud:
+    """
+    融云 Server API 的本地替身，在内存中保存用户、群组、聊天室、标签、敏感词等状态，线程安全。
+    实现 message、group、chatroom、user、push、sensitive、conversation 模块使用的全部接口，
+    可通过 FakeTransport 在进程内调用，或通过 LocalServer 在本机端口上提供 HTTP 服务，如：
+    fake = FakeRongCloud(latency=lognormal_latency())
+    rc = RongCloud('key', 'secret', transport=FakeTransport(fake))
+    """
+
+    def __init__(self, app_key=None, app_secret=None, latency=0, history_urls=None, sent_log_size=10000):
+        """
+        :param app_key:             校验请求的 App-Key，为 None 时不校验。
+        :param app_secret:          校验请求签名的 App Secret，为 None 时不校验签名。
+        :param latency:             每次请求的服务端耗时秒数，可为数值或返回秒数的函数，如 lognormal_latency()。
+        :param history_urls:        History.query 返回的下载地址，{date: url}，未配置的日期返回空地址。
+        :param sent_log_size:       保留最近发送的消息条数，见 sent。
+        """
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.latency = latency
+        self.history_urls = dict(history_urls or {})
+        self.sent = deque(maxlen=sent_log_size)
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.users = {}
+        self.online = set()
+        self.blocked = {}
+        self.blacklists = {}
+        self.whitelists = {}
+        self.tags = {}
+        self.groups = {}
+        self.chatrooms = {}
+        self.sensitive_words = {}
+        self.muted = {}
+
+    def delay(self):
+        """
+        :return:                    本次请求的服务端耗时秒数。
+        """
+        latency = self.latency
+        return latency() if callable(latency) else latency
+
+    def set_online(self, user_id, online=True):
+        with self._lock:
+            if online:
+                self.online.add(user_id)
+            else:
+                self.online.discard(user_id)
+
+    def join_chatroom(self, room_id, user_ids):
+        """
+        模拟用户通过客户端加入聊天室，聊天室不存在时自动创建。
+        """
+        with self._lock:
+            members = self.chatrooms.setdefault(room_id, {'name': room_id, 'time': self._now(), 'members': {}})
+            for user_id in user_ids:
+                members['members'].setdefault(user_id, self._now())
+
+    def _now(self):
+        return time.strftime('%Y-%m-%d %H:%M:%S')
+
+    def _check_auth(self, headers):
+        headers = headers or {}
+        if self.app_key is not None and headers.get(HEADER_APP_KEY) != self.app_key:
+            return 401, {'code': 1004, 'errorMessage': 'App-Key error'}
+        if self.app_secret is not None:
+            nonce = headers.get(HEADER_NONCE, '')
+            timestamp = headers.get(HEADER_TIMESTAMP, '')
+            expected = hashlib.sha1((self.app_secret + nonce + timestamp).encode('utf-8')).hexdigest()
+            if headers.get(HEADER_SIGNATURE) != expected:
+                return 401, {'code': 1004, 'errorMessage': 'Signature error'}
+        return None
+
+    def handle(self, url, body=None, headers=None):
+        """
+        处理一次请求，不含延迟。
+        :param url:                 接口地址，如：/user/info.json。
+        :param body:                请求体 bytes。
+        :param headers:             请求头 dict。
+        :return:                    (status, body)
+        """
+        error = self._check_auth(headers)
+        if error is not None:
+            return error[0], codec.dumps(error[1]).encode('utf-8')
+        headers = headers or {}
+        content_type = headers.get('Content-Type') or headers.get('content-type')
+        route = _ROUTES.get(url)
+        with self._lock:
+            self.requests[url] += 1
+            if route is not None:
+                rep = route(self, Params(body, content_type))
+            elif url in _SEND_URLS:
+                rep = self._publish(url, Params(body, content_type))
+            elif url in _OK_URLS:
+                rep = {'code': 200}
+            elif url in _EMPTY_RESULTS:
+                rep = dict(_EMPTY_RESULTS[url], code=200)
+            else:
+                return 404, b'Not Found'
+        return 200, codec.dumps(rep).encode('utf-8')
+
+    def _publish(self, url, params):
+        to_ids = params.get_list('toGroupId') or params.get_list('toChatroomId') or params.get_list('toUserId')
+        content = params.get('content')
+        self.sent.append({'url': url, 'from': params.get('fromUserId'), 'to': to_ids,
+                          'object_name': params.get('objectName'),
+                          'content': unquote(content) if isinstance(content, str) else content})
+        rep = {'code': 200}
+        if url in ('/message/private/publish.json', '/message/group/publish.json'):
+            rep['messageUIDs'] = [{'userId' if 'private' in url else 'groupId': to_id,
+                                   'messageUID': 'FAKE-{:08d}'.format(next(self._ids))} for to_id in to_ids]
+        return rep
+
+    # 用户
+
+    @_route('/user/getToken.json')
+    def _get_token(self, params):
+        user_id = params.get('userId')
+        self.users[user_id] = {'name': params.get('name'), 'portrait': params.get('portraitUri'),
+                               'time': self._now()}
+        return {'code': 200, 'userId': user_id, 'token': 'fake-token/{}/{}'.format(user_id, next(self._ids))}
+
+    @_route('/user/refresh.json')
+    def _refresh_user(self, params):
+        user = self.users.setdefault(params.get('userId'), {'name': None, 'portrait': None, 'time': self._now()})
+        if params.get('name') is not None:
+            user['name'] = params.get('name')
+        if params.get('portraitUri') is not None:
+            user['portrait'] = params.get('portraitUri')
+        return {'code': 200}
+
+    @_route('/user/info.json')
+    def _user_info(self, params):
+        user = self.users.get(params.get('userId'))
+        if user is None:
+            return {'code': 200, 'userName': '', 'userPortrait': '', 'createTime': ''}
+        return {'code': 200, 'userName': user['name'], 'userPortrait': user['portrait'], 'createTime': user['time']}
+
+    @_route('/user/checkOnline.json')
+    def _check_online(self, params):
+        return {'code': 200, 'status': '1' if params.get('userId') in self.online else '0'}
+
+    @_route('/user/block.json')
+    def _block(self, params):
+        end = time.time() + int(params.get('minute', 0)) * 60
+        for user_id in params.get_list('userId'):
+            self.blocked[user_id] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end))
+        return {'code': 200}
+
+    @_route('/user/unblock.json')
+    def _unblock(self, params):
+        for user_id in params.get_list('userId'):
+            self.blocked.pop(user_id, None)
+        return {'code': 200}
+
+    @_route('/user/block/query.json')
+    def _block_query(self, params):
+        return {'code': 200, 'users': [{'userId': user_id, 'blockEndTime': end}
+                                       for user_id, end in self.blocked.items()]}
+
+    def _list_add(self, lists, params, key):
+        lists.setdefault(params.get('userId'), set()).update(params.get_list(key))
+        return {'code': 200}
+
+    def _list_remove(self, lists, params, key):
+        lists.get(params.get('userId'), set()).difference_update(params.get_list(key))
+        return {'code': 200}
+
+    @_route('/user/blacklist/add.json')
+    def _blacklist_add(self, params):
+        return self._list_add(self.blacklists, params, 'blackUserId')
+
+    @_route('/user/blacklist/remove.json')
+    def _blacklist_remove(self, params):
+        return self._list_remove(self.blacklists, params, 'blackUserId')
+
+    @_route('/user/blacklist/query.json')
+    def _blacklist_query(self, params):
+        return {'code': 200, 'users': sorted(self.blacklists.get(params.get('userId'), ()))}
+
+    @_route('/user/whitelist/add.json')
+    def _whitelist_add(self, params):
+        return self._list_add(self.whitelists, params, 'whiteUserId')
+
+    @_route('/user/whitelist/remove.json')
+    def _whitelist_remove(self, params):
+        return self._list_remove(self.whitelists, params, 'whiteUserId')
+
+    @_route('/user/whitelist/query.json')
+    def _whitelist_query(self, params):
+        return {'code': 200, 'users': sorted(self.whitelists.get(params.get('userId'), ()))}
+
+    @_route('/user/tag/set.json')
+    def _tag_set(self, params):
+        self.tags[params.get('userId')] = list(params.get_list('tags'))
+        return {'code': 200}
+
+    @_route('/user/tag/batch/set.json')
+    def _tag_batch_set(self, params):
+        for user_id in params.get_list('userIds'):
+            self.tags[user_id] = list(params.get_list('tags'))
+        return {'code': 200}
+
+    @_route('/user/tags/get.json')
+    def _tags_get(self, params):
+        return {'code': 200, 'result': {user_id: self.tags.get(user_id, []) for user_id in params.get_list('userIds')}}
+
+    # 群组
+
+    def _group(self, group_id, name=None):
+        group = self.groups.setdefault(group_id, {'name': name, 'members': {}})
+        if name is not None:
+            group['name'] = name
+        return group
+
+    @_route('/group/create.json')
+    @_route('/group/join.json')
+    def _group_join(self, params):
+        members = self._group(params.get('groupId'), params.get('groupName'))['members']
+        for user_id in params.get_list('userId'):
+            members.setdefault(user_id, self._now())
+        return {'code': 200}
+
+    @_route('/group/quit.json')
+    def _group_quit(self, params):
+        group = self.groups.get(params.get('groupId'))
+        if group is not None:
+            for user_id in params.get_list('userId'):
+                group['members'].pop(user_id, None)
+        return {'code': 200}
+
+    @_route('/group/dismiss.json')
+    def _group_dismiss(self, params):
+        self.groups.pop(params.get('groupId'), None)
+        return {'code': 200}
+
+    @_route('/group/refresh.json')
+    def _group_refresh(self, params):
+        self._group(params.get('groupId'), params.get('groupName'))
+        return {'code': 200}
+
+    @_route('/group/sync.json')
+    def _group_sync(self, params):
+        user_id = params.get('userId')
+        for group_id, name in params.indexed('group'):
+            self._group(group_id, name)['members'].setdefault(user_id, self._now())
+        return {'code': 200}
+
+    @_route('/group/user/query.json')
+    def _group_members(self, params):
+        group = self.groups.get(params.get('groupId'), {'members': {}})
+        return {'code': 200, 'id': params.get('groupId'), 'users': [{'id': user_id} for user_id in group['members']]}
+
+    # 聊天室
+
+    @_route('/chatroom/create.json')
+    def _chatroom_create(self, params):
+        for room_id, name in params.indexed('chatroom'):
+            self.chatrooms.setdefault(room_id, {'name': name, 'time': self._now(), 'members': {}})
+        return {'code': 200}
+
+    @_route('/chatroom/destroy.json')
+    def _chatroom_destroy(self, params):
+        for room_id in params.get_list('chatroomId'):
+            self.chatrooms.pop(room_id, None)
+        return {'code': 200}
+
+    @_route('/chatroom/query.json')
+    def _chatroom_query(self, params):
+        return {'code': 200, 'chatRooms': [{'chrmId': room_id, 'name': self.chatrooms[room_id]['name'],
+                                            'time': self.chatrooms[room_id]['time']}
+                                           for room_id in params.get_list('chatroomId') if room_id in self.chatrooms]}
+
+    @_route('/chatroom/user/query.json')
+    def _chatroom_members(self, params):
+        members = self.chatrooms.get(params.get('chatroomId'), {'members': {}})['members']
+        users = [{'id': user_id, 'time': joined} for user_id, joined in members.items()]
+        if params.get('order') == '2':
+            users.reverse()
+        return {'code': 200, 'total': len(users), 'users': users[:int(params.get('count', 500))]}
+
+    @_route('/chatroom/user/exist.json')
+    def _chatroom_exist(self, params):
+        members = self.chatrooms.get(params.get('chatroomId'), {'members': {}})['members']
+        return {'code': 200, 'isInChrm': int(params.get('userId') in members)}
+
+    @_route('/chatroom/users/exist.json')
+    def _chatroom_users_exist(self, params):
+        members = self.chatrooms.get(params.get('chatroomId'), {'members': {}})['members']
+        return {'code': 200, 'result': [{'userId': user_id, 'isInChrm': int(user_id in members)}
+                                        for user_id in params.get_list('userId')]}
+
+    # 消息、推送
+
+    @_route('/message/history.json')
+    def _history(self, params):
+        date = params.get('date')
+        return {'code': 200, 'url': self.history_urls.get(date, ''), 'date': date}
+
+    @_route('/push.json')
+    def _push(self, params):
+        self.sent.append({'url': '/push.json', 'from': None, 'to': params.get('audience'),
+                          'object_name': None, 'content': params.get('notification')})
+        return {'code': 200, 'id': 'fake-push-{}'.format(next(self._ids))}
+
+    # 敏感词
+
+    @_route('/sensitiveword/add.json')
+    def _sensitive_add(self, params):
+        self.sensitive_words[params.get('word')] = params.get('replaceWord', '')
+        return {'code': 200}
+
+    @_route('/sensitiveword/delete.json')
+    @_route('/sensitiveword/batch/delete.json')
+    def _sensitive_delete(self, params):
+        for word in params.get_list('word') + params.get_list('words'):
+            self.sensitive_words.pop(word, None)
+        return {'code': 200}
+
+    @_route('/sensitiveword/list.json')
+    def _sensitive_list(self, params):
+        word_type = params.get('type', '2')
+        words = [{'type': '0' if replace else '1', 'word': word, 'replaceWord': replace}
+                 for word, replace in self.sensitive_words.items()]
+        if word_type != '2':
+            words = [item for item in words if item['type'] == word_type]
+        return {'code': 200, 'words': words}
+
+    # 会话
+
+    @_route('/conversation/notification/set.json')
+    def _mute_set(self, params):
+        key = (params.get('conversationType'), params.get('requestId'), params.get('targetId'))
+        self.muted[key] = int(params.get('isMuted', 1))
+        return {'code': 200}
+
+    @_route('/conversation/notification/get.json')
+    def _mute_get(self, params):
+        key = (params.get('conversationType'), params.get('requestId'), params.get('targetId'))
+        return {'code': 200, 'isMuted': self.muted.get(key, 0)}
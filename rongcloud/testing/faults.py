@@ -0,0 +1,258 @@
+"""
+本地替身的故障注入：延迟分布、5xx 突发、连接重置、慢响应体与按接口限流，用于验证多 host 切换与重试，
+并在无真实服务的情况下测量某个 host 劣化时 SDK 的吞吐与尾延迟。
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rongcloud import codec
+from rongcloud.metrics import Histogram
+from rongcloud.ratelimit import TokenBucket
+from rongcloud.testing.fake import FakeRongCloud, lognormal_latency
+from rongcloud.testing.server import LocalServer
+
+# 注入结果
+RESET = 'reset'
+STATUS = 'status'
+
+_SERVER_ERROR = codec.dumps({'code': 1000, 'errorMessage': 'Internal server error'}).encode('utf-8')
+_RATE_LIMITED = codec.dumps({'code': 1008, 'errorMessage': 'Too many requests'}).encode('utf-8')
+
+
+def fixed_latency(seconds):
+    return lambda: seconds
+
+
+def uniform_latency(low, high):
+    return lambda: random.uniform(low, high)
+
+
+def spiky_latency(base, spike, rate):
+    """
+    大部分请求耗时 base 秒，rate 比例的请求耗时 spike 秒，模拟偶发的长尾。
+    """
+    return lambda: spike if random.random() < rate else base
+
+
+class Faults:
+    """
+    单个 host 的故障配置，线程安全，可在请求进行中通过 update 修改。各项故障按以下顺序判定：
+    连接重置、5xx 突发、随机 5xx、按接口限流；未命中时正常处理，并按 latency 与 slow_body 增加耗时。
+    """
+
+    def __init__(self, latency=None, error_rate=0, error_status=503, reset_rate=0, slow_body=None,
+                 rate_limits=None, seed=None):
+        """
+        :param latency:             额外的服务端耗时秒数，可为数值或返回秒数的函数，如 spiky_latency(0.01, 1, 0.01)。
+        :param error_rate:          返回 5xx 的请求比例。
+        :param error_status:        5xx 状态码。
+        :param reset_rate:          不返回响应、直接重置连接的请求比例，1 为 host 完全不可用。
+        :param slow_body:           (chunk_size, interval)，响应体每 chunk_size 字节间隔 interval 秒写出。
+        :param rate_limits:         按接口限流，{url: (count, per)}，超出时返回 HTTP 429 与 {"code":1008}。
+        :param seed:                随机数种子，便于复现。
+        """
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._burst = 0
+        self._buckets = {}
+        self.latency = None
+        self.error_rate = 0
+        self.error_status = 503
+        self.reset_rate = 0
+        self.slow_body = None
+        self.injected = {RESET: 0, STATUS: 0, 'rate_limited': 0}
+        self.update(latency=latency, error_rate=error_rate, error_status=error_status, reset_rate=reset_rate,
+                    slow_body=slow_body, rate_limits=rate_limits)
+
+    def update(self, **settings):
+        """
+        修改故障配置，参数同 __init__，未传入的项保持不变；rate_limits 会替换原有限流配置。
+        """
+        with self._lock:
+            rate_limits = settings.pop('rate_limits', None)
+            if rate_limits is not None:
+                self._buckets = {url: TokenBucket(count / per, count) for url, (count, per) in rate_limits.items()}
+            for key, value in settings.items():
+                if not hasattr(self, key) or key.startswith('_'):
+                    raise AttributeError(key)
+                setattr(self, key, value)
+
+    def burst(self, count, status=None):
+        """
+        之后的 count 个请求返回 5xx。
+        """
+        with self._lock:
+            self._burst = count
+            if status is not None:
+                self.error_status = status
+
+    def clear(self):
+        """
+        清除全部故障。
+        """
+        with self._lock:
+            self._burst = 0
+            self._buckets = {}
+        self.update(latency=None, error_rate=0, reset_rate=0, slow_body=None)
+
+    def delay(self):
+        latency = self.latency
+        if latency is None:
+            return 0
+        return latency() if callable(latency) else latency
+
+    def inject(self, url):
+        """
+        :return:                    None 为正常处理；(RESET, None, None) 为重置连接；(STATUS, status, body) 为直接返回该响应。
+        """
+        with self._lock:
+            if self.reset_rate and self._random.random() < self.reset_rate:
+                self.injected[RESET] += 1
+                return RESET, None, None
+            if self._burst > 0 or (self.error_rate and self._random.random() < self.error_rate):
+                self._burst = max(0, self._burst - 1)
+                self.injected[STATUS] += 1
+                return STATUS, self.error_status, _SERVER_ERROR
+            bucket = self._buckets.get(url)
+        if bucket is not None and bucket.reserve(0) is None:
+            with self._lock:
+                self.injected['rate_limited'] += 1
+            return STATUS, 429, _RATE_LIMITED
+        return None
+
+    def body_delay(self, size):
+        """
+        :return:                    按 slow_body 写出 size 字节响应体所需的秒数。
+        """
+        slow_body = self.slow_body
+        if not slow_body:
+            return 0
+        chunk_size, interval = slow_body
+        return (size + chunk_size - 1) // chunk_size * interval
+
+
+class FaultyCluster:
+    """
+    由多个注入故障的 LocalServer 组成的本地集群，共享同一个 FakeRongCloud 状态，
+    模拟 api-cn.ronghub.com 与 api2-cn.ronghub.com 两个入口，如：
+    with FaultyCluster() as cluster:
+        rc = RongCloud('key', 'secret', cluster.host_url)
+        cluster.faults[0].update(reset_rate=1)          # 主 host 不可用
+        report = cluster.run_load(lambda: rc.get_user().query('u1'), concurrency=8, duration=2)
+    """
+
+    def __init__(self, hosts=2, fake=None, latency=None):
+        """
+        :param hosts:               host 数量。
+        :param fake:                共享的 FakeRongCloud，默认新建。
+        :param latency:             所有 host 的基础服务端耗时，默认为 lognormal_latency(median=0.005, sigma=0.3)。
+        """
+        if fake is None:
+            fake = FakeRongCloud(latency=lognormal_latency(median=0.005, sigma=0.3) if latency is None else latency)
+        self.fake = fake
+        self.faults = [Faults() for _ in range(hosts)]
+        self.servers = [LocalServer(fake, faults=faults) for faults in self.faults]
+
+    @property
+    def urls(self):
+        return [server.url for server in self.servers]
+
+    @property
+    def host_url(self):
+        """
+        :return:                    可直接传给 RongCloud 的 host_url，如：http://127.0.0.1:8001;http://127.0.0.1:8002。
+        """
+        return ';'.join(self.urls)
+
+    def start(self):
+        for server in self.servers:
+            server.start()
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def clear(self):
+        for faults in self.faults:
+            faults.clear()
+
+    def play(self, scenario):
+        """
+        在后台线程中按时间执行脚本化场景。
+        :param scenario:            [(at, host, settings), ...]，启动后第 at 秒对第 host 个 host 调用 Faults.update(**settings)，
+                                    settings 为 'clear' 时清除该 host 的全部故障，如：
+                                    [(0, 0, {'error_rate': 1}), (1.5, 0, 'clear')]。
+        :return:                    已启动的线程，可 join 等待场景结束。
+        """
+        steps = sorted(scenario, key=lambda step: step[0])
+
+        def run():
+            start = time.monotonic()
+            for at, host, settings in steps:
+                wait = at - (time.monotonic() - start)
+                if wait > 0:
+                    time.sleep(wait)
+                if settings == 'clear':
+                    self.faults[host].clear()
+                else:
+                    self.faults[host].update(**settings)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def run_load(func, concurrency=8, duration=None, requests=None):
+        """
+        以 concurrency 个线程反复调用 func()，持续 duration 秒或共 requests 次。
+        :return:                    如：{'requests': 1000, 'errors': 3, 'codes': {200: 997, -1: 3}, 'elapsed': 2.0,
+                                    'throughput': 500.0, 'latency': {'count': 1000, 'mean': ..., 'p50': ..., 'p99': ..., 'max': ...}}
+        """
+        if duration is None and requests is None:
+            raise ValueError('duration or requests is required')
+        histogram = Histogram()
+        codes = {}
+        lock = threading.Lock()
+        remaining = [requests]
+        deadline = None if duration is None else time.monotonic() + duration
+
+        def take():
+            with lock:
+                if remaining[0] is not None:
+                    if remaining[0] <= 0:
+                        return False
+                    remaining[0] -= 1
+            return deadline is None or time.monotonic() < deadline
+
+        def worker():
+            while take():
+                begin = time.perf_counter()
+                try:
+                    code = func().get('code')
+                except Exception:
+                    code = None
+                elapsed = time.perf_counter() - begin
+                with lock:
+                    histogram.add(elapsed)
+                    codes[code] = codes.get(code, 0) + 1
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+        elapsed = time.monotonic() - start
+        return {'requests': histogram.count,
+                'errors': histogram.count - codes.get(200, 0),
+                'codes': codes,
+                'elapsed': elapsed,
+                'throughput': histogram.count / elapsed if elapsed else 0.0,
+                'latency': histogram.summary()}
@@ -0,0 +1,102 @@
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        fake = self.server.fake
+        faults = self.server.faults
+        delay = fake.delay() + (faults.delay() if faults is not None else 0)
+        if delay > 0:
+            time.sleep(delay)
+        injected = faults.inject(self.path) if faults is not None else None
+        if injected is None:
+            status, data = fake.handle(self.path, body, dict(self.headers.items()))
+        elif injected[0] == 'reset':
+            self._reset()
+            return
+        else:
+            status, data = injected[1], injected[2]
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        slow_body = faults.slow_body if faults is not None else None
+        if slow_body:
+            chunk_size, interval = slow_body
+            for i in range(0, len(data), chunk_size):
+                time.sleep(interval)
+                self.wfile.write(data[i:i + chunk_size])
+        else:
+            self.wfile.write(data)
+
+    def _reset(self):
+        # SO_LINGER 为 0 时 close 直接发送 RST，客户端读到 ConnectionResetError
+        self.close_connection = True
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        self.connection.close()
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # 默认 listen 队列为 5，压测时大量并发连接会溢出并触发 SYN 重传
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # 注入的连接重置与客户端超时断开都属预期，不打印异常
+        pass
+
+
+class LocalServer:
+    """
+    在本机端口上以 HTTP 提供 FakeRongCloud 服务，用于经过真实连接池与 socket 的测试、压测，如：
+    with LocalServer(FakeRongCloud()) as server:
+        rc = RongCloud('key', 'secret', server.url)
+    """
+
+    def __init__(self, fake, host='127.0.0.1', port=0, faults=None):
+        """
+        :param fake:                FakeRongCloud 实例。
+        :param host:                监听地址。
+        :param port:                监听端口，0 为随机端口。
+        :param faults:              故障注入配置，详见 faults.Faults，默认不注入。
+        """
+        self.fake = fake
+        self.faults = faults
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = fake
+        self._server.faults = faults
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,81 @@
+import asyncio
+import socket
+import threading
+import time
+
+from rongcloud.transport import DEFAULT_TIMEOUT, Transport
+
+
+class FakeTransport(Transport):
+    """
+    在进程内把请求交给 FakeRongCloud 处理的 Transport，不经过网络，按 fake.delay() 模拟服务端耗时。
+    服务端耗时超过读取超时时等待读取超时秒数后抛出 socket.timeout，与真实连接一致。
+    """
+
+    def __init__(self, fake, faults=None):
+        """
+        :param fake:                FakeRongCloud 实例。
+        :param faults:              故障注入配置，faults.Faults 对所有 host 生效，{host_url: Faults} 按 host 生效，默认不注入。
+        """
+        self.fake = fake
+        self.faults = faults
+        self._lock = threading.Lock()
+        self._requests = {}
+
+    def _count(self, host_url):
+        with self._lock:
+            self._requests[host_url] = self._requests.get(host_url, 0) + 1
+
+    def _prepare(self, host_url, url, body, headers, timeout):
+        """
+        :return:                    (耗时秒数, 响应或需抛出的异常)
+        """
+        self._count(host_url)
+        faults = self.faults.get(host_url) if isinstance(self.faults, dict) else self.faults
+        delay = self.fake.delay() + (faults.delay() if faults is not None else 0)
+        if delay > timeout[1]:
+            return timeout[1], socket.timeout('timed out')
+        injected = faults.inject(url) if faults is not None else None
+        if injected is None:
+            rep = self.fake.handle(url, body, headers)
+        elif injected[0] == 'reset':
+            return delay, ConnectionResetError('Connection reset by peer')
+        else:
+            rep = injected[1], injected[2]
+        if faults is not None and faults.slow_body:
+            if faults.slow_body[1] > timeout[1]:
+                return delay + timeout[1], socket.timeout('timed out')
+            delay += faults.body_delay(len(rep[1]))
+        return delay, rep
+
+    def request(self, host_url, url, body=None, headers=None, timings=None, timeout=DEFAULT_TIMEOUT):
+        start = time.perf_counter()
+        delay, rep = self._prepare(host_url, url, body, headers, timeout)
+        if delay > 0:
+            time.sleep(delay)
+        if isinstance(rep, Exception):
+            raise rep
+        if timings is not None:
+            timings['first_byte'] = time.perf_counter() - start
+        return rep
+
+    def stats(self):
+        with self._lock:
+            return {host_url: {'requests': count} for host_url, count in self._requests.items()}
+
+
+class AsyncFakeTransport(FakeTransport):
+    """
+    FakeTransport 的 asyncio 版本，用于 AsyncRongCloud。
+    """
+
+    async def request(self, host_url, url, body=None, headers=None, timings=None, timeout=DEFAULT_TIMEOUT):
+        start = time.perf_counter()
+        delay, rep = self._prepare(host_url, url, body, headers, timeout)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if isinstance(rep, Exception):
+            raise rep
+        if timings is not None:
+            timings['first_byte'] = time.perf_counter() - start
+        return rep
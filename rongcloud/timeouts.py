@@ -0,0 +1,66 @@
+import time
+
+
+class Timeout:
+    """
+    单个接口的超时设置，只作用于本 SDK 的连接，不影响进程内其他 socket。
+    """
+    __slots__ = ('connect', 'read', 'deadline')
+
+    def __init__(self, connect=10, read=10, deadline=None):
+        """
+        :param connect:             建立连接的超时秒数。
+        :param read:                发出请求至读完响应的总时长上限秒数，服务端慢速返回响应体时同样生效。
+        :param deadline:            一次调用（含限流等待与所有重试）的总时长上限秒数，None 为不限。
+                                    与 RetryPolicy.deadline 同时设置时以较小者为准。
+        """
+        self.connect = connect
+        self.read = read
+        self.deadline = deadline
+
+    def budget(self, start):
+        """
+        :param start:               调用开始时的 time.monotonic()。
+        :return:                    本次请求的 (连接超时, 读取超时)，已超过 deadline 时返回 None。
+        """
+        if self.deadline is None:
+            return self.connect, self.read
+        remaining = self.deadline - (time.monotonic() - start)
+        if remaining <= 0:
+            return None
+        return min(self.connect, remaining), min(self.read, remaining)
+
+    def __repr__(self):
+        return 'Timeout(connect={}, read={}, deadline={})'.format(self.connect, self.read, self.deadline)
+
+
+class TimeoutPolicy:
+    """
+    按接口地址设置超时，如：TimeoutPolicy(connect=3, read=10, endpoints={'/user/checkOnline.json': (1, 1, 2)})。
+    未配置的接口使用默认值。
+    """
+
+    def __init__(self, connect=10, read=10, deadline=None, endpoints=None):
+        """
+        :param connect:             默认连接超时秒数。
+        :param read:                默认读取超时秒数。
+        :param deadline:            默认单次调用总时长上限秒数，None 为不限。
+        :param endpoints:           接口超时，{url: (connect, read)} 或 {url: (connect, read, deadline)}，
+                                    值为 None 的项使用默认值。
+        """
+        self.default = Timeout(connect, read, deadline)
+        self._timeouts = {}
+        for url, timeout in (endpoints or {}).items():
+            self.set_timeout(url, *timeout)
+
+    def set_timeout(self, url, connect=None, read=None, deadline=None):
+        default = self.default
+        self._timeouts[url] = Timeout(default.connect if connect is None else connect,
+                                      default.read if read is None else read,
+                                      default.deadline if deadline is None else deadline)
+
+    def remove_timeout(self, url):
+        self._timeouts.pop(url, None)
+
+    def get(self, url):
+        return self._timeouts.get(url, self.default)
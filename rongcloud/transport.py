@@ -0,0 +1,33 @@
+# 未指定时的 (连接超时, 读取超时) 秒数
+DEFAULT_TIMEOUT = (10, 10)
+
+
+class Transport:
+    """
+    API 请求的传输接口。RongCloud 的所有请求都经由 transport 发出，默认为 pool.PoolManager，
+    AsyncRongCloud 默认为 aio.AsyncPoolManager。可传入自定义实现接入其他 HTTP 客户端，
+    或使用 testing 模块中的本地替身在无网络环境下测试、压测。
+    """
+
+    def request(self, host_url, url, body=None, headers=None, timings=None, timeout=DEFAULT_TIMEOUT):
+        """
+        发送 POST 请求并读取完整响应，AsyncRongCloud 下需返回协程。
+        :param host_url:            host 地址，如：http://api-cn.ronghub.com。
+        :param url:                 接口地址，如：/user/info.json。
+        :param body:                请求体 bytes。
+        :param headers:             请求头，含签名与 Content-Type。
+        :param timings:             传入 dict 时记录各阶段耗时秒数，见 ConnectionPool.request。
+        :param timeout:             (连接超时, 读取超时) 秒数。
+        :return:                    (status, body)。连接失败抛出 pool.ConnectError，超时抛出 socket.timeout，
+                                    其他网络错误抛出 OSError 或 http.client.HTTPException。
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """
+        :return:                    各 host 的传输统计。
+        """
+        return {}
+
+    def close(self):
+        pass
@@ -3,6 +3,31 @@ import json
 from rongcloud.module import Module, ParamException
 
 
+def _group_by_tags(user_tags, chunk_size):
+    """
+    将 {user_id: tags} 按相同的标签集合分组（与顺序、重复无关），每组再按 chunk_size 切分为 [(user_id, tags), ...] 分片，
+    tags 为该组中首个用户传入的标签列表。
+    """
+    from rongcloud.bulk import chunked
+    groups = {}
+    items = user_tags.items() if hasattr(user_tags, 'items') else user_tags
+    for user_id, tags in items:
+        key = tuple(sorted(set(tags)))
+        if key not in groups:
+            groups[key] = (list(tags), [])
+        groups[key][1].append(user_id)
+    for tags, user_ids in groups.values():
+        for chunk in chunked(user_ids, chunk_size):
+            yield [(user_id, tags) for user_id in chunk]
+
+
+def _merge_tags(report):
+    tags = {}
+    for item in report['chunks']:
+        tags.update(item['result'].get('result') or {})
+    return {'code': report['code'], 'result': tags, 'failed': report['failed']}
+
+
 class User(Module):
     """
     客户端通过融云 SDK 每次连接服务器时，都需要向服务器提供 Token，以便验证身份。
@@ -37,7 +62,7 @@ class User(Module):
             self._check_param(user_id, str, '1~64')
             self._check_param(name, str, '0~128')
             self._check_param(portrait_uri, str, '0~1024')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -62,7 +87,8 @@ class User(Module):
             self._check_param(user_id, str, '1~64')
             self._check_param(name, str, '0~128')
             self._check_param(portrait_uri, str, '0~1024')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._invalidate([('/user/info.json', user_id)],
+                                    self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -79,7 +105,10 @@ class User(Module):
         format_str = 'userId={{ user_id }}'
         try:
             self._check_param(user_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            rep = self._cached((url, user_id))
+            if rep is not None:
+                return rep
+            return self._cache_result((url, user_id), self._send(self._form_request(url, param_dict, format_str)))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -95,21 +124,21 @@ class User(Module):
         format_str = 'userId={{ user_id }}'
         try:
             self._check_param(user_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
     def get_block(self):
-        return Block(self._rc)
+        return self._rc._module(Block)
 
     def get_blacklist(self):
-        return Blacklist(self._rc)
+        return self._rc._module(Blacklist)
 
     def get_whitelist(self):
-        return Whitelist(self._rc)
+        return self._rc._module(Whitelist)
 
     def get_tag(self):
-        return Tag(self._rc)
+        return self._rc._module(Tag)
 
 
 class Block(Module):
@@ -139,7 +168,7 @@ class Block(Module):
             for user_id in user_ids:
                 self._check_param(user_id, str, '1~64')
             self._check_param(minute, int, '0~43200')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -157,7 +186,7 @@ class Block(Module):
             self._check_param(user_ids, list, '1~20')
             for user in user_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -171,7 +200,7 @@ class Block(Module):
         """
         url = '/user/block/query.json'
         try:
-            return self._http_post(url)
+            return self._send(self._form_request(url))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -202,7 +231,7 @@ class Blacklist(Module):
             self._check_param(black_ids, list, '1~20')
             for user in black_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -223,7 +252,7 @@ class Blacklist(Module):
             self._check_param(black_ids, list, '1~20')
             for user in black_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -239,7 +268,7 @@ class Blacklist(Module):
         format_str = 'userId={{ user_id }}'
         try:
             self._check_param(user_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -269,7 +298,7 @@ class Whitelist(Module):
             self._check_param(white_ids, list, '1~20')
             for user in white_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -290,7 +319,7 @@ class Whitelist(Module):
             self._check_param(white_ids, list, '1~20')
             for user in white_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -306,7 +335,7 @@ class Whitelist(Module):
         format_str = 'userId={{ user_id }}'
         try:
             self._check_param(user_id, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            return self._send(self._form_request(url, param_dict, format_str))
         except ParamException as e:
             return json.loads(str(e))
 
@@ -334,7 +363,8 @@ class Tag(Module):
             try:
                 for user in user_ids:
                     self._check_param(user, str, '1~64')
-                return self._http_post(url, self._render(param_dict, format_str))
+                return self._invalidate([('/user/tags/get.json', user_id) for user_id in user_ids],
+                                        self._send(self._json_request(url, param_dict, format_str)))
             except ParamException as e:
                 return json.loads(str(e))
         else:
@@ -348,7 +378,8 @@ class Tag(Module):
                 self._check_param(tags, list, '1~1000')
                 for tag in tags:
                     self._check_param(tag, str, '1~40')
-                return self._http_post(url, self._render(param_dict, format_str))
+                return self._invalidate([('/user/tags/get.json', user_id) for user_id in user_ids],
+                                        self._send(self._json_request(url, param_dict, format_str)))
             except ParamException as e:
                 return json.loads(str(e))
 
@@ -367,6 +398,70 @@ class Tag(Module):
             self._check_param(user_ids, list, '1~50')
             for user in user_ids:
                 self._check_param(user, str, '1~64')
-            return self._http_post(url, self._render(param_dict, format_str))
+            if self._rc.cache is None:
+                return self._send(self._form_request(url, param_dict, format_str))
+            return self._cached_tags(url, user_ids, format_str)
+        except ParamException as e:
+            return json.loads(str(e))
+
+    def set_bulk(self, user_tags, chunk_size=1000, max_workers=4):
+        """
+        为任意数量的用户设置标签。标签集合相同（不计顺序与重复）的用户合并为一次批量设置请求，每次最多 chunk_size 个用户，以最多 max_workers 个并发请求发送。
+        :param user_tags:           用户标签，{user_id: [tag, ...]} 或 (user_id, [tag, ...]) 的可迭代对象。（必传）
+        :param chunk_size:          每次请求的用户数，上限为 1000，默认为 1000。（非必传）
+        :param max_workers:         并发请求数，默认为 4。（非必传）
+        :return:                    合并结果，格式同 Private.send_bulk；failed 中 items 为 (user_id, tags) 列表，可再次传入重试。
+        """
+        try:
+            self._check_param(chunk_size, int, '1~1000')
+            self._check_param(max_workers, int, '1~64')
+        except ParamException as e:
+            return json.loads(str(e))
+
+        def set_chunk(chunk):
+            return self.set([user_id for user_id, _ in chunk], chunk[0][1])
+
+        return self._run_chunks(set_chunk, _group_by_tags(user_tags, chunk_size), max_workers)
+
+    def get_bulk(self, user_ids, chunk_size=50, max_workers=4):
+        """
+        查询任意数量用户的标签。用户按 chunk_size 分片，以最多 max_workers 个并发请求查询，结果合并为一个 dict。
+        :param user_ids:            用户 Id 的可迭代对象，数量不限。（必传）
+        :param chunk_size:          每次请求的用户数，上限为 50，默认为 50。（非必传）
+        :param max_workers:         并发请求数，默认为 4。（非必传）
+        :return:                    code 为 200 表示全部查询成功，否则为首个失败分片的返回码；result 合并后的用户标签；
+                                    failed 失败的分片，格式同 Private.send_bulk。
+                                    如：{"code":200,"result":{"111":[],"222":["帅哥","北京"]},"failed":[]}
+        """
+        try:
+            self._check_param(chunk_size, int, '1~50')
+            self._check_param(max_workers, int, '1~64')
         except ParamException as e:
             return json.loads(str(e))
+        return self._then(self._fan_out(self.get, self._tran_list(user_ids), chunk_size, max_workers), _merge_tags)
+
+    def _cached_tags(self, url, user_ids, format_str):
+        # 按用户缓存标签，只查询未命中的用户
+        cache = self._rc.cache
+        tags = {}
+        missing = []
+        for user_id in user_ids:
+            user_tags = cache.get((url, user_id))
+            if user_tags is None:
+                missing.append(user_id)
+            else:
+                tags[user_id] = user_tags
+        if not missing:
+            return self._typed(url, {'code': 200, 'result': tags})
+
+        def merge(rep):
+            if rep.get('code') != 200:
+                return rep
+            for user_id, user_tags in (rep.get('result') or {}).items():
+                cache.set((url, user_id), user_tags)
+            if not tags:
+                return rep
+            result = dict(tags)
+            result.update(rep.get('result') or {})
+            return self._typed(url, {'code': 200, 'result': result})
+        return self._then(self._send(self._form_request(url, {'user_ids': missing}, format_str)), merge)
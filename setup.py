@@ -1,11 +1,16 @@
+import re
+
 import setuptools
 
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
+with open("rongcloud/__init__.py", "r") as fh:
+    version = re.search(r"__version__ = '([^']+)'", fh.read()).group(1)
+
 setuptools.setup(
     name="rc-server-sdk",
-    version="3.1.9",
+    version=version,
     author="zhanglei1",
     author_email="zhanglei1@rongcloud.cn",
     description="rongcloud python server sdk",
@@ -0,0 +1,75 @@
+import json
+import threading
+import unittest
+from urllib.parse import parse_qs
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncModule, AsyncRongCloud
+from rongcloud.rongcloud import RongCloud
+
+CONTENTS = []
+
+
+class AccessorsTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        CONTENTS.append(json.loads(parse_qs(data.decode('utf8'))['content'][0]))
+        return {'code': 200}
+
+    def test_memoized(self):
+        rc = RongCloud('key', 'secret')
+        self.assertIs(rc.get_message(), rc.get_message())
+        self.assertIs(rc.get_message().get_private(), rc.get_message().get_private())
+        self.assertIs(rc.get_user().get_tag(), rc.get_user().get_tag())
+        self.assertIs(rc.get_push(), rc.get_push())
+        self.assertIsNot(rc.get_group(), rc.get_message().get_group())
+        self.assertIsNot(rc.get_user(), RongCloud('key', 'secret').get_user())
+
+        modules = []
+        threads = [threading.Thread(target=lambda: modules.append(rc.get_chatroom().get_user().get_gag()))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id, modules))), 1)
+
+    def test_async_memoized(self):
+        rc = AsyncRongCloud('key', 'secret')
+        self.assertIsInstance(rc.get_user(), AsyncModule)
+        self.assertIs(rc.get_user(), rc.get_user())
+        self.assertIs(rc.get_message().get_private(), rc.get_message().get_private())
+        self.assertIsInstance(rc.get_message().get_private(), AsyncModule)
+        self.assertIsInstance(rc.get_push(), AsyncModule)
+        self.assertIs(rc.get_push(), rc.get_push())
+        rep = run_until_complete(rc.get_push().push([], None, None, None, None, False, 'alert', None, None,
+                                                    None, None, None, None, None, None, None))
+        self.assertEqual(rep['code'], 1002)
+
+    def test_legacy_exports(self):
+        from rongcloud import rongcloud
+        from rongcloud.rongcloud import Chatroom, User
+        from rongcloud.user import User as UserModule
+        self.assertIs(User, UserModule)
+        self.assertIsInstance(RongCloud('key', 'secret').get_chatroom(), Chatroom)
+        with self.assertRaises(AttributeError):
+            rongcloud.Missing
+
+    def test_user_info_per_call(self):
+        rc = RongCloud('key', 'secret', self.url)
+        message = rc.get_message()
+        user_info = message.user_info('u1', 'name', 'http://a.com/1.png')
+        self.assertEqual(message.set_user_info('u1', 'name', 'http://a.com/1.png'), user_info)
+        content = {'content': 'hello'}
+        message.get_private().send('u1', 'u2', 'RC:TxtMsg', content, user_info=user_info)
+        message.get_private().send('u1', 'u2', 'RC:TxtMsg', content)
+        message.get_group().send('u1', 'g1', 'RC:TxtMsg', content, user_info=user_info)
+        self.assertEqual(CONTENTS[0]['user'], {'id': 'u1', 'name': 'name', 'portrait': 'http://a.com/1.png',
+                                                      'extra': ''})
+        self.assertNotIn('user', CONTENTS[1])
+        self.assertEqual(CONTENTS[2]['user']['id'], 'u1')
+        self.assertEqual(content, {'content': 'hello'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import inspect
+import unittest
+
+from helper import RawServer, ServerTestCase
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.retry import RetryPolicy
+from rongcloud.rongcloud import RongCloud
+
+
+class AsyncRongCloudTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        return {'code': 200, 'path': request.path, 'data': data.decode('utf8')}
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_private_send(self):
+        rc = AsyncRongCloud('key', 'secret', self.url)
+        send = rc.get_message().get_private().send
+        self.assertTrue(inspect.iscoroutinefunction(send))
+        rep = self.loop.run_until_complete(send('AAA', ['BBB', 'CCC'], 'RC:TxtMsg', {'content': 'hello'}))
+        self.assertEqual(rep['code'], 200, rep)
+        self.assertEqual(rep['path'], '/message/private/publish.json', rep)
+        self.assertIn('toUserId=BBB&toUserId=CCC', rep['data'])
+
+    def test_param_check(self):
+        rc = AsyncRongCloud('key', 'secret', self.url)
+        rep = self.loop.run_until_complete(rc.get_user().query('A' * 65))
+        self.assertEqual(rep['code'], 1002, rep)
+
+    def test_concurrent_requests(self):
+        rc = AsyncRongCloud('key', 'secret', self.url, max_connections=4)
+        user = rc.get_user()
+
+        async def run():
+            return await asyncio.gather(*[user.query('user{}'.format(i)) for i in range(50)])
+
+        reps = self.loop.run_until_complete(run())
+        self.assertTrue(all(rep['code'] == 200 for rep in reps), reps)
+        stats = rc.get_pool_stats()[self.url]
+        self.assertLessEqual(stats['created'], 4, stats)
+        self.assertEqual(stats['requests'], 50, stats)
+
+    def test_malformed_response(self):
+        replies = [b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n{"code":200',
+                   b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\n{"cod\r\nzz\r\n',
+                   b'HTTP/1.1 OK\r\nContent-Length: 12\r\n\r\n{"code":200}']
+        for reply in replies:
+            server = RawServer(reply)
+            try:
+                sync = RongCloud('key', 'secret', server.url, retry_policy=RetryPolicy(max_attempts=1))
+                rc = AsyncRongCloud('key', 'secret', server.url, retry_policy=RetryPolicy(max_attempts=1))
+                expected = sync.get_user().query('AAA')
+                self.assertEqual(expected, {'code': -1, 'reason': 'URL error.'})
+                self.assertEqual(self.loop.run_until_complete(rc.get_user().query('AAA')), expected, reply)
+            finally:
+                server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import time
+import unittest
+from urllib.parse import parse_qs
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.rongcloud import RongCloud
+
+
+class BatchTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        time.sleep(0.1)
+        return {'code': 200, 'groupId': parse_qs(data.decode('utf8')).get('groupId', [''])[0]}
+
+    def test_batch(self):
+        rc = RongCloud('key', 'secret', self.url)
+        group = rc.get_group()
+        start = time.monotonic()
+        with rc.batch(max_workers=10) as batch:
+            futures = [batch.submit(group.create, 'AAA', 'group{}'.format(i), 'name') for i in range(20)]
+            batch.submit(group.create, 'AAA', 'A' * 200, 'name')
+            batch.submit(lambda: 1 / 0)
+        reps = batch.results()
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([rep['groupId'] for rep in reps[:20]], ['group{}'.format(i) for i in range(20)])
+        self.assertEqual(futures[3].result()['groupId'], 'group3')
+        self.assertEqual(reps[20]['code'], 1002)
+        self.assertEqual(reps[21]['code'], -1)
+
+    def test_async_batch(self):
+        rc = AsyncRongCloud('key', 'secret', self.url)
+
+        async def run():
+            group = rc.get_group()
+            async with rc.batch(max_workers=10) as batch:
+                for i in range(20):
+                    batch.submit(group.create, 'AAA', 'group{}'.format(i), 'name')
+            reps = await batch.results()
+            rc.close()
+            return reps
+
+        start = time.monotonic()
+        reps = run_until_complete(run())
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([rep['groupId'] for rep in reps], ['group{}'.format(i) for i in range(20)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import unittest
+from urllib.parse import parse_qs
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.rongcloud import RongCloud
+
+
+class BulkTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        data = data.decode('utf8')
+        if request.headers.get('Content-Type') == 'application/json':
+            to_user_ids = json.loads(data)['toUserId']
+        else:
+            to_user_ids = parse_qs(data).get('toUserId', [])
+        return {'code': 1004 if 'fail' in to_user_ids else 200, 'count': len(to_user_ids)}
+
+    def test_private_send_bulk(self):
+        rc = RongCloud('key', 'secret', self.url)
+        to_user_ids = ('user{}'.format(i) for i in range(2500))
+        rep = rc.get_message().get_private().send_bulk('AAA', to_user_ids, 'RC:TxtMsg', {'content': 'hello'})
+        self.assertEqual(rep['code'], 200, rep)
+        self.assertEqual(rep['total'], 2500)
+        self.assertEqual([chunk['result']['count'] for chunk in rep['chunks']], [1000, 1000, 500])
+        self.assertEqual(rep['failed'], [])
+        self.assertNotIn('items', rep['chunks'][0])
+
+    def test_system_send_bulk(self):
+        rc = RongCloud('key', 'secret', self.url)
+        to_user_ids = ('user{}'.format(i) for i in range(250))
+        rep = rc.get_message().get_system().send_bulk('AAA', to_user_ids, 'RC:TxtMsg', {'content': 'hello'})
+        self.assertEqual(rep['code'], 200, rep)
+        self.assertEqual([chunk['result']['count'] for chunk in rep['chunks']], [100, 100, 50])
+
+    def test_private_send_template_bulk(self):
+        rc = RongCloud('key', 'secret', self.url)
+        recipients = (('user{}'.format(i), {'{c}': str(i)}, 'push{c}') for i in range(1200))
+        rep = rc.get_message().get_private().send_template_bulk('AAA', recipients, 'RC:TxtMsg', {'content': '{c}'})
+        self.assertEqual(rep['code'], 200, rep)
+        self.assertEqual([chunk['result']['count'] for chunk in rep['chunks']], [1000, 200])
+
+    def test_private_send_bulk_failed(self):
+        rc = RongCloud('key', 'secret', self.url)
+        to_user_ids = ['user{}'.format(i) for i in range(250)] + ['fail']
+        rep = rc.get_message().get_private().send_bulk('AAA', to_user_ids, 'RC:TxtMsg', {'content': 'hello'},
+                                                       chunk_size=100, max_workers=2, disable_push=True)
+        self.assertEqual(rep['code'], 1004, rep)
+        self.assertEqual(len(rep['chunks']), 3)
+        self.assertEqual([chunk['index'] for chunk in rep['failed']], [2])
+        self.assertEqual(rep['failed'][0]['items'], to_user_ids[200:])
+
+    def test_async_private_send_bulk(self):
+        rc = AsyncRongCloud('key', 'secret', self.url)
+        rep = run_until_complete(rc.get_message().get_private().send_bulk(
+            'AAA', ['user{}'.format(i) for i in range(1500)], 'RC:TxtMsg', {'content': 'hello'}))
+        self.assertEqual(rep['code'], 200, rep)
+        self.assertEqual([chunk['count'] for chunk in rep['chunks']], [1000, 500])
+
+    def test_async_iterator_send_bulk(self):
+        rc = AsyncRongCloud('key', 'secret', self.url)
+
+        async def to_user_ids():
+            for i in range(250):
+                yield 'user{}'.format(i)
+
+        rep = run_until_complete(rc.get_message().get_system().send_bulk(
+            'AAA', to_user_ids(), 'RC:TxtMsg', {'content': 'hello'}, max_workers=2))
+        self.assertEqual(rep['code'], 200, rep)
+        self.assertEqual(rep['total'], 250)
+        self.assertEqual([chunk['result']['count'] for chunk in rep['chunks']], [100, 100, 50])
+
+
+if __name__ == '__main__':
+    unittest.main()
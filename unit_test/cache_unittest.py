@@ -0,0 +1,111 @@
+import time
+import unittest
+from urllib.parse import parse_qs
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.cache import ReadCache
+from rongcloud.results import Result, TagMap
+from rongcloud.rongcloud import RongCloud
+
+REQUESTS = []
+
+
+class CacheTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        REQUESTS.append(request.path)
+        data = data.decode('utf8')
+        if request.path == '/user/tags/get.json':
+            user_ids = parse_qs(data)['userIds']
+            return {'code': 200, 'result': {user_id: ['tag-' + user_id] for user_id in user_ids}}
+        if request.path == '/user/info.json':
+            return {'code': 200 if parse_qs(data)['userId'][0] != 'missing' else 1004, 'userName': 'name'}
+        return {'code': 200, 'users': [{'id': '10001'}]}
+
+    def setUp(self):
+        del REQUESTS[:]
+
+    def test_ttl_lru(self):
+        cache = ReadCache(maxsize=2, ttl=0.05)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(list(cache.entry_stats()), ['c', 'a'])
+        self.assertEqual(cache.entry_stats()['a']['hits'], 1)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('a'))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evicted'], stats['expired']), (1, 2, 1, 1))
+
+    def test_user_query_invalidated_by_update(self):
+        rc = RongCloud('key', 'secret', self.url, cache=ReadCache())
+        user = rc.get_user()
+        self.assertEqual(user.query('AAA')['code'], 200)
+        self.assertEqual(user.query('AAA')['userName'], 'name')
+        user.query('missing')
+        user.query('missing')
+        self.assertEqual(REQUESTS.count('/user/info.json'), 3)
+        user.update('AAA', 'new')
+        user.query('AAA')
+        self.assertEqual(REQUESTS.count('/user/info.json'), 4)
+        self.assertEqual(rc.get_cache_stats()['invalidated'], 1)
+
+    def test_group_members_invalidated_by_join_quit(self):
+        rc = RongCloud('key', 'secret', self.url, cache=ReadCache())
+        group = rc.get_group()
+        group.query('g1')
+        group.get_user().query('g1')
+        self.assertEqual(REQUESTS.count('/group/user/query.json'), 1)
+        group.join('u1', 'g1', 'name')
+        group.get_user().query('g1')
+        group.quit('u1', 'g1')
+        group.get_user().query('g1')
+        self.assertEqual(REQUESTS.count('/group/user/query.json'), 3)
+
+    def test_tags_per_user(self):
+        rc = RongCloud('key', 'secret', self.url, cache=ReadCache())
+        tag = rc.get_user().get_tag()
+        self.assertEqual(tag.get(['a', 'b'])['result'], {'a': ['tag-a'], 'b': ['tag-b']})
+        self.assertEqual(tag.get(['b', 'c'])['result'], {'b': ['tag-b'], 'c': ['tag-c']})
+        self.assertEqual(tag.get(['a', 'c'])['result'], {'a': ['tag-a'], 'c': ['tag-c']})
+        self.assertEqual(REQUESTS.count('/user/tags/get.json'), 2)
+        tag.set('a', ['x'])
+        tag.get(['a', 'c'])
+        self.assertEqual(REQUESTS.count('/user/tags/get.json'), 3)
+
+    def test_typed_results(self):
+        rc = RongCloud('key', 'secret', self.url, cache=ReadCache(), typed_results=True)
+        user = rc.get_user()
+        reps = [user.query('AAA'), user.query('AAA'), rc.get_group().get_user().query('g1'),
+                rc.get_group().get_user().query('g1')]
+        self.assertTrue(all(isinstance(rep, Result) for rep in reps))
+        self.assertEqual(reps[1]['userName'], 'name')
+        self.assertEqual(reps[3].to_dict(), {'code': 200, 'users': [{'id': '10001'}]})
+        tag = user.get_tag()
+        reps = [tag.get(['a']), tag.get(['a', 'b']), tag.get(['a', 'b'])]
+        self.assertTrue(all(isinstance(rep, TagMap) for rep in reps))
+        self.assertEqual(reps[2].tags, {'a': ['tag-a'], 'b': ['tag-b']})
+        self.assertEqual(REQUESTS.count('/user/info.json'), 1)
+        self.assertEqual(REQUESTS.count('/user/tags/get.json'), 2)
+
+    def test_async_cache(self):
+        rc = AsyncRongCloud('key', 'secret', self.url, cache=ReadCache())
+
+        async def run():
+            user = rc.get_user()
+            reps = [await user.query('AAA') for _ in range(3)]
+            await user.update('AAA', 'new')
+            reps.append(await user.query('AAA'))
+            rc.close()
+            return reps
+
+        reps = run_until_complete(run())
+        self.assertTrue(all(rep['code'] == 200 for rep in reps))
+        self.assertEqual(REQUESTS.count('/user/info.json'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.chatroom import UserExistBatcher
+from rongcloud.rongcloud import RongCloud
+
+REQUESTS = []
+
+
+class ChatroomBatcherTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        data = parse_qs(data.decode('utf8'))
+        room_id = data['chatroomId'][0]
+        user_ids = data['userId']
+        if request.path == '/chatroom/users/exist.json':
+            rep = {'code': 200, 'result': [{'userid': user_id, 'isInChrm': int(user_id.startswith('in'))}
+                                           for user_id in user_ids]}
+        else:
+            rep = {'code': 200, 'isInChrm': int(user_ids[0].startswith('in'))}
+        if room_id == 'broken':
+            rep = {'code': 1001, 'errorMessage': 'server error'}
+        REQUESTS.append((request.path, room_id, len(user_ids)))
+        return rep
+
+    def setUp(self):
+        del REQUESTS[:]
+
+    def test_batch_threads(self):
+        batcher = UserExistBatcher(RongCloud('key', 'secret', self.url), max_size=20, max_delay=0.05)
+        user_ids = ['in{}'.format(i) if i % 2 else 'out{}'.format(i) for i in range(40)]
+        reps = {}
+
+        def query(room_id, user_id):
+            reps[room_id, user_id] = batcher.isexist(room_id, user_id)
+
+        threads = [threading.Thread(target=query, args=(room_id, user_id))
+                   for room_id in ('r1', 'r2') for user_id in user_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(reps), 80)
+        self.assertEqual(reps['r1', 'in1'], {'code': 200, 'isInChrm': 1})
+        self.assertEqual(reps['r2', 'out2'], {'code': 200, 'isInChrm': 0})
+        self.assertLess(len(REQUESTS), 80)
+        self.assertTrue(all(count <= 20 for _, _, count in REQUESTS))
+        self.assertEqual(batcher.stats()['calls'], 80)
+        self.assertEqual(batcher.stats()['requests'], len(REQUESTS))
+
+    def test_single_and_errors(self):
+        batcher = UserExistBatcher(RongCloud('key', 'secret', self.url), max_delay=0.001)
+        self.assertEqual(batcher.isexist('r1', 'in1'), {'code': 200, 'isInChrm': 1})
+        self.assertEqual(REQUESTS, [('/chatroom/user/exist.json', 'r1', 1)])
+        self.assertEqual(batcher.isexist('broken', 'in1')['code'], 1001)
+        self.assertEqual(batcher.isexist('r1', 'A' * 65)['code'], 1002)
+
+    def test_async_batch(self):
+        rc = AsyncRongCloud('key', 'secret', self.url)
+        batcher = UserExistBatcher(rc, max_delay=0.01)
+
+        async def run():
+            start = time.monotonic()
+            reps = await asyncio.gather(*[batcher.isexist('r1', 'in{}'.format(i % 30)) for i in range(50)])
+            rc.close()
+            return reps, time.monotonic() - start
+
+        reps, elapsed = run_until_complete(run())
+        self.assertLess(elapsed, 1)
+        self.assertTrue(all(rep == {'code': 200, 'isInChrm': 1} for rep in reps))
+        self.assertEqual(REQUESTS, [('/chatroom/users/exist.json', 'r1', 30)])
+
+
+if __name__ == '__main__':
+    unittest.main()
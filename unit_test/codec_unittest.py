@@ -0,0 +1,64 @@
+import importlib
+import json
+import sys
+import unittest
+
+from helper import ServerTestCase
+from rongcloud import codec
+from rongcloud.rongcloud import RongCloud
+
+RECEIVED = []
+
+
+class CodecTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        RECEIVED.append((request.headers.get('Content-Type'), data))
+        return {'code': 200}
+
+    def setUp(self):
+        del RECEIVED[:]
+
+    def test_round_trip(self):
+        obj = {'content': '你好 "融云"', 'list': [1, 2.5, None, True]}
+        text = codec.dumps(obj)
+        self.assertIsInstance(text, str)
+        self.assertIn('你好', text)
+        self.assertEqual(codec.loads(text), obj)
+        self.assertEqual(codec.loads(text.encode('utf-8')), obj)
+
+    def test_stdlib_compatible(self):
+        for obj in ({1: 'a', 'b': [2]}, {'n': 2 ** 70}, {'n': [-2 ** 64, '你好']}):
+            self.assertEqual(codec.dumps(obj), json.dumps(obj, ensure_ascii=False, separators=(',', ':')))
+        private = RongCloud('key', 'secret', self.url).get_message().get_private()
+        self.assertEqual(private.send('AAA', 'BBB', 'RC:TxtMsg', {1: 'a'})['code'], 200)
+        self.assertEqual(private.send('AAA', 'BBB', 'RC:TxtMsg', {'n': 2 ** 70})['code'], 200)
+
+    def test_stdlib_fallback(self):
+        saved = {name: sys.modules.get(name) for name in ('orjson', 'ujson')}
+        sys.modules.update(orjson=None, ujson=None)
+        try:
+            fallback = importlib.reload(codec)
+            self.assertEqual(fallback.BACKEND, 'json')
+            self.assertEqual(fallback.dumps({'a': ['你好']}), '{"a":["你好"]}')
+        finally:
+            for name, module in saved.items():
+                if module is None:
+                    del sys.modules[name]
+                else:
+                    sys.modules[name] = module
+            importlib.reload(codec)
+
+    def test_content_type_from_builder(self):
+        private = RongCloud('key', 'secret', self.url).get_message().get_private()
+        private.send('AAA', 'BBB', 'RC:TxtMsg', {'content': '你好'})
+        private.send_template('AAA', ['BBB'], 'RC:TxtMsg', [{'{name}': 'B'}], {'content': '{name}'}, ['push'])
+        (form_type, form_body), (json_type, json_body) = RECEIVED
+        self.assertEqual(form_type, 'application/x-www-form-urlencoded')
+        self.assertTrue(form_body.startswith(b'fromUserId=AAA'))
+        self.assertEqual(json_type, 'application/json')
+        self.assertEqual(json.loads(json_body.decode('utf-8'))['toUserId'], ['BBB'])
+
+
+if __name__ == '__main__':
+    unittest.main()
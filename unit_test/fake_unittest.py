@@ -0,0 +1,105 @@
+import time
+import unittest
+
+from helper import run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.chatroom import UserExistBatcher
+from rongcloud.retry import RetryPolicy
+from rongcloud.rongcloud import RongCloud
+from rongcloud.testing import AsyncFakeTransport, FakeRongCloud, FakeTransport, LocalServer, lognormal_latency
+from rongcloud.timeouts import TimeoutPolicy
+
+
+class FakeTestCase(unittest.TestCase):
+    def test_in_process(self):
+        fake = FakeRongCloud('key', 'secret')
+        rc = RongCloud('key', 'secret', transport=FakeTransport(fake))
+        user = rc.get_user()
+        self.assertEqual(user.register('u1', '忘情水', 'http://a.com/1.png')['userId'], 'u1')
+        user.update('u1', '青花瓷')
+        self.assertEqual(user.query('u1')['userName'], '青花瓷')
+        fake.set_online('u1')
+        self.assertEqual(user.check_online('u1')['status'], '1')
+        user.get_blacklist().add('u1', ['u2', 'u3'])
+        self.assertEqual(user.get_blacklist().query('u1')['users'], ['u2', 'u3'])
+        self.assertEqual(user.get_tag().set_bulk({'u{}'.format(i): ['vip'] for i in range(1500)})['code'], 200)
+        self.assertEqual(user.get_tag().get(['u1', 'x'])['result'], {'u1': ['vip'], 'x': []})
+        self.assertEqual(user.get_tag().set_bulk({'single': ['a', 'b']})['code'], 200)
+        self.assertEqual(user.get_tag().get(['single'])['result'], {'single': ['a', 'b']})
+
+        group = rc.get_group()
+        group.create(['u1', 'u2'], 'g1', 'group')
+        group.join('u3', 'g1', 'group')
+        group.quit('u2', 'g1')
+        self.assertEqual([item['id'] for item in group.query('g1')['users']], ['u1', 'u3'])
+
+        chatroom = rc.get_chatroom()
+        chatroom.create([('r1', 'room')])
+        fake.join_chatroom('r1', ['u1', 'u2'])
+        self.assertEqual(chatroom.get_user().query('r1', 500, 1)['total'], 2)
+        self.assertEqual(UserExistBatcher(rc).isexist('r1', 'u2'), {'code': 200, 'isInChrm': 1})
+        self.assertEqual(chatroom.get_user().isexist('r1', ['u1', 'u9'])['result'][1]['isInChrm'], 0)
+
+        rep = rc.get_message().get_private().send('u1', ['u2', 'u3'], 'RC:TxtMsg', {'content': 'hi'})
+        self.assertEqual(len(rep['messageUIDs']), 2)
+        self.assertEqual(fake.sent[-1]['to'], ['u2', 'u3'])
+        self.assertEqual(rc.get_message().get_group().send('u1', 'g1', 'RC:TxtMsg', {'content': 'hi'})['code'], 200)
+
+        rc.get_sensitive().add('bad', '***')
+        self.assertEqual(rc.get_sensitive().query(0)['words'][0]['word'], 'bad')
+        notification = rc.get_conversation().get_notification()
+        notification.set(1, 'u1', 'u2', 1)
+        self.assertEqual(notification.get(1, 'u1', 'u2')['isMuted'], 1)
+        rep = rc.get_push().push(['ios'], None, None, ['u1'], None, False, 'alert', None, 'alert', None, None, None,
+                                 None, None, 'alert', None)
+        self.assertTrue(rep['id'].startswith('fake-push-'))
+        self.assertEqual(fake.requests['/user/tag/batch/set.json'], 2)
+
+    def test_signature_checked(self):
+        rc = RongCloud('key', 'wrong', transport=FakeTransport(FakeRongCloud('key', 'secret')))
+        self.assertEqual(rc.get_user().query('u1')['code'], 1004)
+
+    def test_latency(self):
+        fake = FakeRongCloud(latency=lognormal_latency(median=0.005, sigma=0.3))
+        rc = RongCloud('key', 'secret', transport=FakeTransport(fake))
+        start = time.monotonic()
+        for _ in range(10):
+            rc.get_user().query('u1')
+        self.assertGreater(time.monotonic() - start, 0.02)
+
+        fake.latency = 0.2
+        rc = RongCloud('key', 'secret', transport=FakeTransport(fake), retry_policy=RetryPolicy(max_attempts=1),
+                       timeouts=TimeoutPolicy(read=0.05))
+        self.assertEqual(rc.get_user().query('u1'), {'code': -1, 'reason': 'Socket timeout.'})
+
+    def test_local_server(self):
+        fake = FakeRongCloud('key', 'secret')
+        with LocalServer(fake) as server:
+            rc = RongCloud('key', 'secret', server.url)
+            rc.get_user().register('u1', 'name', 'http://a.com/1.png')
+            self.assertEqual(rc.get_user().query('u1')['userName'], 'name')
+            rc = AsyncRongCloud('key', 'secret', server.url)
+
+            async def run():
+                rep = await rc.get_message().get_private().send('u1', 'u2', 'RC:TxtMsg', {'content': 'hi'})
+                rc.close()
+                return rep
+
+            rep = run_until_complete(run())
+        self.assertEqual(rep['messageUIDs'][0]['userId'], 'u2')
+        self.assertEqual(fake.requests['/message/private/publish.json'], 1)
+
+    def test_async_in_process(self):
+        fake = FakeRongCloud()
+        rc = AsyncRongCloud('key', 'secret', transport=AsyncFakeTransport(fake))
+
+        async def run():
+            await rc.get_group().create(['u1'], 'g1', 'group')
+            return await rc.get_group().query('g1')
+
+        rep = run_until_complete(run())
+        self.assertEqual(rep['users'], [{'id': 'u1'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
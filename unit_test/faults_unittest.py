@@ -0,0 +1,80 @@
+import time
+import unittest
+
+from rongcloud.retry import RetryPolicy
+from rongcloud.rongcloud import RongCloud
+from rongcloud.testing import FakeRongCloud, FakeTransport, Faults, FaultyCluster, fixed_latency
+from rongcloud.timeouts import TimeoutPolicy
+
+
+class FaultsTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cluster = FaultyCluster(latency=0.001).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cluster.stop()
+
+    def setUp(self):
+        self.cluster.clear()
+
+    def test_inject(self):
+        faults = Faults(rate_limits={'/user/info.json': (2, 60)}, seed=1)
+        self.assertEqual([faults.inject('/user/info.json') for _ in range(2)], [None, None])
+        self.assertEqual(faults.inject('/user/info.json')[:2], ('status', 429))
+        self.assertIsNone(faults.inject('/user/checkOnline.json'))
+        faults.burst(2, 502)
+        self.assertEqual([faults.inject('/x.json')[1] for _ in range(2)], [502, 502])
+        faults.update(reset_rate=1)
+        self.assertEqual(faults.inject('/x.json')[0], 'reset')
+        self.assertEqual(faults.injected, {'reset': 1, 'status': 2, 'rate_limited': 1})
+        self.assertEqual(Faults(slow_body=(10, 0.1)).body_delay(25), 0.30000000000000004)
+
+    def test_primary_down(self):
+        rc = RongCloud('key', 'secret', self.cluster.host_url)
+        self.cluster.faults[0].update(reset_rate=1)
+        report = self.cluster.run_load(lambda: rc.get_user().query('u1'), concurrency=4, requests=100)
+        self.assertEqual(report['codes'], {200: 100})
+        self.assertGreater(self.cluster.faults[0].injected['reset'], 0)
+        self.assertLess(self.cluster.faults[0].injected['reset'], 50)
+
+    def test_error_burst_scenario(self):
+        rc = RongCloud('key', 'secret', self.cluster.host_url, retry_policy=RetryPolicy(max_attempts=3, backoff=0.01))
+        thread = self.cluster.play([(0, 0, {'error_rate': 1, 'latency': fixed_latency(0.01)}), (0.3, 0, 'clear')])
+        report = self.cluster.run_load(lambda: rc.get_user().check_online('u1'), concurrency=4, duration=0.6)
+        thread.join()
+        self.assertEqual(set(report['codes']), {200})
+        self.assertGreater(report['throughput'], 0)
+        self.assertGreater(report['latency']['p99'], 0)
+
+    def test_slow_body_and_rate_limit(self):
+        self.cluster.faults[0].update(slow_body=(4, 0.2))
+        self.cluster.faults[1].update(slow_body=(4, 0.2))
+        rc = RongCloud('key', 'secret', self.cluster.host_url, retry_policy=RetryPolicy(max_attempts=1),
+                       timeouts=TimeoutPolicy(read=0.1))
+        self.assertEqual(rc.get_user().query('u1'), {'code': -1, 'reason': 'Socket timeout.'})
+
+        self.cluster.clear()
+        self.cluster.faults[0].update(rate_limits={'/message/private/publish.json': (1, 60)})
+        rc = RongCloud('key', 'secret', self.cluster.urls[0])
+        private = rc.get_message().get_private()
+        self.assertEqual(private.send('u1', 'u2', 'RC:TxtMsg', {'content': 'hi'})['code'], 200)
+        self.assertEqual(private.send('u1', 'u2', 'RC:TxtMsg', {'content': 'hi'})['code'], 1008)
+
+    def test_in_process_faults(self):
+        faults = {'http://a': Faults(reset_rate=1), 'http://b': Faults(latency=0.01)}
+        transport = FakeTransport(FakeRongCloud(), faults)
+        rc = RongCloud('key', 'secret', 'http://a;http://b', transport=transport)
+        start = time.monotonic()
+        self.assertEqual(rc.get_user().query('u1')['code'], 200)
+        self.assertGreater(time.monotonic() - start, 0.01)
+        self.assertEqual(transport.stats(), {'http://a': {'requests': 1}, 'http://b': {'requests': 1}})
+        faults['http://b'].update(latency=None, slow_body=(1, 1))
+        rc = RongCloud('key', 'secret', 'http://b', transport=transport, retry_policy=RetryPolicy(max_attempts=1),
+                       timeouts=TimeoutPolicy(read=0.05))
+        self.assertEqual(rc.get_user().query('u1')['reason'], 'Socket timeout.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+单元测试共用的本地 HTTP 服务。
+"""
+import asyncio
+import json
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.reply(self.server.respond(self, self.rfile.read(int(self.headers.get('Content-Length', 0)))))
+
+    def do_GET(self):
+        self.reply(self.server.respond(self, b''))
+
+    def reply(self, rep):
+        """
+        :param rep:                 dict 按 JSON 返回，bytes 原样返回；(status, dict 或 bytes) 指定 HTTP 状态码。
+        """
+        status, rep = rep if isinstance(rep, tuple) else (200, rep)
+        body = rep if isinstance(rep, bytes) else json.dumps(rep).encode('utf8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # 默认 listen 队列为 5，并发建立连接时会溢出并触发约 1 秒的 SYN 重传
+    request_queue_size = 64
+
+    def __init__(self, respond, handler=Handler):
+        """
+        :param respond:             respond(request, data) 处理每个请求，request 为 Handler（可读取 path、headers），
+                                    data 为请求体 bytes，返回值见 Handler.reply。
+        :param handler:             Handler 或其子类。
+        """
+        super().__init__(('127.0.0.1', 0), handler)
+        self.respond = respond
+        self.url = 'http://127.0.0.1:{}'.format(self.server_address[1])
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def handle_error(self, request, client_address):
+        # 客户端超时或重试时主动断开连接属预期，不打印异常
+        pass
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def run_until_complete(coro):
+    """
+    在新建的事件循环中运行 coro 并关闭该循环（兼容 Python 3.6，不使用 asyncio.run）。
+    :return:                    coro 的返回值。
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class RawServer:
+    """
+    对每个连接读取一个请求后原样写出 reply 再关闭连接，用于模拟截断、格式错误等不合规的响应。
+    """
+
+    def __init__(self, reply):
+        self.reply = reply
+        self._sock = socket.socket()
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen(16)
+        self.url = 'http://127.0.0.1:{}'.format(self._sock.getsockname()[1])
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with conn:
+                # 读完请求体再关闭连接，否则未读数据会使关闭变为 RST，客户端读不到 reply
+                data = b''
+                while b'\r\n\r\n' not in data or len(data) < self._length(data):
+                    chunk = conn.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+                conn.sendall(self.reply)
+
+    @staticmethod
+    def _length(data):
+        head, _, _ = data.partition(b'\r\n\r\n')
+        for line in head.split(b'\r\n'):
+            key, _, value = line.partition(b':')
+            if key.strip().lower() == b'content-length':
+                return len(head) + 4 + int(value)
+        return 0
+
+    def stop(self):
+        self._sock.close()
+
+
+class ServerTestCase(unittest.TestCase):
+    """
+    setUpClass 启动以 respond 处理请求的本地服务，cls.url 为其地址；子类以 staticmethod 实现 respond。
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = Server(cls.respond)
+        cls.url = cls.server.url
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    @staticmethod
+    def respond(request, data):
+        return {'code': 200}
@@ -0,0 +1,129 @@
+import gzip
+import io
+import json
+import unittest
+import zipfile
+from urllib.parse import parse_qs
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.history import HistoryError, iter_records
+from rongcloud.rongcloud import RongCloud
+
+
+def make_log(count):
+    lines = []
+    for i in range(count):
+        record = {'appId': 'key', 'fromUserId': 'u{}'.format(i % 10), 'targetId': 'g{}'.format(i % 3),
+                  'targetType': 3 if i % 2 else 1, 'classname': 'RC:ImgMsg' if i % 5 == 0 else 'RC:TxtMsg',
+                  'content': {'content': '消息{}'.format(i)}, 'msgUID': 'uid{}'.format(i)}
+        lines.append('2014-01-01 01:00:{:02d} {}'.format(i % 60, json.dumps(record, ensure_ascii=False)))
+    lines.insert(3, 'broken line')
+    return ('\r\n'.join(lines) + '\r\n').encode('utf8')
+
+
+class Unseekable(io.RawIOBase):
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def make_zip(data, streamed=False):
+    out = Unseekable() if streamed else io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
+        if streamed:
+            # 写入不可 seek 的流时使用数据描述符，与边生成边上传的归档一致
+            with zf.open('log.txt', 'w') as fp:
+                fp.write(data)
+        else:
+            zf.writestr('log.txt', data)
+    return bytes(out.data) if streamed else out.getvalue()
+
+
+LOG = make_log(1000)
+FILES = {'2014010100': gzip.compress(LOG), '2014010101': make_zip(LOG), '2014010102': make_zip(LOG, True)}
+
+
+class HistoryTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        if request.command == 'GET':
+            return FILES[request.path.rsplit('/', 1)[-1]]
+        date = parse_qs(data.decode('utf8'))['date'][0]
+        if date in FILES:
+            return {'code': 200, 'url': 'http://{}:{}/files/{}'.format(*request.server.server_address, date),
+                    'date': date}
+        if date == '2014010103':
+            return {'code': 200, 'url': '', 'date': date}
+        return {'code': 1004, 'errorMessage': 'no data'}
+
+    def test_iter_records(self):
+        for data in [LOG] + list(FILES.values()):
+            stats = {}
+            records = list(iter_records(io.BytesIO(data), chunk_size=97, stats=stats))
+            self.assertEqual(len(records), 1000)
+            self.assertEqual(records[999]['content']['content'], '消息999')
+            self.assertEqual((stats['lines'], stats['skipped']), (1001, 1))
+            # zip 读到中央目录即结束，不再读取其后的目录数据
+            self.assertTrue(0 < stats['bytes'] <= len(data))
+        records = list(iter_records(io.BytesIO(FILES['2014010102']), object_names=['RC:ImgMsg'],
+                                    target_types=[1], user_ids=['u0', 'g2']))
+        self.assertEqual(len(records), 100)
+        self.assertTrue(all(record['classname'] == 'RC:ImgMsg' for record in records))
+
+    def test_records_and_export(self):
+        history = RongCloud('key', 'secret', self.url).get_message().get_history()
+        records = list(history.records('2014010101', user_ids=['u1']))
+        self.assertEqual(len(records), 100)
+        self.assertEqual(list(history.records('2014010103')), [])
+        with self.assertRaises(HistoryError) as cm:
+            history.records('2014010104')
+        self.assertEqual(cm.exception.result['code'], 1004)
+
+        seen = []
+        rep = history.export(['2014010100', '2014010101', '2014010102', '2014010103', '2014010104'], seen.append,
+                             object_names=['RC:TxtMsg'])
+        self.assertEqual(rep['code'], 1004)
+        self.assertEqual(len(seen), 2400)
+        self.assertEqual([item['result'].get('records') for item in rep['chunks']], [800, 800, 800, 0, None])
+        self.assertEqual(rep['chunks'][2]['result']['date'], '2014010102')
+        self.assertEqual(rep['failed'][0]['items'], ['2014010104'])
+
+        rep = history.export('2014010101', seen.append)
+        self.assertEqual((rep['code'], rep['total']), (200, 1))
+        self.assertEqual(rep['chunks'][0]['result']['records'], 1000)
+        self.assertEqual(history.export(['2014010101'], seen.append, max_workers=0)['code'], 1002)
+
+    def test_async_export(self):
+        rc = AsyncRongCloud('key', 'secret', self.url)
+
+        async def run():
+            history = rc.get_message().get_history()
+            iterator = await history.records('2014010100', target_types=[3])
+            self.assertFalse(hasattr(iterator, '__next__'))
+            records = [record async for record in iterator]
+            self.assertEqual([record async for record in await history.records('2014010103')], [])
+            iterator = await history.records('2014010101')
+            self.assertEqual((await iterator.__anext__())['msgUID'], 'uid0')
+            await iterator.aclose()
+            seen = []
+            rep = await history.export(['2014010100', '2014010102'], seen.append)
+            self.assertEqual((await history.export('2014010103', seen.append))['total'], 1)
+            self.assertEqual((await history.export('2014010103', seen.append, max_workers=65))['code'], 1002)
+            rc.close()
+            return records, seen, rep
+
+        records, seen, rep = run_until_complete(run())
+        self.assertEqual(len(records), 500)
+        self.assertEqual(len(seen), 2000)
+        self.assertEqual(rep['code'], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import socket
+import time
+import unittest
+
+from rongcloud.hosts import HostSelector
+
+
+class HostSelectorTestCase(unittest.TestCase):
+    def test_primary_first(self):
+        selector = HostSelector('http://a;http://b')
+        self.assertEqual(selector.get_url(), 'http://a')
+        self.assertEqual(selector.next_url('http://a'), 'http://b')
+
+    def test_switch_on_errors(self):
+        selector = HostSelector('http://a;http://b', probe_interval=60)
+        selector.report('http://a', 0.05)
+        selector.report('http://a', 0.05, error=True)
+        self.assertEqual(selector.get_url(), 'http://b')
+        selector.report('http://a', 0.05, error=True)
+        self.assertTrue(selector.stats()['http://a']['down'])
+
+    def test_latency_hysteresis(self):
+        selector = HostSelector('http://a;http://b', alpha=1)
+        selector.report('http://a', 0.10)
+        selector.report('http://b', 0.09)
+        self.assertEqual(selector.get_url(), 'http://a')
+        selector.report('http://b', 0.05)
+        self.assertEqual(selector.get_url(), 'http://b')
+
+    def test_probe_recovery(self):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(5)
+        host = 'http://127.0.0.1:{}'.format(listener.getsockname()[1])
+        try:
+            selector = HostSelector(host + ';http://b', probe_interval=0.05)
+            for _ in range(3):
+                selector.report(host, 0.01, error=True)
+            self.assertEqual(selector.get_url(), 'http://b')
+            deadline = time.monotonic() + 2
+            while selector.stats()[host]['down'] and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertFalse(selector.stats()[host]['down'])
+        finally:
+            listener.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
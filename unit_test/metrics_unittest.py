@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.metrics import Histogram, HistogramObserver, Observer
+from rongcloud.retry import ERROR_CONNECT
+from rongcloud.rongcloud import RongCloud
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.events = []
+        self.switches = []
+
+    def on_request(self, event):
+        self.events.append(event)
+
+    def on_host_switch(self, old_host, new_host):
+        self.switches.append((old_host, new_host))
+
+
+class MetricsTestCase(ServerTestCase):
+
+    def test_request_events(self):
+        recorder = Recorder()
+        rc = RongCloud('key', 'secret', self.url, observers=[recorder])
+        private = rc.get_message().get_private()
+        private.send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})
+        private.send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})
+        first, second = recorder.events
+        self.assertEqual(first.endpoint, '/message/private/publish.json')
+        self.assertEqual(first.host, self.url)
+        self.assertEqual(first.code, 200)
+        for phase in ('render', 'sign', 'connect', 'send', 'first_byte', 'read', 'parse', 'total'):
+            self.assertIn(phase, first.timings)
+        # 第二次请求复用连接，没有 connect 阶段
+        self.assertNotIn('connect', second.timings)
+        self.assertGreaterEqual(second.timings['total'], second.timings['first_byte'])
+
+    def test_retry_and_switch_events(self):
+        recorder = Recorder()
+        rc = RongCloud('key', 'secret', 'http://127.0.0.1:9;' + self.url, observers=[recorder])
+        for _ in range(3):
+            rc.get_message().get_private().send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})
+        failed = recorder.events[0]
+        self.assertEqual((failed.attempt, failed.code, failed.error), (1, -1, ERROR_CONNECT))
+        self.assertEqual((recorder.events[1].attempt, recorder.events[1].code), (2, 200))
+        self.assertEqual(recorder.switches, [('http://127.0.0.1:9', self.url)])
+
+    def test_histogram_observer(self):
+        observer = HistogramObserver()
+        rc = RongCloud('key', 'secret', self.url)
+        rc.add_observer(observer)
+        for _ in range(10):
+            rc.get_user().get_tag().get(['AAA'])
+        summary = observer.summary()['/user/tags/get.json']
+        self.assertEqual(summary['codes'], {200: 10})
+        self.assertEqual(summary['phases']['total']['count'], 10)
+        self.assertLessEqual(summary['phases']['total']['p50'], summary['phases']['total']['max'])
+
+    def test_async_events(self):
+        recorder = Recorder()
+        rc = AsyncRongCloud('key', 'secret', self.url, observers=[recorder])
+
+        async def run():
+            private = rc.get_message().get_private()
+            await asyncio.gather(*[private.send('AAA', 'BBB', 'RC:TxtMsg', {'content': str(i)}) for i in range(5)])
+            rc.close()
+
+        run_until_complete(run())
+        self.assertEqual([event.code for event in recorder.events], [200] * 5)
+        self.assertTrue(all('render' in event.timings and 'first_byte' in event.timings for event in recorder.events))
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.add(value / 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.summary()['mean'], 0.0505)
+        self.assertAlmostEqual(histogram.percentile(0.5), 0.05, delta=0.015)
+        self.assertEqual(histogram.percentile(1), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from rongcloud import module
+from rongcloud.module import BODY_FORM, BODY_JSON, Module
+
+
+class ModuleTestCase(unittest.TestCase):
+    def test_render_cached(self):
+        format_str = 'userId={{ user_id }}{% for item in tags %}&tag={{ item }}{% endfor %}'
+        module._compile.cache_clear()
+        self.assertEqual(Module._render({'user_id': 'AAA', 'tags': ['a', 'b']}, format_str), 'userId=AAA&tag=a&tag=b')
+        self.assertEqual(Module._render({'user_id': 'BBB', 'tags': []}, format_str), 'userId=BBB')
+        info = module._compile.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 1), info)
+
+    def test_request_builders(self):
+        request = Module._form_request('/user/info.json', {'user_id': '融云'}, 'userId={{ user_id }}')
+        self.assertEqual((request.kind, request.content_type), (BODY_FORM, 'application/x-www-form-urlencoded'))
+        self.assertEqual(request.body, 'userId=融云'.encode('utf-8'))
+        self.assertIsNotNone(request.render_time)
+        self.assertEqual(Module._form_request('/chatroom/whitelist/query.json').body, b'')
+
+        request = Module._json_request('/push.json', {'platform': ['ios']})
+        self.assertEqual((request.kind, request.content_type), (BODY_JSON, 'application/json'))
+        self.assertEqual(request.body, b'{"platform":["ios"]}')
+        request = Module._json_request('/user/tag/set.json', {'user_id': 'AAA'}, '{"userId":"{{ user_id }}"}')
+        self.assertEqual(request.body, b'{"userId":"AAA"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from helper import Handler, Server, ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.pool import ConnectionPool
+from rongcloud.retry import RetryPolicy
+from rongcloud.rongcloud import RongCloud
+from rongcloud.testing import FakeRongCloud, Faults, LocalServer
+
+
+class IdleCloseHandler(Handler):
+    # 服务端 0.05 秒后关闭空闲的 keep-alive 连接
+    timeout = 0.05
+
+
+class PoolTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        return {'code': 200, 'path': request.path}
+
+    def test_keep_alive_reuse(self):
+        rc = RongCloud('key', 'secret', self.url)
+        for _ in range(5):
+            rep = rc.get_user().query('AAA')
+            self.assertEqual(rep['code'], 200, rep)
+            self.assertEqual(rep['path'], '/user/info.json', rep)
+        stats = rc.get_pool_stats()[self.url]
+        self.assertEqual(stats['created'], 1, stats)
+        self.assertEqual(stats['reused'], 4, stats)
+        self.assertEqual(stats['requests'], 5, stats)
+
+    def test_max_connections(self):
+        pool = ConnectionPool(self.url, max_connections=2)
+        threads = [threading.Thread(target=pool.request, args=('POST', '/x.json', b'')) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = pool.stats()
+        self.assertLessEqual(stats['created'], 2, stats)
+        self.assertEqual(stats['in_use'], 0, stats)
+        self.assertEqual(stats['requests'], 10, stats)
+
+    def test_idle_eviction(self):
+        pool = ConnectionPool(self.url, idle_timeout=0.05)
+        pool.request('POST', '/x.json', b'')
+        time.sleep(0.1)
+        stats = pool.stats()
+        self.assertEqual(stats['idle'], 0, stats)
+        self.assertEqual(stats['evicted'], 1, stats)
+
+    @staticmethod
+    async def _send_twice(rc):
+        reps = []
+        for _ in range(2):
+            reps.append(await rc.get_message().get_private().send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'}))
+            await asyncio.sleep(0.2)
+        return reps
+
+    def test_server_closed_idle_connection(self):
+        server = Server(self.respond, IdleCloseHandler)
+        try:
+            for rc in (RongCloud('key', 'secret', server.url), AsyncRongCloud('key', 'secret', server.url)):
+                if rc.is_async:
+                    reps = run_until_complete(self._send_twice(rc))
+                else:
+                    reps = []
+                    for _ in range(2):
+                        reps.append(rc.get_message().get_private().send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'}))
+                        time.sleep(0.2)
+                for rep in reps:
+                    self.assertEqual(rep['code'], 200, rep)
+                stats = rc.get_pool_stats()[server.url]
+                self.assertEqual((stats['created'], stats['reused']), (2, 0), stats)
+        finally:
+            server.stop()
+
+    def test_no_silent_resend_after_reset(self):
+        faults = Faults(reset_rate=0.5, seed=1)
+        with LocalServer(FakeRongCloud(), faults=faults) as server:
+            rc = RongCloud('key', 'secret', server.url, retry_policy=RetryPolicy(max_attempts=1))
+            async_rc = AsyncRongCloud('key', 'secret', server.url, retry_policy=RetryPolicy(max_attempts=1))
+            private = rc.get_message().get_private()
+            codes = [private.send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})['code'] for _ in range(20)]
+
+            async def run():
+                private = async_rc.get_message().get_private()
+                return [(await private.send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'}))['code'] for _ in range(20)]
+
+            codes += run_until_complete(run())
+        self.assertGreater(faults.injected['reset'], 0)
+        self.assertEqual(codes.count(-1), faults.injected['reset'])
+
+
+if __name__ == '__main__':
+    unittest.main()
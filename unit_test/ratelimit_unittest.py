@@ -0,0 +1,39 @@
+import time
+import unittest
+
+from rongcloud.ratelimit import RateLimiter, TokenBucket
+from rongcloud.rongcloud import RongCloud
+
+
+class RateLimitTestCase(unittest.TestCase):
+    def test_token_bucket_rate(self):
+        bucket = TokenBucket(50)
+        start = time.monotonic()
+        for _ in range(11):
+            self.assertTrue(bucket.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_token_bucket_fail_fast(self):
+        bucket = TokenBucket(1, capacity=2)
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertFalse(bucket.acquire(timeout=0))
+
+    def test_rate_limiter_per_url(self):
+        limiter = RateLimiter({'/message/broadcast.json': (2, 3600, 2)}, timeout=0)
+        self.assertTrue(limiter.acquire('/message/broadcast.json'))
+        self.assertTrue(limiter.acquire('/message/broadcast.json'))
+        self.assertFalse(limiter.acquire('/message/broadcast.json'))
+        self.assertTrue(limiter.acquire('/user/info.json'))
+
+    def test_rongcloud_rate_limit(self):
+        rc = RongCloud('key', 'secret', 'http://127.0.0.1:9',
+                       rate_limits={'/message/broadcast.json': (2, 3600)}, rate_limit_timeout=0)
+        rep = rc.get_message().broadcast('AAA', 'RC:TxtMsg', {'content': 'hello'})
+        self.assertEqual(rep['code'], -1, rep)
+        rep = rc.get_message().broadcast('AAA', 'RC:TxtMsg', {'content': 'hello'})
+        self.assertEqual(rep['code'], 1008, rep)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from helper import ServerTestCase
+from rongcloud.results import ChatroomMembers, Result, SendResult, TagMap
+from rongcloud.rongcloud import RongCloud
+
+RESPONSES = {
+    '/chatroom/user/query.json': {'code': 200, 'total': 2, 'users': [{'id': 'uid1', 'time': '2015-09-10 16:38:26'},
+                                                                     {'id': 'uid2', 'time': '2015-09-10 16:38:27'}]},
+    '/user/tags/get.json': {'code': 200, 'result': {'111': [], '222': ['帅哥', '北京']}},
+}
+
+
+class ResultsTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        return RESPONSES.get(request.path, {'code': 200})
+
+    def test_lazy_dict_compatible(self):
+        result = Result(b'{"code":200,"userId":"AAA"}')
+        self.assertFalse(hasattr(result, '__dict__'))
+        self.assertIsNone(result._data)
+        self.assertEqual(result['code'], 200)
+        self.assertIsNone(result._raw)
+        self.assertEqual(result.get('missing', 1), 1)
+        self.assertIn('userId', result)
+        self.assertEqual(result, {'code': 200, 'userId': 'AAA'})
+        self.assertEqual(Result(b'<html>', 502).get('code'), -1)
+
+    def test_typed_results(self):
+        rc = RongCloud('key', 'secret', self.url, typed_results=True)
+        rep = rc.get_message().get_private().send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})
+        self.assertIsInstance(rep, SendResult)
+        self.assertTrue(rep.ok)
+        self.assertEqual(rep.message_uids, [])
+
+        members = rc.get_chatroom().get_user().query('room', 10, 1)
+        self.assertIsInstance(members, ChatroomMembers)
+        self.assertEqual(members.total, 2)
+        self.assertEqual([(user.id, user.time) for user in members.users][0], ('uid1', '2015-09-10 16:38:26'))
+        self.assertEqual(members.user_ids, ['uid1', 'uid2'])
+        self.assertEqual(members['users'][1]['id'], 'uid2')
+
+        tags = rc.get_user().get_tag().get(['111', '222'])
+        self.assertIsInstance(tags, TagMap)
+        self.assertEqual(tags.tags_of('222'), ['帅哥', '北京'])
+        self.assertEqual(tags.tags_of('333'), [])
+
+        # 参数错误未发出请求，仍返回 dict
+        self.assertEqual(rc.get_user().get_tag().get([])['code'], 1002)
+
+    def test_default_dict(self):
+        rc = RongCloud('key', 'secret', self.url)
+        rep = rc.get_user().get_tag().get(['111'])
+        self.assertIs(type(rep), dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
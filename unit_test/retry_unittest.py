@@ -0,0 +1,51 @@
+import unittest
+
+from helper import Server
+from rongcloud.retry import ERROR_CONNECT, ERROR_TIMEOUT, RetryPolicy
+from rongcloud.rongcloud import RongCloud
+
+
+class RetryTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ok_server = Server(lambda request, data: {'code': 200})
+        cls.bad_server = Server(lambda request, data: (503, {'code': 500}))
+        cls.ok_url = cls.ok_server.url
+        cls.bad_url = cls.bad_server.url
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ok_server.stop()
+        cls.bad_server.stop()
+
+    def test_policy(self):
+        policy = RetryPolicy(max_attempts=3, backoff=0.1, jitter=False)
+        self.assertEqual(policy.next_delay('/message/private/publish.json', 1, 0, ERROR_CONNECT), 0.1)
+        self.assertIsNone(policy.next_delay('/message/private/publish.json', 1, 0, ERROR_TIMEOUT))
+        self.assertIsNone(policy.next_delay('/message/private/publish.json', 1, 0, status=503))
+        self.assertEqual(policy.next_delay('/user/info.json', 2, 0, status=503), 0.2)
+        self.assertIsNone(policy.next_delay('/user/info.json', 3, 0, status=503))
+        self.assertIsNone(policy.next_delay('/user/info.json', 1, 0, status=200))
+        self.assertIsNone(RetryPolicy(jitter=False, deadline=1).next_delay('/user/info.json', 1, 0.95, ERROR_TIMEOUT))
+
+    def test_connect_error_retries_other_host(self):
+        rc = RongCloud('key', 'secret', 'http://127.0.0.1:9;' + self.ok_url)
+        rep = rc.get_message().get_private().send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})
+        self.assertEqual(rep['code'], 200, rep)
+
+    def test_status_retry_idempotent_only(self):
+        rc = RongCloud('key', 'secret', self.bad_url + ';' + self.ok_url)
+        rep = rc.get_message().get_private().send('AAA', 'BBB', 'RC:TxtMsg', {'content': 'hello'})
+        self.assertEqual(rep['code'], 500, rep)
+        rc = RongCloud('key', 'secret', self.bad_url + ';' + self.ok_url)
+        rep = rc.get_user().query('AAA')
+        self.assertEqual(rep['code'], 200, rep)
+
+    def test_no_retry(self):
+        rc = RongCloud('key', 'secret', 'http://127.0.0.1:9;' + self.ok_url, retry_policy=RetryPolicy(max_attempts=1))
+        rep = rc.get_user().query('AAA')
+        self.assertEqual(rep['code'], -1, rep)
+
+
+if __name__ == '__main__':
+    unittest.main()
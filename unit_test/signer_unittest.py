@@ -0,0 +1,37 @@
+import hashlib
+import unittest
+from unittest import mock
+
+from rongcloud import __version__
+from rongcloud.signer import Signer
+
+
+class SignerTestCase(unittest.TestCase):
+    def test_sign(self):
+        headers = Signer('key', 'secret').sign('application/json')
+        expected = hashlib.sha1(('secret' + headers['Nonce'] + headers['Timestamp']).encode('utf8')).hexdigest()
+        self.assertEqual(headers['Signature'], expected)
+        self.assertEqual(headers['App-Key'], 'key')
+        self.assertEqual(headers['User-Agent'], 'rc-python-sdk/{}'.format(__version__))
+        self.assertEqual(headers['Content-Type'], 'application/json')
+
+    def test_nonce_unique(self):
+        signer = Signer('key', 'secret')
+        nonces = {signer.sign()['Nonce'] for _ in range(1000)}
+        self.assertEqual(len(nonces), 1000)
+
+    def test_reuse_within_second(self):
+        signer = Signer('key', 'secret', reuse=True)
+        with mock.patch('time.time', return_value=1000.2):
+            first = signer.sign()
+            second = signer.sign('application/json')
+        with mock.patch('time.time', return_value=1001.0):
+            third = signer.sign()
+        self.assertEqual(first['Signature'], second['Signature'])
+        self.assertNotIn('Content-Type', first)
+        self.assertNotEqual(first['Signature'], third['Signature'])
+        self.assertEqual(third['Timestamp'], '1001')
+
+
+if __name__ == '__main__':
+    unittest.main()
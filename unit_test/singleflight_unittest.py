@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.rongcloud import RongCloud
+from rongcloud.singleflight import SingleFlight
+
+REQUESTS = []
+
+
+class SingleFlightTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        REQUESTS.append(request.path)
+        time.sleep(0.1)
+        return {'code': 200, 'total': 1, 'users': [{'id': 'uid1', 'time': '2015-09-10 16:38:26'}]}
+
+    def setUp(self):
+        del REQUESTS[:]
+
+    def test_do(self):
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def func():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'code': 200}
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', func))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'code': 200}] * 10)
+        self.assertEqual(flight.stats(), {'requests': 1, 'shared': 9, 'in_flight': 0})
+        with self.assertRaises(ZeroDivisionError):
+            flight.do('key', lambda: 1 / 0)
+
+    def test_coalesce_reads_only(self):
+        flight = SingleFlight()
+        rc = RongCloud('key', 'secret', self.url, single_flight=flight)
+        chatroom = rc.get_chatroom()
+        with rc.batch(max_workers=20) as batch:
+            for _ in range(20):
+                batch.submit(chatroom.get_user().query, 'room1', 500, 1)
+            batch.submit(chatroom.get_user().query, 'room2', 500, 1)
+            for _ in range(3):
+                batch.submit(chatroom.create, [('room1', 'name')])
+        reps = batch.results()
+        self.assertTrue(all(rep['code'] == 200 for rep in reps))
+        self.assertEqual(REQUESTS.count('/chatroom/user/query.json'), 2)
+        self.assertEqual(REQUESTS.count('/chatroom/create.json'), 3)
+        self.assertEqual(flight.stats()['shared'], 19)
+
+    def test_async_coalesce(self):
+        rc = AsyncRongCloud('key', 'secret', self.url, single_flight=SingleFlight())
+
+        async def run():
+            query = rc.get_chatroom().get_user().query
+            reps = await asyncio.gather(*[query('room1', 500, 1) for _ in range(20)])
+            rc.close()
+            return reps
+
+        reps = run_until_complete(run())
+        self.assertEqual([rep['total'] for rep in reps], [1] * 20)
+        self.assertEqual(REQUESTS, ['/chatroom/user/query.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
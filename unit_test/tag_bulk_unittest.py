@@ -0,0 +1,77 @@
+import json
+import threading
+import unittest
+from urllib.parse import parse_qs
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.rongcloud import RongCloud
+
+TAGS = {}
+LOCK = threading.Lock()
+REQUESTS = []
+
+
+class TagBulkTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        data = data.decode('utf8')
+        with LOCK:
+            if request.path == '/user/tags/get.json':
+                user_ids = parse_qs(data)['userIds']
+                return {'code': 200 if len(user_ids) <= 50 else 1002,
+                        'result': {user_id: TAGS.get(user_id, []) for user_id in user_ids}}
+            body = json.loads(data)
+            user_ids = body['userIds'] if 'userIds' in body else [body['userId']]
+            REQUESTS.append((request.path, len(user_ids)))
+            for user_id in user_ids:
+                TAGS[user_id] = body['tags']
+            return {'code': 200}
+
+    def setUp(self):
+        TAGS.clear()
+        del REQUESTS[:]
+
+    def test_set_and_get_bulk(self):
+        tag = RongCloud('key', 'secret', self.url).get_user().get_tag()
+        user_tags = {'user{}'.format(i): ['vip', 'bj'] if i % 2 else ['new'] for i in range(2500)}
+        user_tags['single'] = ['only']
+        rep = tag.set_bulk(user_tags)
+        self.assertEqual((rep['code'], rep['total'], rep['failed']), (200, 2501, []))
+        # 每组相同标签的用户按 1000 分片：1250 + 1250 + 1
+        self.assertEqual(sorted(count for _, count in REQUESTS), [1, 250, 250, 1000, 1000])
+        self.assertIn(('/user/tag/set.json', 1), REQUESTS)
+
+        rep = tag.get_bulk(list(user_tags) + ['unknown'], max_workers=8)
+        self.assertEqual(rep['code'], 200)
+        self.assertEqual(len(rep['result']), 2502)
+        self.assertEqual(rep['result']['user1'], ['vip', 'bj'])
+        self.assertEqual(rep['result']['unknown'], [])
+        self.assertEqual(tag.get_bulk(['a'], chunk_size=51)['code'], 1002)
+        self.assertEqual(tag.get_bulk(['a'], max_workers=65)['code'], 1002)
+        self.assertEqual(tag.set_bulk({'a': ['t']}, max_workers=0)['code'], 1002)
+
+    def test_set_bulk_groups_reordered_tags(self):
+        tag = RongCloud('key', 'secret', self.url).get_user().get_tag()
+        rep = tag.set_bulk({'a': ['vip', 'bj'], 'b': ['bj', 'vip'], 'c': ['vip', 'bj', 'vip']})
+        self.assertEqual((rep['code'], rep['total']), (200, 3))
+        self.assertEqual(REQUESTS, [('/user/tag/batch/set.json', 3)])
+        self.assertEqual(TAGS, {'a': ['vip', 'bj'], 'b': ['vip', 'bj'], 'c': ['vip', 'bj']})
+
+    def test_async_get_bulk(self):
+        TAGS.update({'user{}'.format(i): ['t{}'.format(i)] for i in range(120)})
+        rc = AsyncRongCloud('key', 'secret', self.url)
+
+        async def run():
+            rep = await rc.get_user().get_tag().get_bulk('user{}'.format(i) for i in range(120))
+            rc.close()
+            return rep
+
+        rep = run_until_complete(run())
+        self.assertEqual(rep['code'], 200)
+        self.assertEqual(rep['result']['user119'], ['t119'])
+        self.assertEqual(len(rep['result']), 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import socket
+import threading
+import time
+import unittest
+
+from helper import ServerTestCase, run_until_complete
+from rongcloud.aio import AsyncRongCloud
+from rongcloud.pool import ConnectError, ConnectionPool
+from rongcloud.retry import RetryPolicy
+from rongcloud.rongcloud import RongCloud
+from rongcloud.testing import FakeRongCloud, Faults, LocalServer
+from rongcloud.timeouts import Timeout, TimeoutPolicy
+
+REQUESTS = []
+
+
+class TimeoutsTestCase(ServerTestCase):
+    @staticmethod
+    def respond(request, data):
+        REQUESTS.append(request.path)
+        if request.path == '/user/checkOnline.json':
+            time.sleep(0.5)
+        return {'code': 200, 'status': '1'}
+
+    def setUp(self):
+        del REQUESTS[:]
+
+    def test_policy(self):
+        policy = TimeoutPolicy(connect=3, endpoints={'/user/checkOnline.json': (1, None, 2)})
+        self.assertEqual((policy.get('/x.json').connect, policy.get('/x.json').read), (3, 10))
+        timeout = policy.get('/user/checkOnline.json')
+        self.assertEqual((timeout.connect, timeout.read, timeout.deadline), (1, 10, 2))
+        self.assertEqual(Timeout(1, 5).budget(time.monotonic()), (1, 5))
+        self.assertLess(Timeout(1, 5, 0.5).budget(time.monotonic() - 0.2)[1], 0.31)
+        self.assertIsNone(Timeout(1, 5, 0.5).budget(time.monotonic() - 1))
+
+    def test_no_global_timeout(self):
+        socket.setdefaulttimeout(None)
+        rc = RongCloud('key', 'secret', self.url)
+        rc.get_message().get_private()
+        rc.get_user().check_online('u1')
+        self.assertIsNone(socket.getdefaulttimeout())
+
+    def test_endpoint_read_timeout(self):
+        rc = RongCloud('key', 'secret', self.url, retry_policy=RetryPolicy(max_attempts=1),
+                       timeouts=TimeoutPolicy(endpoints={'/user/checkOnline.json': (1, 0.1)}))
+        start = time.monotonic()
+        self.assertEqual(rc.get_user().check_online('u1'), {'code': -1, 'reason': 'Socket timeout.'})
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(rc.get_user().query('u1')['code'], 200)
+
+    def test_deadline_stops_retries(self):
+        rc = RongCloud('key', 'secret', self.url, retry_policy=RetryPolicy(max_attempts=10, backoff=0.01),
+                       timeouts=TimeoutPolicy(endpoints={'/user/checkOnline.json': (1, 0.1, 0.25)}))
+        start = time.monotonic()
+        self.assertEqual(rc.get_user().check_online('u1')['code'], -1)
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertLessEqual(REQUESTS.count('/user/checkOnline.json'), 3)
+
+    def test_async_read_timeout(self):
+        rc = AsyncRongCloud('key', 'secret', self.url, retry_policy=RetryPolicy(max_attempts=1),
+                            timeouts=TimeoutPolicy(read=0.1))
+
+        async def run():
+            reps = [await rc.get_user().check_online('u1'), await rc.get_user().query('u1')]
+            rc.close()
+            return reps
+
+        start = time.monotonic()
+        reps = run_until_complete(run())
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(reps[0], {'code': -1, 'reason': 'Socket timeout.'})
+        self.assertEqual(reps[1]['code'], 200)
+
+    def test_slow_body_deadline(self):
+        # 每 0.1 秒写出 4 字节，单次 socket 读取不会超时，但整个响应需要 1 秒以上
+        with LocalServer(FakeRongCloud(), faults=Faults(slow_body=(4, 0.1))) as server:
+            timeouts = TimeoutPolicy(connect=1, read=0.5, deadline=0.8)
+            for rc in (RongCloud('key', 'secret', server.url, timeouts=timeouts),
+                       AsyncRongCloud('key', 'secret', server.url, timeouts=timeouts)):
+                start = time.monotonic()
+                rep = rc.get_user().query('u1')
+                if rc.is_async:
+                    rep = run_until_complete(rep)
+                self.assertEqual(rep, {'code': -1, 'reason': 'Socket timeout.'})
+                self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_retry_policy_deadline(self):
+        rc = RongCloud('key', 'secret', self.url, retry_policy=RetryPolicy(deadline=0.2))
+        start = time.monotonic()
+        self.assertEqual(rc.get_user().check_online('u1'), {'code': -1, 'reason': 'Socket timeout.'})
+        self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_pool_wait_timeout(self):
+        pool = ConnectionPool(self.url, max_connections=1)
+        thread = threading.Thread(target=pool.request, args=('POST', '/user/checkOnline.json', b''))
+        thread.start()
+        time.sleep(0.1)
+        start = time.monotonic()
+        with self.assertRaises(ConnectError):
+            pool.request('POST', '/user/info.json', b'', timeout=(0.1, 1))
+        self.assertLess(time.monotonic() - start, 0.3)
+        thread.join()
+        self.assertEqual(pool.request('POST', '/user/info.json', b'')[0], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()